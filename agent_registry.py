@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Agent Registry - Status → specialist agent dispatch table
+=========================================================
+
+Agents register under a name together with the candidate statuses they
+handle. Statuses are normalised once at registration ("Phone-Screen",
+" phone screen " and "PHONE_SCREEN" are the same key), so routing is a
+dict lookup whatever the number of pipeline stages:
+
+    status → normalise → {status key: agent name} → AgentSpec → agent(state)
+
+Statuses nobody registered for go to the fallback agent, or raise
+ValueError when there is none.
+
+Author: RecruitEM Team
+"""
+
+import threading
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+# How many distinct raw status strings to remember un-normalised
+_ROUTE_CACHE_SIZE = 4096
+
+def normalize_status(status: str) -> str:
+    """Registry key for a status: case-folded, with runs of spaces, "_" and "-" collapsed to one space"""
+    return " ".join(status.replace("_", " ").replace("-", " ").casefold().split())
+
+class AgentSpec(NamedTuple):
+    """
+    A registered agent
+
+    Attributes:
+        name: Agent name (recorded as metadata["agent"])
+        run: agent(state, use_claude) -> state
+        run_async: Optional awaitable agent(state, use_claude, client) -> state
+        batch: Optional batch drafter(group, timestamp, use_claude) filling
+               in every state of the group (used by orchestrate_many())
+        batch_async: Optional awaitable batch drafter(group, timestamp,
+                     use_claude, max_concurrency, client)
+        bulk: Optional message-batch drafter(group, timestamp, client,
+              poll_interval, max_wait) (used by orchestrate_many_bulk())
+    """
+    name: str
+    run: Callable
+    run_async: Optional[Callable] = None
+    batch: Optional[Callable] = None
+    batch_async: Optional[Callable] = None
+    bulk: Optional[Callable] = None
+
+class AgentRegistry:
+    """
+    Agents by name, and the status routing table
+
+    Lookups read immutable dicts that registration replaces wholesale,
+    so routing needs no lock.
+
+    Args:
+        fallback: Agent name for unregistered statuses (None: raise)
+    """
+
+    def __init__(self, fallback: Optional[str] = None):
+        self._agents: Dict[str, AgentSpec] = {}
+        self._routes: Dict[str, str] = {}
+        self._cache: Dict[str, str] = {}
+        self._fallback = fallback
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        name: str,
+        run: Callable,
+        statuses: Iterable[str] = (),
+        run_async: Optional[Callable] = None,
+        batch: Optional[Callable] = None,
+        batch_async: Optional[Callable] = None,
+        bulk: Optional[Callable] = None
+    ) -> AgentSpec:
+        """
+        Add (or replace) an agent and route the given statuses to it
+
+        Raises:
+            ValueError: if a status is already routed to another agent
+        """
+        spec = AgentSpec(name, run, run_async, batch, batch_async, bulk)
+        with self._lock:
+            routes = dict(self._routes)
+            for status in statuses:
+                key = normalize_status(status)
+                owner = routes.get(key)
+                if owner is not None and owner != name:
+                    raise ValueError(f"Status {status!r} is already routed to agent {owner!r}")
+                routes[key] = name
+            agents = dict(self._agents)
+            agents[name] = spec
+            self._agents, self._routes, self._cache = agents, routes, {}
+        return spec
+
+    def unregister(self, name: str) -> bool:
+        """Remove an agent and its statuses; False if it was not registered"""
+        with self._lock:
+            if name not in self._agents:
+                return False
+            agents = {key: spec for key, spec in self._agents.items() if key != name}
+            routes = {key: owner for key, owner in self._routes.items() if owner != name}
+            self._agents, self._routes, self._cache = agents, routes, {}
+            if self._fallback == name:
+                self._fallback = None
+        return True
+
+    @property
+    def fallback(self) -> Optional[str]:
+        """Agent for statuses nobody registered for"""
+        return self._fallback
+
+    def set_fallback(self, name: Optional[str]) -> None:
+        """Route unregistered statuses to `name` (None: raise ValueError for them)"""
+        if name is not None and name not in self._agents:
+            raise KeyError(f"Unknown agent {name!r}")
+        with self._lock:
+            self._fallback = name
+            self._cache = {}
+
+    def route(self, status: str) -> str:
+        """
+        Name of the agent that handles status
+
+        Raises:
+            ValueError: if no agent handles it and there is no fallback
+        """
+        # Writers swap in a new cache after the routes and fallback, so
+        # a route resolved here is only ever stored in the cache taken
+        # before resolving it; one replaced meanwhile is simply dropped
+        cache = self._cache
+        name = cache.get(status)
+        if name is not None:
+            return name
+        name = self._routes.get(normalize_status(status), self._fallback)
+        if name is None:
+            raise ValueError(f"No agent registered for status {status!r}")
+        if len(cache) < _ROUTE_CACHE_SIZE:
+            cache[status] = name
+        return name
+
+    def get(self, name: str) -> AgentSpec:
+        """The agent registered under name (KeyError if unknown)"""
+        return self._agents[name]
+
+    def names(self) -> List[str]:
+        """Registered agent names, in registration order"""
+        return list(self._agents)
+
+    def statuses(self, name: str) -> List[str]:
+        """Normalised statuses routed to an agent"""
+        return [key for key, owner in self._routes.items() if owner == name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._agents
+
+    def __len__(self) -> int:
+        return len(self._agents)
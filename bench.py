@@ -0,0 +1,1075 @@
+#!/usr/bin/env python3
+"""
+Benchmark script for the RecruitEM orchestrator
+Run this to measure the per-candidate cost of the orchestration paths
+
+Usage:
+    python3 bench.py                          # run every benchmark
+    python3 bench.py batch                    # run only the named benchmarks
+    python3 bench.py paths catalog_sizes --json before.json
+    python3 bench.py compare before.json after.json [--threshold 10]
+
+Every result printed through report() or record() is also collected, and
+--json saves them (seconds per item) with the commit and Python
+version, so runs from two commits can be compared.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import datetime
+import gc
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import timeit
+import tracemalloc
+
+from orchestrator import (
+    orchestrate, orchestrate_many, orchestrate_many_async, StatusUpdate,
+    generate_prep_tip, close_anthropic_clients, PREP_TIP_PROMPT, CLAUDE_MODEL, PREP_TIP_MAX_TOKENS,
+    set_tip_cache, JOB_DESCRIPTIONS, TEST_LINKS, INTERVIEW_TIPS_DB, set_event_sink, console_sink,
+    DataSnapshot, use_data_snapshot, TIMINGS, rag_search, set_anthropic_client, reset_anthropic_clients,
+    get_job_catalog, set_job_catalog,
+)
+from events import NullSink, JSONLinesSink
+from message_templates import TemplateSet, DEFAULT_TEMPLATES
+from fakes import FakeAsyncClient, FakeClient, StubAnthropicServer
+from tip_cache import TipCache
+from retrieval import BM25Index, tokenize
+from keyword_matcher import KeywordMatcher
+from agent_registry import AgentRegistry, normalize_status
+from catalog import CachedCatalog, DictCatalog, SQLiteCatalog
+from parallel import run_parallel
+from pipeline import run_pipeline
+from work_queue import WorkQueue, run_workers
+from dedup import Deduplicator, event_key
+
+BENCHMARKS = {}
+
+# "benchmark/label" → seconds per item, for --json
+RESULTS = {}
+_running = None
+
+# Budget checks that failed; main() reports them and exits with 1
+OVER_BUDGET = []
+
+def benchmark(name):
+    """Register a benchmark function under a short name"""
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+@contextlib.contextmanager
+def quiet():
+    """Send the orchestrator's console output to /dev/null while measuring"""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+def measure(func, repeat=5):
+    """Run func() `repeat` times and return the best wall time in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def per_call(func, repeat=5):
+    """Best time of one func() call in seconds, timeit-style (loop count from autorange())"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+def record(label, seconds_per_item):
+    """Collect a result of the running benchmark for --json"""
+    RESULTS[f"{_running}/{label}"] = seconds_per_item
+
+def report(label, seconds, count):
+    """Print one result line: total time and time per item"""
+    per_item_us = seconds / count * 1e6
+    print(f"  {label:<40} {seconds * 1e3:10.2f} ms  {per_item_us:10.2f} us/candidate")
+    record(label, seconds / count)
+
+def report_call(label, seconds):
+    """Print one result line for a per-call time"""
+    print(f"  {label:<40} {seconds * 1e6:10.2f} us/call")
+    record(label, seconds)
+
+def make_updates(count):
+    """Build a mixed batch of status updates across the known jobs"""
+    jobs = ["J123", "J456", "J789", "J101"]
+    statuses = ["Assessment", "Interview"]
+    return [
+        StatusUpdate(f"Candidate {i}", f"candidate{i}@example.com", statuses[i % 2], jobs[i % len(jobs)])
+        for i in range(count)
+    ]
+
+@contextlib.contextmanager
+def distinct_jobs(count):
+    """Temporarily add `count` jobs with distinct descriptions; yields their IDs"""
+    job_ids = [f"BENCH{i}" for i in range(count)]
+    for i, job_id in enumerate(job_ids):
+        JOB_DESCRIPTIONS[job_id] = {"title": "Python Developer", "description": f"Python role number {i}."}
+    try:
+        yield job_ids
+    finally:
+        for job_id in job_ids:
+            del JOB_DESCRIPTIONS[job_id]
+
+# ============= BENCHMARKS =============
+
+@benchmark("batch")
+def bench_batch():
+    """orchestrate_many() vs. a Python loop over orchestrate()"""
+    for count in (100, 1000, 10000):
+        updates = make_updates(count)
+
+        def loop():
+            for update in updates:
+                orchestrate(*update)
+
+        def batch():
+            orchestrate_many(updates)
+
+        with quiet():
+            loop_time = measure(loop, repeat=3)
+            batch_time = measure(batch, repeat=3)
+
+        print(f"\n  {count} candidates")
+        report("loop over orchestrate()", loop_time, count)
+        report("orchestrate_many()", batch_time, count)
+        print(f"  {'speedup':<40} {loop_time / batch_time:10.1f}x")
+
+@benchmark("async")
+def bench_async():
+    """orchestrate_many_async() vs. serial Claude tips (fake 20 ms API)"""
+    latency = 0.02
+    count = 200
+    interviews = count // 2
+
+    def run(updates, concurrency):
+        set_tip_cache(TipCache())   # every tip must reach the (fake) API
+        asyncio.run(orchestrate_many_async(updates, use_claude=True, max_concurrency=concurrency,
+                                           client=FakeAsyncClient(latency)))
+
+    # One job per interview candidate, so the tip cache cannot collapse calls
+    with distinct_jobs(interviews) as job_ids:
+        updates = [StatusUpdate(f"Candidate {i}", f"c{i}@example.com", "Interview", job_id)
+                   for i, job_id in enumerate(job_ids)]
+        updates += make_updates(count - interviews)
+        with quiet():
+            serial_time = measure(lambda: run(updates, 1), repeat=1)
+        print(f"\n  {count} candidates ({interviews} interview, one job each)")
+        report("max_concurrency=1", serial_time, count)
+
+        for concurrency in (8, 32, 128):
+            with quiet():
+                elapsed = measure(lambda: run(updates, concurrency), repeat=3)
+            report(f"max_concurrency={concurrency}", elapsed, count)
+            print(f"  {'speedup':<40} {serial_time / elapsed:10.1f}x")
+    set_tip_cache(TipCache())
+
+@benchmark("client")
+def bench_client():
+    """Connections opened per 1,000 Claude tips: client per call vs. shared client"""
+    try:
+        from anthropic import Anthropic
+    except ImportError:
+        print("  skipped: the anthropic package is not installed")
+        return
+
+    count = 1000
+    job_description = "Python Developer role requiring FastAPI and PostgreSQL."
+    saved_env = {key: os.environ.get(key) for key in ("ANTHROPIC_API_KEY", "ANTHROPIC_BASE_URL")}
+
+    with StubAnthropicServer() as server:
+        os.environ["ANTHROPIC_API_KEY"] = "stub-key"
+        os.environ["ANTHROPIC_BASE_URL"] = server.url
+        try:
+            def client_per_call():
+                for _ in range(count):
+                    client = Anthropic(api_key="stub-key", base_url=server.url)
+                    client.messages.create(
+                        model=CLAUDE_MODEL,
+                        max_tokens=PREP_TIP_MAX_TOKENS,
+                        messages=[{"role": "user", "content": PREP_TIP_PROMPT.format(job_description=job_description)}],
+                    )
+
+            def shared_client():
+                for i in range(count):
+                    generate_prep_tip(f"{job_description} #{i}", use_claude=True)
+
+            print(f"\n  {count} tips against {server.url}")
+            for label, func in (("new Anthropic() per tip", client_per_call), ("shared client", shared_client)):
+                close_anthropic_clients()
+                before = server.connections
+                with quiet():
+                    elapsed = measure(func, repeat=1)
+                report(label, elapsed, count)
+                print(f"  {'':<40} {server.connections - before:10d} connections")
+        finally:
+            close_anthropic_clients()
+            set_tip_cache(TipCache())
+            for key, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+def make_corpus(count, vocabulary_size=5000, words_per_doc=30, seed=0):
+    """Synthetic (doc_id, text) corpus drawn from a fixed vocabulary"""
+    rng = random.Random(seed)
+    vocabulary = [f"skill{i}" for i in range(vocabulary_size)]
+    return [(f"doc{i}", " ".join(rng.choices(vocabulary, k=words_per_doc))) for i in range(count)], vocabulary
+
+@benchmark("retrieval")
+def bench_retrieval():
+    """BM25 inverted index vs. a linear scan as the corpus grows"""
+    rng = random.Random(1)
+    print(f"\n  {'documents':>10} {'build':>12} {'bm25 query':>14} {'linear scan':>14}")
+    for count in (10, 100, 1000, 10000, 100000):
+        corpus, vocabulary = make_corpus(count)
+        queries = [" ".join(rng.choices(vocabulary, k=3)) for _ in range(100)]
+
+        start = time.perf_counter()
+        index = BM25Index.from_documents(corpus)
+        build_time = time.perf_counter() - start
+
+        bm25_time = measure(lambda: [index.search(query, top_k=5) for query in queries], repeat=3) / len(queries)
+
+        tokenized = [(doc_id, set(tokenize(text))) for doc_id, text in corpus]
+        def linear():
+            for query in queries:
+                terms = tokenize(query)
+                scores = [(sum(term in doc for term in terms), doc_id) for doc_id, doc in tokenized]
+                max(scores)
+        if count <= 10000:
+            scan_time = measure(linear, repeat=1) / len(queries)
+            scan_label = f"{scan_time * 1e6:11.1f} us"
+            record(f"{count} documents, linear scan", scan_time)
+        else:
+            scan_label = "(skipped)"
+
+        print(f"  {count:>10} {build_time * 1e3:9.1f} ms {bm25_time * 1e6:11.1f} us {scan_label:>14}")
+        record(f"{count} documents, build per document", build_time / count)
+        record(f"{count} documents, bm25 query", bm25_time)
+
+@benchmark("vectors")
+def bench_vectors():
+    """Vector index: batched matmul top-k vs. one query at a time"""
+    try:
+        import numpy as np
+        from vector_index import VectorIndex
+    except ImportError:
+        print("  skipped: NumPy is not installed")
+        return
+
+    rng = np.random.default_rng(0)
+    dim = 256
+    queries = rng.standard_normal((256, dim), dtype=np.float32)
+    print(f"\n  {'documents':>10} {'batched':>16} {'one at a time':>16}")
+    for count in (1000, 10000, 100000):
+        index = VectorIndex(dim=dim)
+        index.add([f"doc{i}" for i in range(count)], vectors=rng.standard_normal((count, dim), dtype=np.float32))
+
+        batched = measure(lambda: index.search_vectors(queries, top_k=5), repeat=3) / len(queries)
+        single = measure(lambda: [index.search_vectors(query, top_k=5) for query in queries], repeat=1) / len(queries)
+        print(f"  {count:>10} {batched * 1e6:11.1f} us/q {single * 1e6:11.1f} us/q")
+        record(f"{count} documents, batched query", batched)
+        record(f"{count} documents, one query at a time", single)
+
+@benchmark("keywords")
+def bench_keywords():
+    """Aho–Corasick keyword matching vs. one substring scan per keyword"""
+    rng = random.Random(2)
+    job_description = JOB_DESCRIPTIONS["J123"]["description"] * 3
+    print(f"\n  {'keywords':>10} {'compile':>12} {'automaton':>14} {'per-keyword scan':>18}")
+    for count in (5, 100, 1000, 5000):
+        taxonomy = ["python", "sql", "react", "kubernetes", "fastapi"]
+        taxonomy += [f"skill{rng.randrange(10**6)}" for _ in range(count - len(taxonomy))]
+
+        start = time.perf_counter()
+        matcher = KeywordMatcher(taxonomy)
+        compile_time = time.perf_counter() - start
+
+        automaton = measure(lambda: [matcher.rank(job_description) for _ in range(100)], repeat=3) / 100
+
+        def scan():
+            for _ in range(100):
+                [keyword for keyword in taxonomy if keyword in job_description.lower()]
+        naive = measure(scan, repeat=3) / 100
+
+        print(f"  {count:>10} {compile_time * 1e3:9.2f} ms {automaton * 1e6:11.1f} us {naive * 1e6:15.1f} us")
+        record(f"{count} keywords, compile per keyword", compile_time / count)
+        record(f"{count} keywords, automaton", automaton)
+        record(f"{count} keywords, per-keyword scan", naive)
+
+@benchmark("events")
+def bench_events():
+    """Per-candidate orchestrate() latency: console vs. JSON-lines vs. null sink"""
+    count = 2000
+    updates = make_updates(count)
+
+    def run():
+        for update in updates:
+            orchestrate(*update)
+
+    with open(os.devnull, "w") as devnull:
+        sinks = [
+            ("console sink (to /dev/null)", console_sink(stream=devnull)),
+            ("JSON-lines sink (to /dev/null)", JSONLinesSink(devnull)),
+            ("null sink", NullSink()),
+        ]
+        print(f"\n  {count} candidates")
+        try:
+            for label, sink in sinks:
+                set_event_sink(sink)
+                report(label, measure(run, repeat=3), count)
+        finally:
+            set_event_sink(console_sink())
+
+def fstring_interview_message(candidate_name, job_title, prep_tip, jd_snippet):
+    """The interview message as an inline f-string (the pre-template implementation)"""
+    return f"""Hi {candidate_name}!
+
+Congratulations on reaching the interview stage for {job_title}!
+
+→ Your interview is coming up soon. Here's a personalized tip to help you prepare:
+
+→ Key Focus Area:
+{prep_tip}
+
+→ Role Context:
+{jd_snippet}
+
+Remember: Prepare specific examples from your experience that demonstrate these skills.
+
+You've got this!
+RecruitEM Team"""
+
+@benchmark("templates")
+def bench_templates():
+    """Interview message rendering: inline f-string vs. compiled template"""
+    count = 100000
+    names = [f"Candidate {i}" for i in range(count)]
+    job_title = "Python Developer"
+    prep_tip = "Review async/await patterns and how to handle concurrent requests efficiently."
+    jd_snippet = "Python Developer: Python Developer role requiring FastAPI, async programming..."
+    templates = TemplateSet(DEFAULT_TEMPLATES)
+    template = templates.templates["interview"]
+
+    assert template.render({"candidate_name": "A", "job_title": job_title, "prep_tip": prep_tip,
+                            "jd_snippet": jd_snippet}) == fstring_interview_message("A", job_title, prep_tip, jd_snippet)
+
+    def fstrings():
+        for name in names:
+            fstring_interview_message(name, job_title, prep_tip, jd_snippet)
+
+    def full_render():
+        for name in names:
+            template.render({"candidate_name": name, "job_title": job_title, "prep_tip": prep_tip,
+                             "jd_snippet": jd_snippet})
+
+    def cached_partial_lookup():
+        for name in names:
+            templates.for_job("interview", job_title=job_title, prep_tip=prep_tip,
+                              jd_snippet=jd_snippet).render({"candidate_name": name})
+
+    def hoisted_partial():
+        partial = templates.for_job("interview", job_title=job_title, prep_tip=prep_tip, jd_snippet=jd_snippet)
+        for name in names:
+            partial.render({"candidate_name": name})
+
+    print(f"\n  {count} messages")
+    for label, func in (("inline f-string", fstrings), ("template, all slots per call", full_render),
+                        ("per-job partial via for_job()", cached_partial_lookup),
+                        ("per-job partial held by batch", hoisted_partial)):
+        elapsed = measure(func, repeat=3)
+        print(f"  {label:<40} {elapsed * 1e3:10.2f} ms  {count / elapsed / 1e6:10.2f} M msgs/s")
+        record(label, elapsed / count)
+
+@benchmark("parallel")
+def bench_parallel():
+    """run_parallel() throughput with 1, 2, 4 and N worker processes"""
+    count = 100000
+    updates = make_updates(count)
+
+    def single():
+        orchestrate_many(updates)
+
+    # Workers always run with a null sink; give the in-process baseline the same one
+    set_event_sink(NullSink())
+    try:
+        baseline = measure(single, repeat=1)
+        label = "orchestrate_many() in-process"
+        print(f"\n  {count} candidates, chunk_size=1000, {os.cpu_count()} CPUs, null event sink")
+        print(f"  {label:<40} {baseline * 1e3:10.2f} ms  {count / baseline:10.0f} candidates/s")
+        record(label, baseline / count)
+
+        one_worker = None
+        for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+            def run():
+                for _ in run_parallel(updates, workers=workers, chunk_size=1000):
+                    pass
+
+            elapsed = measure(run, repeat=1)
+            one_worker = one_worker or elapsed
+            label = f"run_parallel(workers={workers})"
+            print(f"  {label:<40} {elapsed * 1e3:10.2f} ms  {count / elapsed:10.0f} candidates/s"
+                  f"  {one_worker / elapsed:5.1f}x")
+            record(label, elapsed / count)
+    finally:
+        set_event_sink(console_sink())
+
+@benchmark("pipeline")
+def bench_pipeline():
+    """Streaming pipeline throughput (records/s) and peak memory vs. input size"""
+    def write_input(path, count, format):
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            if format == "csv":
+                f.write("candidate_name,candidate_email,status,job_id\n")
+            for update in make_updates(count):
+                if format == "csv":
+                    f.write(",".join(update) + "\n")
+                else:
+                    f.write(json.dumps(update._asdict()) + "\n")
+
+    def run(path, format):
+        with open(path, encoding="utf-8", newline="") as source, open(os.devnull, "w") as sink:
+            return run_pipeline(source, sink, format)
+
+    set_event_sink(NullSink())
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            print(f"\n  {'records':>10} {'format':>7} {'records/s':>12} {'peak memory':>12}")
+            for count in (10000, 100000):
+                for format in ("jsonl", "csv"):
+                    path = os.path.join(tmp, f"updates.{format}")
+                    write_input(path, count, format)
+                    elapsed = measure(lambda: run(path, format), repeat=1)
+                    tracemalloc.start()
+                    run(path, format)
+                    peak = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+                    print(f"  {count:>10} {format:>7} {count / elapsed:12.0f} {peak / 1e6:9.2f} MB")
+                    record(f"{count} records, {format}", elapsed / count)
+                    record(f"{count} records, {format}, peak bytes", peak)
+    finally:
+        set_event_sink(console_sink())
+
+@benchmark("catalog")
+def bench_catalog():
+    """Job lookup latency: dicts vs. SQLite, cold vs. warm read-through LRU"""
+    count = 50000
+    lookups = 10000
+    rows = [(f"R{i:06d}", f"Role {i % 500}", f"Requisition {i}: Python, SQL and Kubernetes experience.")
+            for i in range(count)]
+    rng = random.Random(0)
+    hot_ids = [f"R{rng.randrange(count):06d}" for _ in range(lookups)]
+    # A working set small enough to stay cached
+    warm_ids = [f"R{i % 1000:06d}" for i in range(lookups)]
+
+    def run(catalog, job_ids):
+        for job_id in job_ids:
+            catalog.get(job_id)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "jobs.db")
+        start = time.perf_counter()
+        store = SQLiteCatalog(path)
+        store.add_jobs(rows)
+        load_time = time.perf_counter() - start
+        jobs = {job_id: {"title": title, "description": description} for job_id, title, description in rows}
+
+        print(f"\n  {count} jobs ({load_time * 1e3:.0f} ms to load into SQLite), {lookups} lookups")
+        report("DictCatalog", measure(lambda: run(DictCatalog(jobs), hot_ids)), lookups)
+        report("SQLiteCatalog (no cache)", measure(lambda: run(store, hot_ids)), lookups)
+
+        cold = measure(lambda: run(CachedCatalog(store, max_entries=1024), hot_ids))
+        report("CachedCatalog, random ids (cold)", cold, lookups)
+
+        cached = CachedCatalog(store, max_entries=1024)
+        run(cached, warm_ids)
+        hits, misses = cached.hits, cached.misses
+        report("CachedCatalog, 1,000-id working set (warm)", measure(lambda: run(cached, warm_ids)), lookups)
+        hits, misses = cached.hits - hits, cached.misses - misses
+        print(f"  {'warm hit rate':<40} {hits / (hits + misses):10.1%}")
+
+        title_time = measure(lambda: [store.jobs_with_title(f"Role {i}") for i in range(100)], repeat=3)
+        report("SQLiteCatalog.jobs_with_title (100 titles)", title_time, 100)
+        store.close()
+
+@benchmark("reload")
+def bench_reload():
+    """Snapshot rebuild cost, and orchestrate() latency while snapshots are rebuilt"""
+    print()
+    for count in (1000, 10000):
+        jobs = {f"R{i}": {"title": f"Role {i % 50}", "description": f"Requisition {i}: Python, SQL and React."}
+                for i in range(count)}
+        jobs.update(JOB_DESCRIPTIONS)
+        build = measure(lambda: DataSnapshot.build(jobs, TEST_LINKS, INTERVIEW_TIPS_DB), repeat=1)
+        label = f"DataSnapshot.build(), {count} jobs"
+        print(f"  {label:<40} {build * 1e3:10.2f} ms")
+        record(f"{label}, per job", build / count)
+
+    updates = make_updates(2000)
+
+    def latencies():
+        samples = []
+        for update in updates:
+            start = time.perf_counter()
+            orchestrate(*update)
+            samples.append(time.perf_counter() - start)
+        samples.sort()
+        return samples[len(samples) // 2], samples[int(len(samples) * 0.99)]
+
+    stop = threading.Event()
+
+    def rebuild_forever():
+        version = 0
+        while not stop.is_set():
+            version += 1
+            use_data_snapshot(DataSnapshot.build(jobs, TEST_LINKS, INTERVIEW_TIPS_DB, version=version))
+
+    set_event_sink(NullSink())
+    try:
+        print(f"\n  {len(updates)} orchestrate() calls {'p50':>22} {'p99':>12}")
+        for label, snapshot in (("module dicts", None), ("installed snapshot", DataSnapshot.build(
+                JOB_DESCRIPTIONS, TEST_LINKS, INTERVIEW_TIPS_DB))):
+            use_data_snapshot(snapshot)
+            p50, p99 = latencies()
+            print(f"  {label:<40} {p50 * 1e6:8.1f} us {p99 * 1e6:9.1f} us")
+            record(f"{label}, p50", p50)
+            record(f"{label}, p99", p99)
+
+        rebuilder = threading.Thread(target=rebuild_forever, daemon=True)
+        rebuilder.start()
+        p50, p99 = latencies()
+        stop.set()
+        rebuilder.join()
+        label = f"{count}-job rebuilds running meanwhile"
+        print(f"  {label:<40} {p50 * 1e6:8.1f} us {p99 * 1e6:9.1f} us")
+        record(f"{label}, p50", p50)
+        record(f"{label}, p99", p99)
+    finally:
+        use_data_snapshot(None)
+        set_event_sink(console_sink())
+
+@benchmark("routing")
+def bench_routing():
+    """Status routing cost as pipeline stages are added: registry vs. if/elif chain"""
+    lookups = 100000
+    print(f"\n  {'stages':>8} {'registry':>12} {'(uncached)':>12} {'if/elif chain':>15}")
+    for stages in (2, 8, 64, 512):
+        names = [f"stage {i}" for i in range(stages)]
+        registry = AgentRegistry(fallback=names[0])
+        for name in names:
+            registry.register(name, lambda state, use_claude=False: state, statuses=[name])
+        statuses = [f"Stage_{i % stages}" for i in range(lookups)]
+
+        # What the router did before: compare the lowered status against each stage in turn
+        def chain(status):
+            lowered = normalize_status(status)
+            for name in names:
+                if lowered == name:
+                    return name
+            return names[0]
+
+        def cached():
+            for status in statuses:
+                registry.route(status)
+
+        def uncached():
+            for status in statuses:
+                registry._cache.clear()
+                registry.route(status)
+
+        def linear():
+            for status in statuses:
+                chain(status)
+
+        times = [measure(func, repeat=3) / lookups for func in (cached, uncached, linear)]
+        print(f"  {stages:>8} {times[0] * 1e9:9.0f} ns {times[1] * 1e9:9.0f} ns {times[2] * 1e9:12.0f} ns")
+        for label, seconds in zip(("registry", "registry, uncached", "if/elif chain"), times):
+            record(f"{stages} stages, {label}", seconds)
+
+@benchmark("timings")
+def bench_timings():
+    """Cost of stage timing: disabled vs. enabled, and the resulting stage report"""
+    count = 5000
+    updates = make_updates(count)
+
+    def loop():
+        for update in updates:
+            orchestrate(*update)
+
+    def batch():
+        orchestrate_many(updates)
+
+    def timed(func):
+        def run():
+            with TIMINGS.run():
+                func()
+        return run
+
+    set_event_sink(NullSink())
+    try:
+        print(f"\n  {count} candidates (null event sink)")
+        for label, func in (("orchestrate() loop", loop), ("orchestrate_many()", batch)):
+            report(f"{label}, timing disabled", measure(func), count)
+            report(f"{label}, timing enabled", measure(timed(func)), count)
+
+        with TIMINGS.run() as profile:
+            loop()
+        print("\n  Stage latencies, orchestrate() loop (us)")
+        print("\n".join("  " + line for line in profile.report().splitlines()))
+    finally:
+        set_event_sink(console_sink())
+
+@benchmark("paths")
+def bench_paths():
+    """Per-call cost of each orchestration path, tool and batch runner"""
+    count = 1000
+    updates = make_updates(count)
+    descriptions = (f"Python Developer role number {i} requiring FastAPI." for i in itertools.count())
+
+    set_event_sink(NullSink())
+    try:
+        print()
+        report_call("orchestrate(), assessment", per_call(
+            lambda: orchestrate("Sarah", "sarah@example.com", "Assessment", "J123")))
+        report_call("orchestrate(), interview", per_call(
+            lambda: orchestrate("Mike", "mike@example.com", "Interview", "J456")))
+        report_call("rag_search(), job ID hit", per_call(lambda: rag_search("J123")))
+        report_call("rag_search(), keyword hit", per_call(lambda: rag_search("async python")))
+        report_call("rag_search(), miss", per_call(lambda: rag_search("zzz unknown qqq")))
+        report_call("generate_prep_tip(), keyword fallback", per_call(
+            lambda: generate_prep_tip(JOB_DESCRIPTIONS["J456"]["description"])))
+
+        set_anthropic_client(FakeClient())
+        set_tip_cache(TipCache())
+        try:
+            report_call("generate_prep_tip(), stub, cache hit", per_call(
+                lambda: generate_prep_tip(JOB_DESCRIPTIONS["J456"]["description"], use_claude=True)))
+            report_call("generate_prep_tip(), stub, cache miss", per_call(
+                lambda: generate_prep_tip(next(descriptions), use_claude=True)))
+        finally:
+            reset_anthropic_clients()
+            set_tip_cache(TipCache())
+
+        print(f"\n  batch runners, {count} candidates")
+        report("orchestrate_many()", measure(lambda: orchestrate_many(updates)), count)
+        report("orchestrate_many_async()", measure(
+            lambda: asyncio.run(orchestrate_many_async(updates))), count)
+        report("run_parallel(workers=2)", measure(
+            lambda: list(run_parallel(updates, workers=2, chunk_size=250)), repeat=1), count)
+    finally:
+        set_event_sink(console_sink())
+
+@benchmark("catalog_sizes")
+def bench_catalog_sizes():
+    """orchestrate() and orchestrate_many() as the job catalog grows from 4 to 100k jobs"""
+    rng = random.Random(3)
+    saved = get_job_catalog()
+    set_event_sink(NullSink())
+    try:
+        print(f"\n  {'jobs':>8} {'catalog':>8} {'assessment':>14} {'interview':>14} {'batch of 1000':>16}")
+        for size in (4, 100, 1000, 10000, 100000):
+            jobs = dict(JOB_DESCRIPTIONS)
+            for i in range(size - len(jobs)):
+                jobs[f"R{i:06d}"] = {"title": f"Role {i % 500}", "description": f"Requisition {i}: Python and SQL."}
+            job_ids = list(jobs)
+            picks = [rng.choice(job_ids) for _ in range(1000)]
+            updates = [StatusUpdate(f"Candidate {i}", f"c{i}@example.com", ("Assessment", "Interview")[i % 2], job_id)
+                       for i, job_id in enumerate(picks)]
+
+            with tempfile.TemporaryDirectory() as tmp:
+                store = SQLiteCatalog(os.path.join(tmp, "jobs.db"))
+                store.add_jobs((job_id, info["title"], info["description"]) for job_id, info in jobs.items())
+                store.set_test_links(TEST_LINKS)
+                for kind, catalog in (("dict", DictCatalog(jobs, TEST_LINKS)), ("sqlite", store)):
+                    set_job_catalog(catalog)
+                    picked = iter(itertools.cycle(picks))
+                    assessment = per_call(lambda: orchestrate("Sarah", "s@example.com", "Assessment", next(picked)))
+                    interview = per_call(lambda: orchestrate("Mike", "m@example.com", "Interview", next(picked)))
+                    batch = measure(lambda: orchestrate_many(updates), repeat=3) / len(updates)
+                    print(f"  {size:>8} {kind:>8} {assessment * 1e6:11.2f} us {interview * 1e6:11.2f} us "
+                          f"{batch * 1e6:10.2f} us/c")
+                    record(f"{size} jobs, {kind}, orchestrate() assessment", assessment)
+                    record(f"{size} jobs, {kind}, orchestrate() interview", interview)
+                    record(f"{size} jobs, {kind}, orchestrate_many()", batch)
+                set_job_catalog(saved)
+                store.close()
+    finally:
+        set_job_catalog(saved)
+        set_event_sink(console_sink())
+
+@benchmark("state_memory")
+def bench_state_memory():
+    """Bytes per candidate (tracemalloc): AgentState dicts vs. compact CandidateRecords"""
+    import orchestrator
+    count = 100000
+    updates = make_updates(count)
+
+    def traced(func):
+        """Bytes still allocated after func() returns (its result is kept alive until then)"""
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            result = func()
+            allocated = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        del result
+        return allocated
+
+    set_event_sink(NullSink())
+    try:
+        print(f"\n  {count} candidates (names and emails are shared with the input and not counted)")
+        print(f"  {'':<28} {'AgentState':>12} {'CandidateRecord':>16} {'saved':>7}")
+        for label, func in (
+            ("in flight (planned)", lambda compact: orchestrator._plan_batch(updates, compact)),
+            ("drafted (orchestrate_many)", lambda compact: orchestrate_many(updates, compact=compact)),
+        ):
+            dicts = traced(lambda: func(False)) / count
+            records = traced(lambda: func(True)) / count
+            print(f"  {label:<28} {dicts:9.0f} B/c {records:13.0f} B/c {1 - records / dicts:6.0%}")
+            record(f"{label}, AgentState bytes", dicts)
+            record(f"{label}, CandidateRecord bytes", records)
+        print()
+        report("orchestrate_many(), AgentState", measure(lambda: orchestrate_many(updates), repeat=3), count)
+        report("orchestrate_many(compact=True)", measure(lambda: orchestrate_many(updates, compact=True), repeat=3),
+               count)
+    finally:
+        set_event_sink(console_sink())
+
+@benchmark("columnar")
+def bench_columnar():
+    """orchestrate_columns() vs. the per-record orchestrate_many() at 10k, 100k and 1M candidates"""
+    import orchestrator
+    from columnar import CandidateColumns
+
+    def drain(iterable):
+        for _ in iterable:
+            pass
+
+    set_event_sink(NullSink())
+    try:
+        print(f"\n  {'candidates':>10} {'path':<40} {'us/candidate':>13} {'speedup':>8}")
+        for count in (10000, 100000, 1000000):
+            updates = make_updates(count)
+            repeat = 1 if count >= 1000000 else 3
+            records = measure(lambda: orchestrate_many(updates), repeat=repeat)
+            columns = CandidateColumns.from_updates(updates)
+            rows = (
+                ("orchestrate_many(), dict per candidate", records),
+                ("encode columns", measure(lambda: CandidateColumns.from_updates(updates), repeat=repeat)),
+                ("orchestrate_columns(), route + group", measure(
+                    lambda: orchestrator.orchestrate_columns(columns), repeat=repeat)),
+                ("columns + all messages", measure(
+                    lambda: drain(orchestrator.orchestrate_columns(updates).messages()), repeat=repeat)),
+                ("columns + all AgentStates", measure(
+                    lambda: drain(orchestrator.orchestrate_columns(updates)), repeat=repeat)),
+            )
+            for label, seconds in rows:
+                print(f"  {count:>10} {label:<40} {seconds / count * 1e6:13.3f} {records / seconds:7.1f}x")
+                record(f"{count}, {label}", seconds / count)
+            del updates, columns
+    finally:
+        set_event_sink(console_sink())
+
+@benchmark("queue")
+def bench_queue():
+    """SQLite work queue: enqueue/s and dequeue-process-ack/s by batch size, workers and synchronous"""
+    count = 20000
+    updates = make_updates(count)
+
+    def fresh(tmp, name, **kwargs):
+        return WorkQueue(os.path.join(tmp, f"{name}.db"), **kwargs)
+
+    def rate(label, seconds):
+        print(f"  {label:<48} {count / seconds:10,.0f} items/s  {seconds / count * 1e6:8.2f} us/item")
+        record(label, seconds / count)
+
+    set_event_sink(NullSink())
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            print("\n  enqueue")
+            for synchronous in ("NORMAL", "FULL"):
+                queue = fresh(tmp, f"single-{synchronous}", synchronous=synchronous)
+                single = updates[:2000]
+                start = time.perf_counter()
+                for update in single:
+                    queue.enqueue(update)
+                seconds = (time.perf_counter() - start) * count / len(single)
+                rate(f"enqueue(), one transaction each, {synchronous}", seconds)
+                queue.close()
+                for size in (100, 1000):
+                    queue = fresh(tmp, f"many-{synchronous}-{size}", synchronous=synchronous)
+                    start = time.perf_counter()
+                    for offset in range(0, count, size):
+                        queue.enqueue_many(updates[offset:offset + size])
+                    rate(f"enqueue_many() x{size}, {synchronous}", time.perf_counter() - start)
+                    queue.close()
+
+            print("\n  lease + ack, no processing")
+            for size in (1, 10, 100, 1000):
+                queue = fresh(tmp, f"lease-{size}")
+                queue.enqueue_many(updates)
+                start = time.perf_counter()
+                while True:
+                    leases = queue.lease("bench", size)
+                    if not leases:
+                        break
+                    queue.ack(leases)
+                rate(f"lease({size}) + ack()", time.perf_counter() - start)
+                queue.close()
+
+            print("\n  dequeue-process-ack (run_workers, keyword tips)")
+            rate("orchestrate_many() alone, no queue", measure(lambda: orchestrate_many(updates), repeat=3))
+            for workers, size in ((1, 10), (1, 100), (1, 1000), (4, 100)):
+                queue = fresh(tmp, f"workers-{workers}-{size}")
+                queue.enqueue_many(updates)
+                stats = run_workers(queue, workers=workers, batch_size=size)
+                assert stats.processed == count
+                rate(f"{workers} worker(s), batch_size={size}", stats.seconds)
+                queue.close()
+    finally:
+        set_event_sink(console_sink())
+
+@benchmark("dedup")
+def bench_dedup():
+    """Dedup stage at 10M keys: Bloom filter false positives, lookups/s with and without the filter"""
+    count, sample, chunk = 10_000_000, 200_000, 100_000
+
+    def keys(start, stop, status="Interview"):
+        return [event_key(f"candidate{i}@example.com", "J123", status) for i in range(start, stop)]
+
+    def rate(label, seconds, items):
+        print(f"  {label:<48} {items / seconds:12,.0f} /s  {seconds / items * 1e6:8.2f} us")
+        record(label, seconds / items)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "seen.db")
+        dedup = Deduplicator(path, capacity=count)
+        marking = 0.0
+        for start in range(0, count, chunk):
+            batch = keys(start, start + chunk)
+            begin = time.perf_counter()
+            dedup.mark_keys(batch)
+            marking += time.perf_counter() - begin
+        rate(f"mark_keys() x{chunk:,} up to {count:,} keys", marking, count)
+        print(f"  {'database file':<48} {os.path.getsize(path) / 1e6:12,.0f} MB")
+        absent = keys(0, sample, "Assessment")
+
+        def false_positives(label, bloom):
+            measured = sum(key in bloom for key in absent) / len(absent)
+            print(f"  {label:<48} {measured:12.3%}     (expected {bloom.expected_error_rate():.3%}; "
+                  f"{len(bloom._bits) / 1e6:.1f} MB, {bloom.hashes} hashes, {bloom.size / len(bloom):.1f} bits/key)")
+
+        false_positives(f"false positives, {count:,} keys at capacity", dedup.bloom)
+        dedup.close()
+
+        start = time.perf_counter()
+        dedup = Deduplicator(path, capacity=count)
+        rate("reopen: rebuild the filter from SQLite", time.perf_counter() - start, count)
+        false_positives("false positives after reopen (sized 2x)", dedup.bloom)
+
+        present = [event_key(f"candidate{i}@example.com", "J123", "Interview") for i in range(0, count, count // sample)]
+        bloom = dedup.bloom
+        conn = dedup._conn
+        def exact(batch):
+            for key in batch:
+                conn.execute("SELECT seen_at FROM seen WHERE key = ?", (key,)).fetchone()
+        def filtered(batch):
+            for key in batch:
+                dedup._seen(key)
+        def contains(batch):
+            for key in batch:
+                key in bloom
+
+        rate("new key: Bloom filter only", measure(lambda: contains(absent), repeat=3), sample)
+        rate("new key: filter, then SQLite on a false positive", measure(lambda: filtered(absent), repeat=3), sample)
+        rate("new key: SQLite only (no filter)", measure(lambda: exact(absent), repeat=3), sample)
+        rate("seen key: filter + SQLite", measure(lambda: filtered(present), repeat=3), len(present))
+        rate("seen key: SQLite only", measure(lambda: exact(present), repeat=3), len(present))
+        rate("event_key() digest", measure(lambda: keys(0, sample), repeat=3), sample)
+        dedup.close()
+
+# Cold start of `import orchestrator` plus one assessment, with cached
+# bytecode (best of 3 runs); generous so slow CI machines pass, tight
+# enough to catch asyncio or anthropic creeping back in (~50 ms each)
+IMPORT_BUDGET_MS = 100
+
+@benchmark("cold_start")
+def bench_cold_start():
+    """Cumulative `import orchestrator` time in a fresh interpreter, against its budget"""
+    code = ("import orchestrator; orchestrator.set_event_sink(orchestrator.NullSink()); "
+            "orchestrator.orchestrate('Ana', 'ana@example.com', 'Assessment', 'J123')")
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, PYTHONPYCACHEPREFIX=tmp)
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+        cwd = os.path.dirname(os.path.abspath(__file__))
+        timings = []
+        for _ in range(4):   # the first run only compiles the bytecode
+            completed = subprocess.run([sys.executable, "-X", "importtime", "-c", code], env=env, cwd=cwd,
+                                       capture_output=True, text=True, check=True)
+            cumulative = [line.split("|")[1] for line in completed.stderr.splitlines()
+                          if line.rstrip().endswith("| orchestrator")]
+            timings.append(int(cumulative[0]) / 1e6)
+    best = min(timings[1:])
+    print(f"\n  {'import orchestrator':<40} {best * 1e3:10.2f} ms  (budget {IMPORT_BUDGET_MS} ms)")
+    record("import orchestrator", best)
+    if best * 1e3 > IMPORT_BUDGET_MS:
+        OVER_BUDGET.append(f"import orchestrator took {best * 1e3:.1f} ms (budget {IMPORT_BUDGET_MS} ms)")
+
+@benchmark("server")
+def bench_server():
+    """HTTP server requests/s and p99 latency: keep-alive, micro-batch window, batch endpoint"""
+    from loadgen import run_load
+    from server import OrchestratorServer
+
+    def cold_call():
+        subprocess.run([sys.executable, "-c", "import orchestrator; orchestrator.set_event_sink(orchestrator.NullSink()); "
+                        "orchestrator.orchestrate('Sarah', 's@example.com', 'Assessment', 'J123')"], check=True)
+
+    async def load(window_ms, requests, concurrency, batch_size=None, max_batch=256):
+        async with OrchestratorServer(port=0, batch_window_ms=window_ms, max_batch=max_batch) as server:
+            await run_load(port=server.port, requests=min(requests, 200), concurrency=concurrency, batch_size=batch_size)
+            report = await run_load(port=server.port, requests=requests, concurrency=concurrency, batch_size=batch_size)
+            return report, server.stats()
+
+    set_event_sink(NullSink())
+    try:
+        cold = measure(cold_call, repeat=3)
+        print(f"\n  {'new interpreter per call':<40} {1 / cold:10.0f} req/s  {cold * 1e3:8.2f} ms per call")
+        record("new interpreter per call", cold)
+        print(f"  server and load generator share one event loop ({os.cpu_count()} CPUs)")
+        for window_ms, concurrency, max_batch, batch_size in ((0, 1, 256, None), (0, 32, 256, None),
+                                                              (2, 32, 256, None), (10, 32, 256, None),
+                                                              (10, 32, 16, None), (0, 8, 256, 50)):
+            requests = 500 if batch_size else 5000
+            report, stats = asyncio.run(load(window_ms, requests, concurrency, batch_size, max_batch))
+            if batch_size:
+                label = f"/batch of {batch_size}, c={concurrency}"
+            else:
+                label = f"window {window_ms} ms, c={concurrency}" + (f", max_batch {max_batch}" if max_batch != 256 else "")
+            print(f"  {label:<40} {report.requests_per_second:10.0f} req/s  p99 {report.p99_ms:8.2f} ms  "
+                  f"{report.updates_per_second:8.0f} updates/s  {stats['batched_updates'] / stats['batches']:6.1f}/batch")
+            record(f"{label}, per update", 1 / report.updates_per_second)
+            record(f"{label}, p99", report.p99_ms / 1e3)
+    finally:
+        set_event_sink(console_sink())
+
+# ============= RESULTS =============
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def save_results(path):
+    """Write the collected results with enough context to compare runs"""
+    data = {
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "unit": "seconds per item",
+        "results": RESULTS,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+def compare_results(old_path, new_path, threshold=10.0):
+    """
+    Print old vs. new for every result; returns the labels that got
+    more than threshold percent slower
+    """
+    with open(old_path, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)
+    print(f"\n  {old_path} ({old.get('commit')}) → {new_path} ({new.get('commit')}), threshold {threshold:g}%\n")
+    print(f"  {'result':<60} {'old':>11} {'new':>11} {'change':>9}")
+
+    slower = []
+    old_results, new_results = old["results"], new["results"]
+    for label in list(old_results) + [label for label in new_results if label not in old_results]:
+        before, after = old_results.get(label), new_results.get(label)
+        if before is None or after is None:
+            status = "(new only)" if before is None else "(old only)"
+            value = after if before is None else before
+            print(f"  {label:<60} {value * 1e6:9.2f}us {status:>21}")
+            continue
+        change = (after - before) / before * 100 if before else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  slower"
+            slower.append(label)
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"  {label:<60} {before * 1e6:9.2f}us {after * 1e6:9.2f}us {change:+8.1f}%{flag}")
+    return slower
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["compare"]:
+        parser = argparse.ArgumentParser(prog="python3 bench.py compare",
+                                         description="Compare two --json result files.")
+        parser.add_argument("old")
+        parser.add_argument("new")
+        parser.add_argument("--threshold", type=float, default=10.0,
+                            help="percent change reported as slower/faster (default: 10)")
+        args = parser.parse_args(argv[1:])
+        slower = compare_results(args.old, args.new, args.threshold)
+        print(f"\n  {len(slower)} result(s) slower by more than {args.threshold:g}%")
+        return 1 if slower else 0
+
+    parser = argparse.ArgumentParser(prog="python3 bench.py", description="Run RecruitEM benchmarks.")
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run (default: all): {', '.join(BENCHMARKS)}")
+    parser.add_argument("--json", metavar="FILE", help="save the collected results to FILE")
+    args = parser.parse_args(argv)
+
+    selected = args.names or list(BENCHMARKS)
+    unknown = [name for name in selected if name not in BENCHMARKS]
+    if unknown:
+        sys.exit(f"Unknown benchmark(s): {', '.join(unknown)}. Available: {', '.join(BENCHMARKS)}")
+
+    global _running
+    print("\n" + "=" * 70)
+    print("RECRUITEM ORCHESTRATOR - BENCHMARKS")
+    print("=" * 70)
+
+    for name in selected:
+        print(f"\n[{name}] {BENCHMARKS[name].__doc__}")
+        print("-" * 70)
+        _running = name
+        BENCHMARKS[name]()
+
+    print("\n" + "=" * 70)
+    print("BENCHMARKS COMPLETED")
+    print("=" * 70 + "\n")
+
+    if args.json:
+        save_results(args.json)
+        print(f"{len(RESULTS)} results saved to {args.json}")
+    for failure in OVER_BUDGET:
+        print(f"OVER BUDGET: {failure}")
+    return 1 if OVER_BUDGET else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
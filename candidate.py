@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Candidate Record - Compact per-candidate state for large batches
+================================================================
+
+An AgentState is a dict of eight keys, and every candidate of a batch
+carries its own copy of the job title and description. With a million
+candidates in flight that per-candidate dict dominates memory.
+CandidateRecord keeps the same data in a __slots__ object:
+
+    AgentState dict (8 keys, own job strings)  →  CandidateRecord
+        candidate_name, candidate_email            own strings
+        status                                     interned
+        job ─────────────────────────────────────→ one Job per distinct job_id,
+                                                   shared by its candidates
+        output_message, metadata                   filled in by the agents
+
+Records read and write like an AgentState (record["job_title"],
+record["output_message"] = ...), so the router, the agents, message
+templates and pipeline.result_record() take either. to_state() and
+CandidateRecord.from_state() convert between the two.
+
+Author: RecruitEM Team
+"""
+
+import sys
+from operator import attrgetter
+from typing import Dict, Iterator, Optional
+
+from catalog import Job
+
+# AgentState keys, in AgentState order
+FIELDS = ("job_id", "candidate_name", "candidate_email", "status",
+          "job_title", "job_description", "output_message", "metadata")
+
+_JOB_FIELDS = {"job_id": "job_id", "job_title": "title", "job_description": "description"}
+
+# AgentState key → getter, job fields reading straight from the shared Job
+_GETTERS = {key: attrgetter(f"job.{_JOB_FIELDS[key]}" if key in _JOB_FIELDS else key) for key in FIELDS}
+
+def shared_job(job_id: str, title: str, description: str) -> Job:
+    """A Job with interned ID and title, to be shared by every candidate for it"""
+    return Job(sys.intern(job_id), sys.intern(title), description)
+
+class CandidateRecord:
+    """
+    One candidate's state, as a slotted object
+
+    The job fields come from the shared `job` and can't be set per
+    candidate; the other AgentState keys can. The metadata dict is
+    only created when first read, as the agents replace it anyway.
+    """
+    __slots__ = ("candidate_name", "candidate_email", "status", "job", "output_message", "_metadata")
+
+    def __init__(self, candidate_name: str, candidate_email: str, status: str, job: Job,
+                 output_message: str = "", metadata: Optional[dict] = None):
+        self.candidate_name = candidate_name
+        self.candidate_email = candidate_email
+        self.status = sys.intern(status)
+        self.job = job
+        self.output_message = output_message
+        self._metadata = metadata
+
+    @property
+    def metadata(self) -> dict:
+        if self._metadata is None:
+            self._metadata = {}
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, value: dict) -> None:
+        self._metadata = value
+
+    @property
+    def job_id(self) -> str:
+        return self.job.job_id
+
+    @property
+    def job_title(self) -> str:
+        return self.job.title
+
+    @property
+    def job_description(self) -> str:
+        return self.job.description
+
+    # --- AgentState (dict) interface ---
+
+    def __getitem__(self, key: str):
+        return _GETTERS[key](self)
+
+    def __setitem__(self, key: str, value) -> None:
+        if key in _JOB_FIELDS:
+            raise KeyError(f"{key!r} comes from the shared job and can't be set per candidate")
+        if key not in FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in FIELDS else default
+
+    def update(self, other) -> None:
+        """Copy the candidate fields of another state or record (job fields must match)"""
+        for key in FIELDS:
+            if key in _JOB_FIELDS:
+                if other[key] != self[key]:
+                    raise ValueError(f"can't change {key!r} of a record")
+            else:
+                setattr(self, key, other[key])
+
+    def keys(self):
+        return FIELDS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(FIELDS)
+
+    def __len__(self) -> int:
+        return len(FIELDS)
+
+    def __contains__(self, key) -> bool:
+        return key in FIELDS
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (CandidateRecord, dict)):
+            return len(other) == len(FIELDS) and all(key in other and other[key] == self[key] for key in FIELDS)
+        return NotImplemented
+
+    __hash__ = None   # mutable, like the dict it stands in for
+
+    def __repr__(self) -> str:
+        return (f"CandidateRecord({self.candidate_name!r}, {self.candidate_email!r}, "
+                f"{self.status!r}, job_id={self.job.job_id!r})")
+
+    # --- conversion ---
+
+    def to_state(self) -> dict:
+        """The equivalent AgentState dict (metadata is shared, not copied)"""
+        return {key: getattr(self, key) for key in FIELDS}
+
+    @classmethod
+    def from_state(cls, state, jobs: Optional[Dict[str, Job]] = None) -> "CandidateRecord":
+        """
+        A record for an AgentState
+
+        Args:
+            state: AgentState dict (or any mapping with its keys)
+            jobs: job_id → shared Job; reused when the ID is there, else
+                  filled in, so converting a batch shares one Job per job
+        """
+        job_id = state["job_id"]
+        job = jobs.get(job_id) if jobs is not None else None
+        if job is None:
+            job = shared_job(job_id, state["job_title"], state["job_description"])
+            if jobs is not None:
+                jobs[job_id] = job
+        return cls(state["candidate_name"], state["candidate_email"], state["status"], job,
+                   state["output_message"], state["metadata"])
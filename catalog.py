@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Job Catalog - Where job descriptions and test links come from
+=============================================================
+
+The orchestrator looks jobs up by ID and test links by job title
+through a JobCatalog, so the data can live somewhere other than the
+inline dicts in orchestrator.py:
+
+    DictCatalog     in-memory dicts (the default, wraps JOB_DESCRIPTIONS / TEST_LINKS)
+    SQLiteCatalog   a SQLite file indexed by job_id and title, for large catalogs
+    CachedCatalog   read-through LRU in front of another catalog (usually SQLite)
+
+Author: RecruitEM Team
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+
+class Job(NamedTuple):
+    """One job requisition"""
+    job_id: str
+    title: str
+    description: str
+
+class JobCatalog:
+    """
+    Interface of a job catalog
+
+    Subclasses implement get(), test_link(), jobs_with_title(), jobs()
+    and __len__(). Lookups of unknown keys return None (or an empty
+    list) rather than raising.
+    """
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """The job with this ID, or None"""
+        raise NotImplementedError
+
+    def test_link(self, title: str) -> Optional[str]:
+        """The assessment link for a job title, or None"""
+        raise NotImplementedError
+
+    def jobs_with_title(self, title: str) -> List[Job]:
+        """Every job with exactly this title, in job_id order"""
+        raise NotImplementedError
+
+    def jobs(self) -> Iterator[Job]:
+        """Every job (used to build search indexes)"""
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __contains__(self, job_id: str) -> bool:
+        return self.get(job_id) is not None
+
+    def reopened(self) -> "JobCatalog":
+        """
+        This catalog, usable in the current process
+
+        Catalogs holding connections return a copy with their own
+        connection when called in a forked child; others return self.
+        """
+        return self
+
+class DictCatalog(JobCatalog):
+    """
+    Catalog over in-memory dicts
+
+    The dicts are used live, not copied, so editing them (e.g. adding a
+    job to JOB_DESCRIPTIONS) is visible immediately.
+
+    Args:
+        jobs: Job ID → {"title": ..., "description": ...}
+        test_links: Job title → assessment URL
+    """
+
+    def __init__(self, jobs: Optional[Dict[str, Mapping[str, str]]] = None,
+                 test_links: Optional[Dict[str, str]] = None):
+        self.job_data = jobs if jobs is not None else {}
+        self.test_links = test_links if test_links is not None else {}
+
+    def get(self, job_id: str) -> Optional[Job]:
+        info = self.job_data.get(job_id)
+        if info is None:
+            return None
+        return Job(job_id, info["title"], info["description"])
+
+    def test_link(self, title: str) -> Optional[str]:
+        return self.test_links.get(title)
+
+    def jobs_with_title(self, title: str) -> List[Job]:
+        return [self.get(job_id) for job_id in sorted(self.job_data) if self.job_data[job_id]["title"] == title]
+
+    def jobs(self) -> Iterator[Job]:
+        for job_id, info in list(self.job_data.items()):
+            yield Job(job_id, info["title"], info["description"])
+
+    def __len__(self) -> int:
+        return len(self.job_data)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self.job_data
+
+    def __reduce__(self):
+        # Snapshots hold read-only proxies, which can't be pickled
+        jobs = {job_id: dict(info) for job_id, info in self.job_data.items()}
+        return DictCatalog, (jobs, dict(self.test_links))
+
+class SplitCatalog(JobCatalog):
+    """
+    Jobs from one catalog, test links from another
+
+    Lets a reload replace only the data it loaded (see data_reload.py).
+
+    Args:
+        jobs: Catalog answering get(), jobs_with_title(), jobs() and len()
+        test_links: Catalog answering test_link()
+    """
+
+    def __init__(self, jobs: JobCatalog, test_links: JobCatalog):
+        self.job_source = jobs
+        self.link_source = test_links
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.job_source.get(job_id)
+
+    def test_link(self, title: str) -> Optional[str]:
+        return self.link_source.test_link(title)
+
+    def jobs_with_title(self, title: str) -> List[Job]:
+        return self.job_source.jobs_with_title(title)
+
+    def jobs(self) -> Iterator[Job]:
+        return self.job_source.jobs()
+
+    def __len__(self) -> int:
+        return len(self.job_source)
+
+    def reopened(self) -> "SplitCatalog":
+        jobs, test_links = self.job_source.reopened(), self.link_source.reopened()
+        if jobs is self.job_source and test_links is self.link_source:
+            return self
+        return SplitCatalog(jobs, test_links)
+
+class SQLiteCatalog(JobCatalog):
+    """
+    Catalog stored in a SQLite file
+
+    Jobs are looked up through the job_id primary key and a title
+    index; nothing is loaded into memory up front, so a catalog of tens
+    of thousands of requisitions costs one connection. Put a
+    CachedCatalog in front of it for repeated lookups.
+
+    Args:
+        path: SQLite database file (":memory:" for a throwaway catalog)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        import sqlite3   # only this backend needs it; keeps `import orchestrator` light
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " job_id TEXT PRIMARY KEY,"
+                " title TEXT NOT NULL,"
+                " description TEXT NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_title ON jobs (title)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS test_links ("
+                " title TEXT PRIMARY KEY,"
+                " link TEXT NOT NULL)"
+            )
+
+    @classmethod
+    def from_catalog(cls, path: str, catalog: JobCatalog, test_links: Mapping[str, str]) -> "SQLiteCatalog":
+        """Create (or update) a SQLite catalog with the jobs of another catalog plus test_links"""
+        store = cls(path)
+        store.add_jobs(catalog.jobs())
+        store.set_test_links(test_links)
+        return store
+
+    def add_jobs(self, jobs: Iterable[Tuple[str, str, str]]) -> None:
+        """Insert or replace (job_id, title, description) rows in one transaction"""
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO jobs (job_id, title, description) VALUES (?, ?, ?)", jobs)
+
+    def remove_job(self, job_id: str) -> bool:
+        """Delete a job; returns False if it was not stored"""
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,)).rowcount > 0
+
+    def set_test_links(self, test_links: Mapping[str, str]) -> None:
+        """Insert or replace title → link entries"""
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO test_links (title, link) VALUES (?, ?)", test_links.items())
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT job_id, title, description FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return Job(*row) if row is not None else None
+
+    def test_link(self, title: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT link FROM test_links WHERE title = ?", (title,)).fetchone()
+        return row[0] if row is not None else None
+
+    def jobs_with_title(self, title: str) -> List[Job]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT job_id, title, description FROM jobs WHERE title = ? ORDER BY job_id", (title,)
+            ).fetchall()
+        return [Job(*row) for row in rows]
+
+    def jobs(self, page_size: int = 1000) -> Iterator[Job]:
+        # Keyset pagination, so the lock is never held while the caller works
+        last = ""
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT job_id, title, description FROM jobs WHERE job_id > ? ORDER BY job_id LIMIT ?",
+                    (last, page_size)
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield Job(*row)
+            last = rows[-1][0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def reopened(self) -> "SQLiteCatalog":
+        if self._pid == os.getpid():
+            return self
+        self._check_shareable()
+        return SQLiteCatalog(self.path)   # a SQLite connection must not cross a fork
+
+    def __reduce__(self):
+        self._check_shareable()
+        return SQLiteCatalog, (self.path,)
+
+    def _check_shareable(self) -> None:
+        if self.path == ":memory:":
+            raise ValueError("a ':memory:' SQLiteCatalog can't be used from another process")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+# Cached result for a key the backing catalog doesn't have
+_MISSING = object()
+
+class CachedCatalog(JobCatalog):
+    """
+    Read-through LRU in front of another catalog
+
+    get() and test_link() results are kept for the max_entries most
+    recently used keys, including "not found" results, so repeated
+    lookups of unknown job IDs don't reach the backend either. Call
+    clear() after changing the backing catalog.
+
+    Args:
+        catalog: Backing catalog (e.g. SQLiteCatalog)
+        max_entries: Maximum number of cached lookups
+    """
+
+    def __init__(self, catalog: JobCatalog, max_entries: int = 1024):
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be >= 1, got {max_entries}")
+        self.catalog = catalog
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key: tuple, load):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return None if value is _MISSING else value
+
+        value = load(key[1])
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = _MISSING if value is None else value
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._lookup(("job", job_id), self.catalog.get)
+
+    def test_link(self, title: str) -> Optional[str]:
+        return self._lookup(("link", title), self.catalog.test_link)
+
+    def jobs_with_title(self, title: str) -> List[Job]:
+        return self.catalog.jobs_with_title(title)
+
+    def jobs(self) -> Iterator[Job]:
+        return self.catalog.jobs()
+
+    def __len__(self) -> int:
+        return len(self.catalog)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current cache size"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+    def clear(self) -> None:
+        """Drop every cached lookup and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def reopened(self) -> "CachedCatalog":
+        catalog = self.catalog.reopened()
+        return self if catalog is self.catalog else CachedCatalog(catalog, self.max_entries)
+
+    def __reduce__(self):
+        # The lock can't be pickled; the copy starts with an empty cache
+        return CachedCatalog, (self.catalog, self.max_entries)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Columnar Batches - Million-candidate runs as parallel arrays
+============================================================
+
+orchestrate_many() builds one state dict per candidate and drafts its
+message straight away. For very large runs most of that work is the
+same for every candidate of a job, so orchestrator.orchestrate_columns()
+works on whole columns instead:
+
+    updates → CandidateColumns (names, emails, status codes, job codes)
+            → route each distinct status, resolve each distinct job
+            → agent code per row (one take), np.unique group-by (agent, job)
+            → one message context per group → ColumnarBatch
+
+Statuses and job IDs are categorical: a list of distinct values plus
+an int32 code per row. A ColumnarBatch keeps the group code of every
+row and renders a candidate's message only when it is read, so a run
+holds two strings and two small ints per candidate until output.
+
+Requires NumPy.
+
+Author: RecruitEM Team
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+def encode(values: Iterable[str], count: int = -1) -> Tuple[List[str], np.ndarray]:
+    """
+    Categorical encoding of a column
+
+    Returns:
+        (distinct values in first-seen order, int32 code per value)
+    """
+    categories: Dict[str, int] = {}
+    setdefault = categories.setdefault
+    codes = np.fromiter((setdefault(value, len(categories)) for value in values), dtype=np.int32, count=count)
+    return list(categories), codes
+
+class CandidateColumns:
+    """
+    Status updates as parallel columns
+
+    Attributes:
+        names, emails: Per-row strings
+        statuses, job_ids: Distinct statuses and job IDs (categories)
+        status_codes, job_codes: int32 index into those per row
+    """
+    __slots__ = ("names", "emails", "statuses", "status_codes", "job_ids", "job_codes")
+
+    def __init__(self, names: List[str], emails: List[str], statuses: List[str], status_codes: np.ndarray,
+                 job_ids: List[str], job_codes: np.ndarray):
+        if not len(names) == len(emails) == len(status_codes) == len(job_codes):
+            raise ValueError("columns must have the same length")
+        self.names = names
+        self.emails = emails
+        self.statuses = statuses
+        self.status_codes = status_codes
+        self.job_ids = job_ids
+        self.job_codes = job_codes
+
+    @classmethod
+    def from_columns(cls, names: Sequence[str], emails: Sequence[str], statuses: Sequence[str],
+                     job_ids: Sequence[str]) -> "CandidateColumns":
+        """Columns from four equally long sequences"""
+        status_categories, status_codes = encode(statuses, len(statuses))
+        job_categories, job_codes = encode(job_ids, len(job_ids))
+        return cls(list(names), list(emails), status_categories, status_codes, job_categories, job_codes)
+
+    @classmethod
+    def from_updates(cls, updates: Iterable[Tuple[str, str, str, str]]) -> "CandidateColumns":
+        """Columns from StatusUpdates (or plain (name, email, status, job_id) tuples)"""
+        updates = updates if isinstance(updates, (list, tuple)) else list(updates)
+        if not updates:
+            return cls([], [], [], np.zeros(0, np.int32), [], np.zeros(0, np.int32))
+        names, emails, statuses, job_ids = zip(*updates)
+        return cls.from_columns(names, emails, statuses, job_ids)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def row(self, index: int) -> Tuple[str, str, str, str]:
+        """(name, email, status, job_id) of one row"""
+        return (self.names[index], self.emails[index], self.statuses[self.status_codes[index]],
+                self.job_ids[self.job_codes[index]])
+
+def group_by(*codes: np.ndarray, sizes: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Group rows by several code columns at once
+
+    Args:
+        codes: Code columns of equal length
+        sizes: Number of categories of each column
+
+    Returns:
+        (per group: its codes as a (groups, columns) array, group code per row)
+    """
+    key = np.zeros(len(codes[0]), dtype=np.int64)
+    for column, size in zip(codes, sizes):
+        key = key * max(size, 1) + column
+    uniques, inverse = np.unique(key, return_inverse=True)
+    parts = []
+    for size in reversed(sizes):
+        uniques, part = np.divmod(uniques, max(size, 1))
+        parts.append(part)
+    return np.stack(parts[::-1], axis=1), inverse.astype(np.int32)
+
+class ColumnarBatch:
+    """
+    Result of orchestrate_columns(): group contexts plus a group code per row
+
+    Messages and AgentState dicts are built when read. Rows of agents
+    without a column context were drafted as states up front and are
+    returned as they are.
+
+    Attributes:
+        columns: The input columns
+        agents: Agent names (agent_codes index into this)
+        agent_codes: int32 agent per row
+        group_codes: int32 group per row (contexts index into this)
+        contexts: Per group, (template, metadata, job title, job description), or None for drafted rows
+    """
+
+    def __init__(self, columns: CandidateColumns, agents: List[str], agent_codes: np.ndarray,
+                 group_codes: np.ndarray, contexts: List[Optional[tuple]], drafted: Dict[int, dict]):
+        self.columns = columns
+        self.agents = agents
+        self.agent_codes = agent_codes
+        self.group_codes = group_codes
+        self.contexts = contexts
+        self._drafted = drafted
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def agent_counts(self) -> Dict[str, int]:
+        """Candidates per agent"""
+        counts = np.bincount(self.agent_codes, minlength=len(self.agents))
+        return dict(zip(self.agents, counts.tolist()))
+
+    def message(self, index: int) -> str:
+        """The drafted message of one row"""
+        context = self.contexts[self.group_codes[index]]
+        if context is None:
+            return self._drafted[index]["output_message"]
+        return context[0].render({"candidate_name": self.columns.names[index]})
+
+    def messages(self) -> Iterator[str]:
+        """Every row's message, in input order"""
+        contexts, drafted = self.contexts, self._drafted
+        for index, (name, group) in enumerate(zip(self.columns.names, self.group_codes.tolist())):
+            context = contexts[group]
+            yield drafted[index]["output_message"] if context is None else context[0].render({"candidate_name": name})
+
+    def state(self, index: int) -> dict:
+        """The AgentState of one row, as orchestrate_many() would return it"""
+        context = self.contexts[self.group_codes[index]]
+        if context is None:
+            return self._drafted[index]
+        return self._state(index, self.columns.names[index], context)
+
+    def __iter__(self) -> Iterator[dict]:
+        """Every row's AgentState, in input order"""
+        contexts, drafted = self.contexts, self._drafted
+        for index, (name, group) in enumerate(zip(self.columns.names, self.group_codes.tolist())):
+            context = contexts[group]
+            yield drafted[index] if context is None else self._state(index, name, context)
+
+    def _state(self, index: int, name: str, context: tuple) -> dict:
+        template, metadata, job_title, job_description = context
+        columns = self.columns
+        return {
+            "job_id": columns.job_ids[columns.job_codes[index]],
+            "candidate_name": name,
+            "candidate_email": columns.emails[index],
+            "status": columns.statuses[columns.status_codes[index]],
+            "job_title": job_title,
+            "job_description": job_description,
+            "output_message": template.render({"candidate_name": name}),
+            "metadata": dict(metadata)
+        }
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Data Reload - Hot-reload jobs, test links and tips from files
+=============================================================
+
+Recruiters edit test links and tips during the day. DataReloader
+watches JSON source files by polling their modification times and,
+when one changes, builds a complete new DataSnapshot (catalog, BM25
+index, keyword matcher, vector index) on its own thread before
+swapping it in with a single reference assignment:
+
+    files changed → load + validate → DataSnapshot.from_catalog() → use_data_snapshot()
+
+Requests never wait for a rebuild and never see a half-updated
+catalog: each orchestrate*() call keeps the snapshot it started with.
+If a file can't be loaded the current snapshot stays in place.
+
+Files (each optional; data without a file comes from the job catalog
+active when the reloader first loads, e.g. one installed with
+set_job_catalog(), and tips from INTERVIEW_TIPS_DB). Job embeddings are
+only recomputed when the jobs file changes.
+    jobs        {"J123": {"title": "...", "description": "..."}, ...}
+    test_links  {"Python Developer": "https://...", ...}
+    tips        {"python": "Review async/await patterns...", ...}
+
+Author: RecruitEM Team
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import orchestrator
+from events import INFO, WARNING
+from catalog import DictCatalog, JobCatalog, SplitCatalog
+from orchestrator import DataSnapshot, EVENTS
+
+DEFAULT_POLL_INTERVAL = 1.0
+
+# Modification time and size; a change in either triggers a reload
+FileSignature = Tuple[int, int]
+
+def _load_json_object(path: str, kind: str, validate: Callable[[object], bool]) -> dict:
+    with open(path, encoding="utf-8") as f:
+        try:
+            data = json.load(f)
+        except ValueError as e:
+            raise ValueError(f"{path}: invalid JSON: {e}") from None
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a JSON object of {kind}")
+    for key, value in data.items():
+        if not validate(value):
+            raise ValueError(f"{path}: invalid entry for {key!r}")
+    return data
+
+def _is_job(value) -> bool:
+    return (isinstance(value, dict) and isinstance(value.get("title"), str)
+            and isinstance(value.get("description"), str))
+
+class DataReloader:
+    """
+    Polls data files and installs a fresh DataSnapshot when they change
+
+    Args:
+        jobs: Path of the jobs JSON file (None: keep the active catalog's jobs)
+        test_links: Path of the test links JSON file (None: keep the active catalog's links)
+        tips: Path of the tips JSON file (None: keep INTERVIEW_TIPS_DB)
+        interval: Seconds between polls when running in the background
+        vectors: Also rebuild the vector index for semantic search
+    """
+
+    def __init__(
+        self,
+        jobs: Optional[str] = None,
+        test_links: Optional[str] = None,
+        tips: Optional[str] = None,
+        interval: float = DEFAULT_POLL_INTERVAL,
+        vectors: bool = True
+    ):
+        self.paths = {name: path for name, path in
+                      (("jobs", jobs), ("test_links", test_links), ("tips", tips)) if path is not None}
+        if not self.paths:
+            raise ValueError("DataReloader needs at least one of jobs, test_links or tips")
+        self.interval = interval
+        self.vectors = vectors
+        self.version = 0
+        self.last_error: Optional[str] = None
+        self._signatures: Dict[str, Optional[FileSignature]] = {}
+        self._base_catalog: Optional[JobCatalog] = None   # active catalog at the first load
+        self._snapshot: Optional[DataSnapshot] = None     # last snapshot installed by this reloader
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _signature(self, path: str) -> Optional[FileSignature]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load(self, jobs_changed: bool) -> DataSnapshot:
+        paths = self.paths
+        if self._base_catalog is None:
+            self._base_catalog = orchestrator.get_job_catalog()
+        base = self._base_catalog
+        jobs = (DictCatalog(_load_json_object(paths["jobs"], "jobs", _is_job), {})
+                if "jobs" in paths else base)
+        test_links = (DictCatalog({}, _load_json_object(paths["test_links"], "test links",
+                                                        lambda v: isinstance(v, str)))
+                      if "test_links" in paths else base)
+        tips = (_load_json_object(paths["tips"], "tips", lambda v: isinstance(v, str))
+                if "tips" in paths else orchestrator.INTERVIEW_TIPS_DB)
+        catalog = jobs if jobs is test_links else SplitCatalog(jobs, test_links)
+
+        previous = self._snapshot
+        job_vectors = (previous.vector_index
+                       if not jobs_changed and previous is not None else None)
+        return DataSnapshot.from_catalog(catalog, tips, version=self.version + 1,
+                                         vectors=self.vectors, job_vectors=job_vectors)
+
+    def check(self) -> bool:
+        """
+        Reload now if any file changed since the last check
+
+        The new snapshot is built on the calling thread and installed
+        only once complete. A file that fails to load is reported (the
+        "data.reload_failed" event and last_error) and retried when it
+        changes again.
+
+        Returns:
+            True if a new snapshot was installed
+        """
+        with self._lock:
+            signatures = {name: self._signature(path) for name, path in self.paths.items()}
+            if signatures == self._signatures:
+                return False
+            jobs_changed = ("jobs" in signatures
+                            and signatures["jobs"] != self._signatures.get("jobs"))
+            self._signatures = signatures
+
+            start = time.perf_counter()
+            try:
+                snapshot = self._load(jobs_changed)
+            except (OSError, ValueError, KeyError) as e:
+                self.last_error = str(e)
+                if EVENTS.level <= WARNING:
+                    EVENTS.emit(WARNING, "data.reload_failed", error=self.last_error)
+                return False
+
+            orchestrator.use_data_snapshot(snapshot)
+            self._snapshot = snapshot
+            self.version = snapshot.version
+            self.last_error = None
+            if EVENTS.level <= INFO:
+                EVENTS.emit(INFO, "data.reloaded", version=snapshot.version, jobs=len(snapshot.catalog),
+                            tips=len(snapshot.tips), seconds=time.perf_counter() - start)
+            return True
+
+    def start(self) -> "DataReloader":
+        """
+        Load the files now, then keep polling on a daemon thread
+
+        Raises:
+            ValueError: if the initial load fails
+        """
+        if self._thread is not None:
+            return self
+        if not self.check() and self.version == 0:
+            raise ValueError(f"Could not load data files: {self.last_error}")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="data-reloader", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def stop(self, restore: bool = False) -> None:
+        """
+        Stop polling
+
+        Args:
+            restore: Also uninstall the snapshot, going back to the
+                     module dicts
+        """
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        if restore:
+            orchestrator.use_data_snapshot(None)
+
+    def __enter__(self) -> "DataReloader":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop(restore=True)
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Deduplication - Skip status updates that were already processed
+================================================================
+
+ATS webhooks often deliver the same (candidate_email, job_id, status)
+event several times, and orchestrate() would draft and send the same
+message for each. A Deduplicator remembers every processed event in a
+SQLite file and keeps a Bloom filter of them in memory, so most lookups
+never touch the disk:
+
+    update → event_key() (16-byte digest)
+           → Bloom filter: definitely new ──────────────→ process it
+                         → maybe seen → SQLite: seen ───→ skip
+                                            not seen ───→ process it
+                                                          (a false positive)
+
+unseen() filters a stream of updates (dropping repeats within the
+stream too) and mark() records the ones that were processed; mark only
+after the messages went out, so a crash in between repeats work rather
+than losing it. Updates handed out but never marked, because the stream
+stopped early, count as new again once it is closed. With a retention
+window, an event seen longer ago than that counts as new again;
+purge_expired() deletes old events and rebuilds the filter without
+them.
+
+Author: RecruitEM Team
+"""
+
+import hashlib
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from agent_registry import normalize_status
+from orchestrator import StatusUpdate
+
+DEFAULT_CAPACITY = 1_000_000
+DEFAULT_ERROR_RATE = 0.01
+
+_LOW_64 = (1 << 64) - 1
+
+def event_key(candidate_email: str, job_id: str, status: str) -> bytes:
+    """Digest identifying one event; emails and statuses are compared case-insensitively"""
+    text = f"{candidate_email.strip().casefold()}\x1f{job_id.strip()}\x1f{normalize_status(status)}"
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+def update_key(update: StatusUpdate) -> bytes:
+    """event_key() of a StatusUpdate (or (name, email, status, job_id) tuple)"""
+    _, candidate_email, status, job_id = update
+    return event_key(candidate_email, job_id, status)
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over 16-byte digests
+
+    No false negatives; false positives at about error_rate once
+    `capacity` keys have been added, more beyond that. The k bit
+    positions are a start and a step taken from the two halves of the
+    digest (double hashing), so adding or checking a key costs no
+    further hashing.
+
+    Args:
+        capacity: Keys the filter is sized for
+        error_rate: False-positive rate at capacity
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, error_rate: float = DEFAULT_ERROR_RATE):
+        if capacity < 1:
+            raise ValueError(f"capacity must be >= 1, got {capacity}")
+        if not 0 < error_rate < 1:
+            raise ValueError(f"error_rate must be between 0 and 1, got {error_rate}")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _start(self, digest: bytes) -> Tuple[int, int]:
+        """First bit position and step, both from the digest"""
+        value = int.from_bytes(digest, "little")
+        return (value & _LOW_64) % self.size, (value >> 64) % (self.size - 1) + 1
+
+    def add(self, digest: bytes) -> None:
+        bits, size = self._bits, self.size
+        position, step = self._start(digest)
+        for _ in range(self.hashes):
+            bits[position >> 3] |= 1 << (position & 7)
+            position += step
+            if position >= size:
+                position -= size
+        self.count += 1
+
+    def __contains__(self, digest: bytes) -> bool:
+        bits, size = self._bits, self.size
+        position, step = self._start(digest)
+        for _ in range(self.hashes):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+            position += step
+            if position >= size:
+                position -= size
+        return True
+
+    def expected_error_rate(self) -> float:
+        """False-positive rate predicted for the keys added so far"""
+        return (1 - math.exp(-self.hashes * self.count / self.size)) ** self.hashes
+
+    def __len__(self) -> int:
+        return self.count
+
+class Deduplicator:
+    """
+    Exact set of processed events in SQLite, fronted by a Bloom filter
+
+    The filter is rebuilt from the file when the Deduplicator is opened,
+    and again (at least twice as large) whenever more events than its capacity
+    have been marked, so its error rate stays near error_rate.
+
+    Args:
+        path: SQLite database file (":memory:" for a throwaway set)
+        retention: Seconds an event counts as seen (None = forever)
+        capacity: Events the Bloom filter is initially sized for
+        error_rate: Bloom filter false-positive rate at capacity
+        clock: Time source (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        retention: Optional[float] = None,
+        capacity: int = DEFAULT_CAPACITY,
+        error_rate: float = DEFAULT_ERROR_RATE,
+        clock: Callable[[], float] = time.time
+    ):
+        self.path = path
+        self.retention = retention
+        self.error_rate = error_rate
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._pending = set()   # keys handed out by unseen() but not marked yet
+        self.checked = self.duplicates = self.false_positives = self.expired = 0
+        import sqlite3   # only this stage needs it; keeps `import orchestrator` light
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen ("
+            " key BLOB PRIMARY KEY,"
+            " seen_at REAL NOT NULL) WITHOUT ROWID"
+        )
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+            self._rebuild(max(capacity, 2 * count))
+
+    def _cutoff(self) -> Optional[float]:
+        return None if self.retention is None else self._clock() - self.retention
+
+    def _rebuild(self, capacity: int) -> None:
+        """Refill a new filter from the events still within retention"""
+        bloom = BloomFilter(capacity, self.error_rate)
+        cutoff = self._cutoff()
+        if cutoff is None:
+            rows = self._conn.execute("SELECT key FROM seen")
+        else:
+            rows = self._conn.execute("SELECT key FROM seen WHERE seen_at >= ?", (cutoff,))
+        add = bloom.add
+        for (key,) in rows:
+            add(key)
+        self.bloom = bloom
+
+    def _seen(self, key: bytes) -> bool:
+        if key not in self.bloom:
+            return False
+        row = self._conn.execute("SELECT seen_at FROM seen WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.false_positives += 1
+            return False
+        cutoff = self._cutoff()
+        if cutoff is not None and row[0] < cutoff:
+            self.expired += 1
+            return False
+        return True
+
+    def seen(self, update: StatusUpdate) -> bool:
+        """True if this event was marked within the retention window"""
+        key = update_key(update)
+        with self._lock:
+            self.checked += 1
+            duplicate = self._seen(key)
+            self.duplicates += duplicate
+            return duplicate
+
+    def unseen(self, updates: Iterable[StatusUpdate]) -> Iterator[StatusUpdate]:
+        """
+        Yield the updates that haven't been seen, dropping duplicates
+
+        An update handed out here also hides later repeats of its event
+        until it is marked, so one stream can't yield an event twice. When
+        the generator exits (exhausted, closed or on an error), the
+        updates it yielded that weren't marked are released, so a later
+        stream yields them again instead of treating them as duplicates.
+        """
+        pending = self._pending
+        handed_out = set()   # keys yielded here, possibly marked since
+        try:
+            for update in updates:
+                key = update_key(update)
+                with self._lock:
+                    self.checked += 1
+                    duplicate = key in pending or self._seen(key)
+                    if duplicate:
+                        self.duplicates += 1
+                    else:
+                        pending.add(key)
+                        handed_out.add(key)
+                        if len(handed_out) > 2 * len(pending) + 1024:
+                            handed_out.intersection_update(pending)
+                if not duplicate:
+                    yield update
+        finally:
+            self.release_keys(handed_out)
+
+    def mark(self, updates: Iterable[StatusUpdate]) -> int:
+        """Record processed updates as seen now; returns how many were recorded"""
+        return self.mark_keys(update_key(update) for update in updates)
+
+    def mark_keys(self, keys: Iterable[bytes]) -> int:
+        """mark() for event_key() digests, in one transaction"""
+        keys = list(keys)
+        if not keys:
+            return 0
+        now = self._clock()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany("INSERT OR REPLACE INTO seen (key, seen_at) VALUES (?, ?)",
+                                       ((key, now) for key in keys))
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            bloom = self.bloom
+            for key in keys:
+                if key not in bloom:
+                    bloom.add(key)
+            self._pending.difference_update(keys)
+            if bloom.count > bloom.capacity:
+                self._rebuild(max(2 * bloom.capacity, 2 * bloom.count))
+        return len(keys)
+
+    def release_keys(self, keys: Iterable[bytes]) -> None:
+        """Forget event_key() digests handed out by unseen() that won't be marked"""
+        with self._lock:
+            self._pending.difference_update(keys)
+
+    def purge_expired(self) -> int:
+        """Delete events older than the retention window and rebuild the filter; returns how many"""
+        cutoff = self._cutoff()
+        if cutoff is None:
+            return 0
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM seen WHERE seen_at < ?", (cutoff,)).rowcount
+            if removed:
+                self._rebuild(self.bloom.capacity)
+            return removed
+
+    def stats(self) -> Dict[str, int]:
+        """Lookup counters, plus the events in the filter"""
+        with self._lock:
+            return {
+                "checked": self.checked,
+                "duplicates": self.duplicates,
+                "false_positives": self.false_positives,
+                "expired": self.expired,
+                "keys": self.bloom.count,
+            }
+
+    def __len__(self) -> int:
+        """Events stored, including any past retention that haven't been purged"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Events - Leveled, structured observability for the orchestrator
+===============================================================
+
+Agents and tools describe what they do as named events with fields
+(e.g. "tool.get_test_link", role=..., link=...). A sink decides what
+happens to them:
+
+    ConsoleSink     human-readable (coloured) lines, one template per event
+    JSONLinesSink   one JSON object per event through a buffered writer
+    NullSink        nothing at all
+
+Call sites guard on the log's threshold before building any fields,
+so with the NullSink the hot path costs one integer comparison:
+
+    if EVENTS.level <= DEBUG:
+        EVENTS.emit(DEBUG, "tool.get_test_link", role=role, link=link)
+
+Author: RecruitEM Team
+"""
+
+import json
+import sys
+import threading
+import time
+from typing import Callable, Dict, Union
+
+# ============= LEVELS =============
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+OFF = 100   # threshold that disables every event
+
+LEVEL_NAMES = {DEBUG: "debug", INFO: "info", WARNING: "warning"}
+
+def parse_level(level: Union[int, str]) -> int:
+    """Accept a level constant or its name ("debug", "info", "warning", "off")"""
+    if isinstance(level, int):
+        return level
+    names = {name: value for value, name in LEVEL_NAMES.items()}
+    names["off"] = OFF
+    try:
+        return names[level.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown event level {level!r}; expected one of {sorted(names)}") from None
+
+# ============= SINKS =============
+
+# A console format is a str.format template over the event's fields,
+# or a callable taking the fields dict and returning the line
+ConsoleFormat = Union[str, Callable[[dict], str]]
+
+class NullSink:
+    """Discards every event"""
+    level = OFF
+
+    def write(self, level: int, name: str, fields: dict) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+class ConsoleSink:
+    """
+    Renders events as text lines on a stream
+
+    Args:
+        formats: Event name → template (or callable) producing the text.
+                 Events without a format are printed as "name key=value ...".
+        level: Minimum level written
+        stream: Output stream; defaults to whatever sys.stdout is at
+                write time (so redirect_stdout works)
+    """
+
+    def __init__(self, formats: Dict[str, ConsoleFormat], level: Union[int, str] = DEBUG, stream=None):
+        self.formats = formats
+        self.level = parse_level(level)
+        self.stream = stream
+
+    def write(self, level: int, name: str, fields: dict) -> None:
+        template = self.formats.get(name)
+        if template is None:
+            line = " ".join([name] + [f"{key}={value}" for key, value in fields.items()])
+        elif callable(template):
+            line = template(fields)
+        else:
+            line = template.format(**fields)
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write(line + "\n")
+
+    def flush(self) -> None:
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.flush()
+
+    def close(self) -> None:
+        self.flush()
+
+class JSONLinesSink:
+    """
+    Writes each event as one JSON object per line
+
+    Lines go through a buffered writer and reach the file in
+    buffer_size chunks (and on flush()/close()).
+
+    Args:
+        target: File path (opened for append) or a writable text file
+        level: Minimum level written
+        buffer_size: Write buffer size in bytes when target is a path
+    """
+
+    def __init__(self, target, level: Union[int, str] = DEBUG, buffer_size: int = 1 << 16):
+        self.level = parse_level(level)
+        if isinstance(target, str):
+            self._file = open(target, "a", encoding="utf-8", buffering=buffer_size)
+            self._owns_file = True
+        else:
+            self._file = target
+            self._owns_file = False
+        self._lock = threading.Lock()
+        self._dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str).encode
+
+    def write(self, level: int, name: str, fields: dict) -> None:
+        record = {"ts": time.time(), "level": LEVEL_NAMES.get(level, level), "event": name}
+        record.update(fields)
+        line = self._dumps(record) + "\n"
+        with self._lock:
+            self._file.write(line)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.flush()
+            if self._owns_file:
+                self._file.close()
+
+# ============= EVENT LOG =============
+
+class EventLog:
+    """
+    Routes events to the current sink
+
+    `level` mirrors the sink's threshold; check it before emitting so
+    disabled events cost no allocations.
+
+    Args:
+        sink: Initial sink (defaults to NullSink)
+    """
+
+    def __init__(self, sink=None):
+        self.sink = sink if sink is not None else NullSink()
+        self.level = self.sink.level
+
+    def set_sink(self, sink) -> None:
+        """Swap the sink, flushing the previous one"""
+        previous = self.sink
+        self.sink = sink
+        self.level = sink.level
+        previous.flush()
+
+    def set_level(self, level: Union[int, str]) -> None:
+        """Change the threshold of the current sink"""
+        self.sink.level = parse_level(level)
+        self.level = self.sink.level
+
+    def emit(self, level: int, name: str, **fields) -> None:
+        """Send an event to the sink if its level passes the threshold"""
+        if level >= self.level:
+            self.sink.write(level, name, fields)
+
+    def flush(self) -> None:
+        self.sink.flush()
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Local stand-ins for the Anthropic client
+Used by test.py and bench.py so the Claude paths run offline
+"""
+
+import asyncio
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class FakeContent:
+    """One content block of a Claude message"""
+    def __init__(self, text):
+        self.text = text
+
+class FakeMessage:
+    """A Claude message with a single text block"""
+    def __init__(self, text):
+        self.content = [FakeContent(text)]
+
+def fake_tip(prompt):
+    """Deterministic tip text for a prompt"""
+    return f"Fake tip #{len(prompt)}"
+
+class FakeMessages:
+    """messages resource of FakeClient"""
+    def __init__(self, owner):
+        self.owner = owner
+
+    def create(self, **kwargs):
+        self.owner.calls += 1
+        if self.owner.latency:
+            time.sleep(self.owner.latency)
+        return FakeMessage(fake_tip(kwargs["messages"][0]["content"]))
+
+class FakeClient:
+    """Synchronous client: `client.messages.create(...)` sleeps `latency` seconds"""
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+        self.messages = FakeMessages(self)
+
+    def close(self):
+        pass
+
+class FakeAsyncMessages:
+    """messages resource of FakeAsyncClient"""
+    def __init__(self, owner):
+        self.owner = owner
+
+    async def create(self, **kwargs):
+        self.owner.calls += 1
+        self.owner.in_flight += 1
+        self.owner.peak_in_flight = max(self.owner.peak_in_flight, self.owner.in_flight)
+        try:
+            if self.owner.latency:
+                await asyncio.sleep(self.owner.latency)
+            return FakeMessage(fake_tip(kwargs["messages"][0]["content"]))
+        finally:
+            self.owner.in_flight -= 1
+
+class FakeAsyncClient:
+    """Async client: `await client.messages.create(...)` sleeps `latency` seconds"""
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.messages = FakeAsyncMessages(self)
+
+    async def close(self):
+        pass
+
+def _stub_message(text):
+    """A Messages API response body carrying `text`"""
+    return {
+        "id": "msg_stub",
+        "type": "message",
+        "role": "assistant",
+        "model": "stub",
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": 1, "output_tokens": 1},
+    }
+
+def _stub_error(status):
+    return {"type": "error", "error": {"type": "api_error", "message": f"Stub error {status}"}}
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """
+    Answers POST /v1/messages with a canned Claude message, and the
+    Message Batches endpoints (create, retrieve, results, cancel) of /v1/messages/batches
+    """
+    protocol_version = "HTTP/1.1"   # keep-alive, like the real API
+
+    def setup(self):
+        super().setup()
+        # Headers and body are written separately; don't let Nagle delay the body
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.stats_lock:
+            self.server.connections += 1
+
+    def _send(self, status, payload, content_type="application/json"):
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up waiting (timeout tests)
+            self.close_connection = True
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        data = self.rfile.read(length)
+        server = self.server
+        with server.stats_lock:
+            server.requests += 1
+            status, delay = server.script.pop(0) if server.script else (server.status, server.delay)
+        if delay:
+            time.sleep(delay)
+        if status != 200:
+            body = _stub_error(status)
+        elif self.path.endswith("/cancel"):
+            batch = server.batches.get(self.path.strip("/").split("/")[3])
+            if batch is None:
+                self._send(404, json.dumps(_stub_error(404)).encode())
+                return
+            batch["canceled"] = True
+            body = self._batch_object(batch)
+        elif self.path.startswith("/v1/messages/batches"):
+            body = self._create_batch(json.loads(data))
+        else:
+            body = _stub_message("Stub tip from the local server.")
+        self._send(status, json.dumps(body).encode())
+
+    def do_GET(self):
+        server = self.server
+        parts = self.path.split("?")[0].strip("/").split("/")   # v1 messages batches <id> [results]
+        batch = server.batches.get(parts[3]) if len(parts) >= 4 and parts[:3] == ["v1", "messages", "batches"] else None
+        if batch is None:
+            self._send(404, json.dumps({"type": "error", "error": {"type": "not_found_error",
+                                                                   "message": "Unknown batch"}}).encode())
+            return
+        if len(parts) == 5 and parts[4] == "results":
+            lines = "".join(json.dumps(result) + "\n" for result in batch["results"])
+            self._send(200, lines.encode(), "application/binary")
+            return
+        with server.stats_lock:
+            server.batch_polls += 1
+            batch["polls"] += 1
+        self._send(200, json.dumps(self._batch_object(batch)).encode())
+
+    def _create_batch(self, body):
+        server = self.server
+        results = []
+        for request in body["requests"]:
+            prompt = request["params"]["messages"][0]["content"]
+            if any(marker in prompt for marker in server.batch_fail_on):
+                result = {"type": "errored", "error": {"type": "error", "error": {
+                    "type": "invalid_request_error", "message": "Stub batch error"}}}
+            else:
+                result = {"type": "succeeded", "message": _stub_message(f"Batch tip: {fake_tip(prompt)}")}
+            results.append({"custom_id": request["custom_id"], "result": result})
+        with server.stats_lock:
+            batch_id = f"msgbatch_stub_{len(server.batches) + 1}"
+            batch = server.batches[batch_id] = {"id": batch_id, "results": results, "polls": 0}
+            server.batch_requests += len(results)
+        return self._batch_object(batch)
+
+    def _batch_object(self, batch):
+        ended = batch["polls"] >= self.server.batch_polls_until_done
+        succeeded = sum(result["result"]["type"] == "succeeded" for result in batch["results"])
+        return {
+            "id": batch["id"],
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "canceling" if batch.get("canceled") else "in_progress",
+            "request_counts": {
+                "processing": 0 if ended else len(batch["results"]),
+                "succeeded": succeeded if ended else 0,
+                "errored": len(batch["results"]) - succeeded if ended else 0,
+                "canceled": 0,
+                "expired": 0,
+            },
+            "created_at": "2024-12-01T00:00:00Z",
+            "expires_at": "2024-12-02T00:00:00Z",
+            "ended_at": "2024-12-01T00:05:00Z" if ended else None,
+            "cancel_initiated_at": None,
+            "archived_at": None,
+            "results_url": f"{self.server.url}/v1/messages/batches/{batch['id']}/results" if ended else None,
+        }
+
+    def log_message(self, format, *args):
+        pass
+
+class StubAnthropicServer:
+    """
+    Local HTTP server standing in for the Anthropic Messages API
+
+    Counts TCP connections and requests so benchmarks can show how many
+    connections a client opens. Use as a context manager; point a client
+    at it with `base_url=server.url`.
+
+    To simulate a slow or failing API, set `delay` (seconds before each
+    response) and `status` (HTTP status of each response; errors carry
+    an Anthropic-style error body), or queue (status, delay) pairs on
+    `script` to answer the next requests one by one.
+
+    Message batches report "in_progress" until they have been retrieved
+    `batch_polls_until_done` times; requests whose prompt contains any
+    string in `batch_fail_on` come back "errored".
+    """
+
+    def __init__(self, delay=0.0, status=200):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.stats_lock = threading.Lock()
+        self.httpd.connections = 0
+        self.httpd.requests = 0
+        self.httpd.delay = delay
+        self.httpd.status = status
+        self.httpd.script = []
+        self.httpd.batches = {}
+        self.httpd.batch_requests = 0
+        self.httpd.batch_polls = 0
+        self.httpd.batch_polls_until_done = 1
+        self.httpd.batch_fail_on = set()
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.httpd.url = self.url
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def connections(self):
+        return self.httpd.connections
+
+    @property
+    def requests(self):
+        return self.httpd.requests
+
+    @property
+    def delay(self):
+        return self.httpd.delay
+
+    @delay.setter
+    def delay(self, seconds):
+        self.httpd.delay = seconds
+
+    @property
+    def status(self):
+        return self.httpd.status
+
+    @status.setter
+    def status(self, status):
+        self.httpd.status = status
+
+    @property
+    def script(self):
+        return self.httpd.script
+
+    @property
+    def batches(self):
+        """Batch ID → {"id", "results", "polls"[, "canceled"]} for every batch created"""
+        return self.httpd.batches
+
+    @property
+    def batch_requests(self):
+        return self.httpd.batch_requests
+
+    @property
+    def batch_polls(self):
+        return self.httpd.batch_polls
+
+    @property
+    def batch_polls_until_done(self):
+        return self.httpd.batch_polls_until_done
+
+    @batch_polls_until_done.setter
+    def batch_polls_until_done(self, polls):
+        self.httpd.batch_polls_until_done = polls
+
+    @property
+    def batch_fail_on(self):
+        return self.httpd.batch_fail_on
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Instrumentation - Per-stage latency histograms
+==============================================
+
+Times the stages of a run (router, tools, message drafting, agents)
+with time.perf_counter_ns() and aggregates them into one histogram per
+stage, reported as count / mean / p50 / p95 / p99 / max.
+
+Timing is off unless a run is active, and call sites guard on a single
+attribute before reading the clock, so the disabled cost is one
+attribute check per stage:
+
+    timed = TIMINGS.enabled
+    if timed:
+        start = perf_counter_ns()
+    ...
+    if timed:
+        TIMINGS.record("rag_search", start)
+
+    with TIMINGS.run() as profile:      # enable for this block (this context only)
+        ...
+    print(profile.report())
+
+Author: RecruitEM Team
+"""
+
+import contextlib
+import contextvars
+import json
+import threading
+from time import perf_counter_ns
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# ============= HISTOGRAM =============
+
+# Log-linear buckets: values below 2**_SUB_BITS are exact, larger values
+# share a bucket with neighbours within 1/2**_SUB_BITS (~3%) of them
+_SUB_BITS = 5
+_SUB_COUNT = 1 << _SUB_BITS
+
+def _bucket(value: int) -> int:
+    if value < _SUB_COUNT:
+        return value
+    exponent = value.bit_length() - _SUB_BITS - 1
+    return _SUB_COUNT * (exponent + 1) + (value >> exponent) - _SUB_COUNT
+
+def _bucket_value(index: int) -> int:
+    """Midpoint of a bucket's range"""
+    if index < _SUB_COUNT:
+        return index
+    exponent, offset = divmod(index - _SUB_COUNT, _SUB_COUNT)
+    low = (_SUB_COUNT + offset) << exponent
+    return low + ((1 << exponent) - 1) // 2
+
+class Histogram:
+    """
+    Latency histogram in nanoseconds with bounded relative error
+
+    Memory grows with the number of distinct buckets (a few hundred at
+    most), not with the number of samples, and histograms merge exactly.
+    """
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def add(self, value: int) -> None:
+        index = _bucket(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: "Histogram") -> None:
+        """Add every sample of other into this histogram"""
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def percentile(self, percent: float) -> int:
+        """Approximate value below which `percent` % of samples fall (0 if empty)"""
+        if not self.count:
+            return 0
+        rank = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(max(_bucket_value(index), self.min), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, int]:
+        """count, total, mean, min, p50, p95, p99 and max (nanoseconds)"""
+        return {
+            "count": self.count,
+            "total_ns": self.total,
+            "mean_ns": self.total // self.count if self.count else 0,
+            "min_ns": self.min or 0,
+            "p50_ns": self.percentile(50),
+            "p95_ns": self.percentile(95),
+            "p99_ns": self.percentile(99),
+            "max_ns": self.max or 0,
+        }
+
+# ============= PROFILE =============
+
+class Profile:
+    """
+    Stage histograms collected over one or more runs
+
+    Args:
+        attach: Also record each call's stage timings in its final
+                state's metadata["timings_ns"]
+    """
+
+    def __init__(self, attach: bool = False):
+        self.attach = attach
+        self.stages: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, elapsed_ns: int) -> None:
+        with self._lock:
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = Histogram()
+            histogram.add(elapsed_ns)
+
+    def merge(self, other: "Profile") -> None:
+        """Fold another profile (e.g. from a worker process) into this one"""
+        with self._lock:
+            for stage, histogram in other.stages.items():
+                self.stages.setdefault(stage, Histogram()).merge(histogram)
+
+    def to_dict(self) -> Dict[str, Dict[str, int]]:
+        """Stage → summary (see Histogram.summary()), in first-recorded order"""
+        with self._lock:
+            return {stage: histogram.summary() for stage, histogram in self.stages.items()}
+
+    def to_json(self, path: Optional[str] = None) -> str:
+        """The to_dict() summary as JSON, also written to path if given"""
+        text = json.dumps(self.to_dict(), indent=2)
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+        return text
+
+    def report(self) -> str:
+        """Text table of every stage, latencies in microseconds"""
+        lines = [f"{'stage':<24} {'count':>8} {'total ms':>10} {'mean':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}"]
+        for stage, s in self.to_dict().items():
+            lines.append(
+                f"{stage:<24} {s['count']:>8} {s['total_ns'] / 1e6:>10.2f}"
+                + "".join(f" {s[key] / 1e3:>9.1f}" for key in ("mean_ns", "p50_ns", "p95_ns", "p99_ns", "max_ns"))
+            )
+        return "\n".join(lines)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.stages.clear()
+
+# ============= STAGE TIMER =============
+
+class StageTimer:
+    """
+    Switch and entry point for stage timing
+
+    `enabled` is True while any run() block is active (in any thread);
+    samples go to the profile of the run active in the recording
+    context, so concurrent runs don't mix.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._runs = 0
+        self._lock = threading.Lock()
+        self._profile: contextvars.ContextVar = contextvars.ContextVar("stage_profile", default=None)
+        self._call: contextvars.ContextVar = contextvars.ContextVar("stage_call", default=None)
+
+    @contextlib.contextmanager
+    def run(self, profile: Optional[Profile] = None, attach: bool = False) -> Iterator[Profile]:
+        """
+        Time stages inside this block
+
+        Args:
+            profile: Profile to add to (aggregate several runs by passing
+                     the same one); a new one by default
+            attach: For a new profile, see Profile(attach=...)
+        """
+        profile = profile if profile is not None else Profile(attach=attach)
+        token = self._profile.set(profile)
+        with self._lock:
+            self._runs += 1
+            self.enabled = True
+        try:
+            yield profile
+        finally:
+            self._profile.reset(token)
+            with self._lock:
+                self._runs -= 1
+                self.enabled = self._runs > 0
+
+    def record(self, stage: str, start_ns: int) -> None:
+        """Record the time since start_ns (from perf_counter_ns()) under stage"""
+        elapsed = perf_counter_ns() - start_ns
+        profile = self._profile.get()
+        if profile is None:
+            return
+        profile.add(stage, elapsed)
+        call = self._call.get()
+        if call is not None:
+            call[stage] = call.get(stage, 0) + elapsed
+
+    def start_call(self) -> Tuple[int, Optional[contextvars.Token]]:
+        """
+        Mark the start of one top-level call
+
+        When the active profile attaches timings, stages recorded until
+        finish_call() are also summed per call.
+        """
+        profile = self._profile.get()
+        token = self._call.set({}) if profile is not None and profile.attach else None
+        return perf_counter_ns(), token
+
+    def finish_call(self, stage: str, started: Tuple[int, Optional[contextvars.Token]],
+                    states: List[dict]) -> None:
+        """Record the whole call under stage and attach per-call timings to each state"""
+        start_ns, token = started
+        self.record(stage, start_ns)
+        if token is None:
+            return
+        timings = self._call.get()
+        self._call.reset(token)
+        for state in states:
+            state["metadata"]["timings_ns"] = timings
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Keyword Matcher - Aho–Corasick automaton for skill keywords
+===========================================================
+
+Finds every keyword of a (possibly large) skills taxonomy in a text
+with one left-to-right pass, instead of one substring scan per keyword.
+The automaton is compiled once; matching is case-insensitive and only
+whole words count ("sql" matches "SQL," but not "PostgreSQL").
+
+Author: RecruitEM Team
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+class KeywordMatcher:
+    """
+    Compiled multi-keyword matcher
+
+    Args:
+        keywords: Keywords to find (case-insensitive; duplicates ignored).
+                  Matches are reported with the keyword's original spelling.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = []
+        self._lengths: List[int] = []
+        # Trie transitions, failure links and per-state matched keyword ids
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        seen = set()
+        for keyword in keywords:
+            key = keyword.lower()
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            self._insert(key, len(self.keywords))
+            self.keywords.append(keyword)
+            self._lengths.append(len(key))
+
+        self._link()
+
+    def _insert(self, key: str, keyword_id: int) -> None:
+        state = 0
+        for char in key:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+        self._out[state].append(keyword_id)
+
+    def _link(self) -> None:
+        # Breadth-first: a state's failure link is the longest proper
+        # suffix of its path that is also a trie path
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                link = self._goto[fallback].get(char, 0)
+                self._fail[child] = link if link != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def find_all(self, text: str) -> List[Tuple[int, str]]:
+        """
+        Every whole-word keyword occurrence in text
+
+        Returns:
+            (start offset, keyword) pairs in order of their end offset
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        keywords, lengths = self.keywords, self._lengths
+        lowered = text.lower()
+        length = len(lowered)
+        matches = []
+        state = 0
+
+        for end, char in enumerate(lowered, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not out[state]:
+                continue
+            if end < length and lowered[end].isalnum():
+                continue
+            for keyword_id in out[state]:
+                start = end - lengths[keyword_id]
+                if start == 0 or not lowered[start - 1].isalnum():
+                    matches.append((start, keywords[keyword_id]))
+
+        return matches
+
+    def rank(self, text: str) -> List[str]:
+        """
+        Keywords present in text, most relevant first
+
+        Ordered by occurrence count (descending), then first position,
+        then keyword, so the ranking is deterministic.
+        """
+        counts: Dict[str, int] = {}
+        first: Dict[str, int] = {}
+        for start, keyword in self.find_all(text):
+            counts[keyword] = counts.get(keyword, 0) + 1
+            if keyword not in first or start < first[keyword]:
+                first[keyword] = start
+        return sorted(counts, key=lambda keyword: (-counts[keyword], first[keyword], keyword))
+
+    def best(self, text: str) -> Optional[str]:
+        """The top-ranked keyword in text, or None"""
+        ranked = self.rank(text)
+        return ranked[0] if ranked else None
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Load Generator - Requests/s and latency percentiles for the HTTP server
+=======================================================================
+
+Opens `concurrency` keep-alive connections to a running server (see
+server.py) and has each send requests back to back until `requests`
+have been sent, recording every round trip in a latency histogram:
+
+    N connections × (send request → read response → record latency) → LoadReport
+
+Bodies cycle through sample status updates across the built-in jobs;
+with batch_size, each request posts that many updates to
+/orchestrate/batch instead.
+
+Usage:
+    python3 -m loadgen --port 8080 -n 5000 -c 32
+    python3 -m loadgen --port 8080 -n 500 -c 8 --batch-size 50
+
+Author: RecruitEM Team
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import time
+from typing import List, NamedTuple, Optional
+
+from instrumentation import Histogram
+
+SAMPLE_UPDATES = [
+    {"candidate_name": f"Candidate {i}", "candidate_email": f"c{i}@example.com",
+     "status": ("Assessment", "Interview")[i % 2], "job_id": ("J123", "J456", "J789", "J101")[i % 4]}
+    for i in range(8)
+]
+
+class LoadReport(NamedTuple):
+    """Outcome of one load run"""
+    requests: int
+    errors: int
+    updates: int
+    seconds: float
+    p50_ms: float
+    p99_ms: float
+    max_ms: float
+
+    @property
+    def requests_per_second(self) -> float:
+        return self.requests / self.seconds if self.seconds else 0.0
+
+    @property
+    def updates_per_second(self) -> float:
+        return self.updates / self.seconds if self.seconds else 0.0
+
+    def format(self) -> str:
+        return (f"{self.requests} requests ({self.errors} errors) in {self.seconds:.2f}s: "
+                f"{self.requests_per_second:,.0f} req/s, {self.updates_per_second:,.0f} updates/s | "
+                f"latency p50 {self.p50_ms:.2f} ms, p99 {self.p99_ms:.2f} ms, max {self.max_ms:.2f} ms")
+
+async def _read_response(reader: asyncio.StreamReader) -> int:
+    """Read one response; returns its status"""
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+async def run_load(
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    requests: int = 1000,
+    concurrency: int = 16,
+    batch_size: Optional[int] = None,
+    updates: Optional[List[dict]] = None
+) -> LoadReport:
+    """
+    Send requests over keep-alive connections and measure them
+
+    Args:
+        host, port: Server address
+        requests: Total requests to send
+        concurrency: Connections, each with one request in flight
+        batch_size: Post this many updates per request to
+                    /orchestrate/batch (default: one update to /orchestrate)
+        updates: Update records to cycle through (default: SAMPLE_UPDATES)
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be >= 1, got {concurrency}")
+    updates = updates or SAMPLE_UPDATES
+    if batch_size:
+        path, per_request = "/orchestrate/batch", batch_size
+        records = itertools.cycle(updates)
+        bodies = [json.dumps([next(records) for _ in range(batch_size)]).encode() for _ in updates]
+    else:
+        path, per_request = "/orchestrate", 1
+        bodies = [json.dumps(record).encode() for record in updates]
+    messages = [
+        f"POST {path} HTTP/1.1\r\nHost: {host}:{port}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+        for body in bodies
+    ]
+
+    histogram = Histogram()
+    remaining = requests
+    errors = 0
+
+    async def connection(index: int) -> None:
+        nonlocal remaining, errors
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            sent = index
+            while remaining > 0:
+                remaining -= 1
+                start = time.perf_counter_ns()
+                writer.write(messages[sent % len(messages)])
+                status = await _read_response(reader)
+                histogram.add(time.perf_counter_ns() - start)
+                if status != 200:
+                    errors += 1
+                sent += 1
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(connection(index) for index in range(min(concurrency, requests))))
+    seconds = time.perf_counter() - start
+    return LoadReport(
+        requests=histogram.count, errors=errors, updates=histogram.count * per_request, seconds=seconds,
+        p50_ms=histogram.percentile(50) / 1e6, p99_ms=histogram.percentile(99) / 1e6,
+        max_ms=(histogram.max or 0) / 1e6
+    )
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python3 -m loadgen", description="Load-test a running orchestrator server.")
+    parser.add_argument("--host", default="127.0.0.1", help="server address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="server port (default: 8080)")
+    parser.add_argument("-n", "--requests", type=int, default=1000, help="requests to send (default: 1000)")
+    parser.add_argument("-c", "--concurrency", type=int, default=16, help="keep-alive connections (default: 16)")
+    parser.add_argument("--batch-size", type=int, help="updates per request to /orchestrate/batch")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_load(args.host, args.port, args.requests, args.concurrency, args.batch_size))
+    print(report.format())
+    return 1 if report.errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Message Batches - Bulk Claude requests through the Message Batches API
+======================================================================
+
+Nightly runs don't need an answer per candidate within seconds. The
+Message Batches API takes many requests in one submission, processes
+them asynchronously (usually within an hour, at most 24 hours) and
+costs less than one messages.create() call per request:
+
+    {custom_id: request} → batches.create() → poll retrieve() until "ended" → results()
+
+run_message_batch() drives that cycle with any client exposing
+`client.messages.batches` (the anthropic SDK, or an SDK pointed at
+fakes.StubAnthropicServer in tests) and returns the text of every
+request that succeeded; errored, canceled and expired requests are
+left out for the caller to fall back on.
+
+Submitted batches are already paid for, so polling is patient: status
+checks and result downloads are plain client calls, and a failed one
+is retried at the next poll until max_wait runs out. Only then are
+unfinished batches cancelled, and the results of those that ended are
+still returned (on the BatchTimeout).
+
+Author: RecruitEM Team
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+# Runs func(timeout) with timeouts/retries, e.g. resilience.CallGuard.call
+CallWrapper = Callable[[Callable[[Optional[float]], Any]], Any]
+
+# Requests per submitted batch (the API's limit)
+MAX_BATCH_REQUESTS = 100_000
+
+DEFAULT_POLL_INTERVAL = 30.0
+
+# The API finishes or expires every batch within 24 hours
+DEFAULT_MAX_WAIT = 24 * 60 * 60.0
+
+class BatchTimeout(TimeoutError):
+    """
+    Some message batches didn't end within max_wait (they were cancelled)
+
+    Attributes:
+        texts: custom_id → text for the succeeded requests of the
+               batches that did end
+    """
+
+    def __init__(self, message: str, texts: Dict[str, str]):
+        super().__init__(message)
+        self.texts = texts
+
+def run_message_batch(
+    client,
+    requests: Mapping[str, dict],
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    max_wait: float = DEFAULT_MAX_WAIT,
+    on_poll: Optional[Callable[[str, str], None]] = None,
+    on_error: Optional[Callable[[str, Exception], None]] = None,
+    call: Optional[CallWrapper] = None,
+    sleep: Callable[[float], None] = time.sleep,
+    clock: Callable[[], float] = time.monotonic
+) -> Dict[str, str]:
+    """
+    Submit requests as message batches, wait for them and collect the answers
+
+    Args:
+        client: Anthropic client (anything with messages.batches.create /
+                retrieve / results / cancel)
+        requests: custom_id → messages.create() keyword arguments.
+                  IDs must match ^[a-zA-Z0-9_-]{1,64}$.
+        poll_interval: Seconds between status checks
+        max_wait: Give up (and cancel unfinished batches) after this many seconds
+        on_poll: Called with (batch id, processing status) after each check
+        on_error: Called with (batch id, exception) when a status check or
+                  result download fails; it is retried at the next poll
+        call: Wrapper for the submissions (e.g. CallGuard.call, for
+              timeouts and retries); made directly if None. Polls never
+              go through it.
+        sleep, clock: Injectable for tests
+
+    Returns:
+        custom_id → text of the first content block, for succeeded requests
+
+    Raises:
+        BatchTimeout: if some batches haven't ended (or their results
+                      couldn't be read) within max_wait
+        Exception: whatever the client raises while submitting
+    """
+    items = [{"custom_id": custom_id, "params": params} for custom_id, params in requests.items()]
+    if not items:
+        return {}
+
+    batches = client.messages.batches
+
+    def api(method, *args, **kwargs):
+        if call is None:
+            return method(*args, **kwargs)
+        return call(lambda timeout: method(*args, timeout=timeout, **kwargs))
+
+    pending: List[str] = []
+    for start in range(0, len(items), MAX_BATCH_REQUESTS):
+        pending.append(api(batches.create, requests=items[start:start + MAX_BATCH_REQUESTS]).id)
+
+    deadline = clock() + max_wait
+    ended: List[str] = []   # batches whose results haven't been read yet
+    texts: Dict[str, str] = {}
+    while True:
+        for batch_id in list(pending):
+            try:
+                status = batches.retrieve(batch_id).processing_status
+            except Exception as e:
+                if on_error is not None:
+                    on_error(batch_id, e)
+                continue
+            if on_poll is not None:
+                on_poll(batch_id, status)
+            if status == "ended":
+                pending.remove(batch_id)
+                ended.append(batch_id)
+        for batch_id in list(ended):
+            try:
+                texts.update(_succeeded(batches.results(batch_id)))
+            except Exception as e:
+                if on_error is not None:
+                    on_error(batch_id, e)
+                continue
+            ended.remove(batch_id)
+        if not pending and not ended:
+            return texts
+        if clock() + poll_interval > deadline:
+            for batch_id in pending:
+                try:
+                    batches.cancel(batch_id)
+                except Exception:
+                    pass   # best effort; the batch expires on its own
+            raise BatchTimeout(f"{len(pending) + len(ended)} message batch(es) not collected "
+                               f"after {max_wait:g}s", texts)
+        sleep(poll_interval)
+
+def _succeeded(entries) -> Dict[str, str]:
+    """custom_id → text of the succeeded entries of one batch's results"""
+    return {entry.custom_id: entry.result.message.content[0].text
+            for entry in entries if entry.result.type == "succeeded"}
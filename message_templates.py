@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Message Templates - Precompiled candidate messages
+==================================================
+
+Each message is compiled once into static text segments and named
+slots. Most slots are the same for every candidate of a job (role,
+test link, job context), so those are filled in once per job to give a
+partial template; per candidate only the remaining slots (usually just
+the name) are rendered.
+
+    source text → MessageTemplate → .partial(job fields) → .render(candidate fields)
+
+Templates use `{slot}` placeholders (`{{` / `}}` for literal braces)
+and can be loaded from a directory of `<name>.txt` files, so recruiters
+can edit the wording without touching code.
+
+Author: RecruitEM Team
+"""
+
+import os
+import string
+import threading
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+DEFAULT_TEMPLATES = {
+    "assessment": """Hi {candidate_name}!
+
+Great news! You've been selected to move forward with the {job_title} position.
+
+Next Step: Please complete your technical assessment at your earliest convenience.
+
+→ Assessment Link: {test_link}
+→ Time Limit: 60 minutes
+→ Tip: Review the job description before starting
+
+Best of luck!
+RecruitEM Team""",
+
+    "interview": """Hi {candidate_name}!
+
+Congratulations on reaching the interview stage for {job_title}!
+
+→ Your interview is coming up soon. Here's a personalized tip to help you prepare:
+
+→ Key Focus Area:
+{prep_tip}
+
+→ Role Context:
+{jd_snippet}
+
+Remember: Prepare specific examples from your experience that demonstrate these skills.
+
+You've got this!
+RecruitEM Team"""
+}
+
+# Slots each message may use; templates loaded from files are checked against these
+TEMPLATE_SLOTS = {
+    "assessment": frozenset({"candidate_name", "job_title", "test_link"}),
+    "interview": frozenset({"candidate_name", "job_title", "prep_tip", "jd_snippet"})
+}
+
+class MessageTemplate:
+    """
+    A template compiled into literal segments and slots
+
+    Rendering alternates literals and slot values:
+    literals[0] + value(slots[0]) + literals[1] + ... + literals[-1]
+
+    Args:
+        source: Template text with `{slot}` placeholders
+        name: Name used in error messages
+    """
+
+    def __init__(self, source: str, name: str = "template"):
+        self.name = name
+        literals = [""]
+        slots = []
+        for literal, field, spec, conversion in string.Formatter().parse(source):
+            literals[-1] += literal
+            if field is None:
+                continue
+            if not field.isidentifier() or spec or conversion:
+                raise ValueError(f"{name}: unsupported placeholder {{{field}{'!' + conversion if conversion else ''}"
+                                 f"{':' + spec if spec else ''}}}; use plain {{slot}} names")
+            slots.append(field)
+            literals.append("")
+        self._init(tuple(literals), tuple(slots))
+
+    @classmethod
+    def _compiled(cls, name: str, literals: Tuple[str, ...], slots: Tuple[str, ...]) -> "MessageTemplate":
+        template = cls.__new__(cls)
+        template.name = name
+        template._init(literals, slots)
+        return template
+
+    def _init(self, literals: Tuple[str, ...], slots: Tuple[str, ...]) -> None:
+        self.literals = literals
+        self.slots = slots
+        # Single-slot templates (the common per-job partial) render as prefix + value + suffix
+        if len(slots) == 1:
+            self._prefix, self._suffix = literals
+
+    @property
+    def fields(self) -> frozenset:
+        """Names of the slots still to be filled"""
+        return frozenset(self.slots)
+
+    def partial(self, **values: str) -> "MessageTemplate":
+        """
+        Fill some slots now, returning a template for the rest
+
+        Adjacent literals are merged, so a per-job partial of a message
+        with one candidate slot is just two strings.
+        """
+        literals = [self.literals[0]]
+        slots = []
+        for slot, literal in zip(self.slots, self.literals[1:]):
+            if slot in values:
+                literals[-1] += str(values[slot]) + literal
+            else:
+                slots.append(slot)
+                literals.append(literal)
+        return MessageTemplate._compiled(self.name, tuple(literals), tuple(slots))
+
+    def render(self, values: Mapping[str, str]) -> str:
+        """Fill every remaining slot from values (KeyError if one is missing)"""
+        slots = self.slots
+        if len(slots) == 1:
+            return f"{self._prefix}{values[slots[0]]}{self._suffix}"
+        literals = self.literals
+        parts = [literals[0]]
+        for slot, literal in zip(slots, literals[1:]):
+            parts.append(str(values[slot]))
+            parts.append(literal)
+        return "".join(parts)
+
+class TemplateSet:
+    """
+    Named message templates plus a cache of per-job partials
+
+    Args:
+        sources: Template name → source text
+        max_partials: How many filled-in partials to keep
+    """
+
+    def __init__(self, sources: Mapping[str, str], max_partials: int = 4096):
+        self.templates: Dict[str, MessageTemplate] = {}
+        for name, source in sources.items():
+            template = MessageTemplate(source, name)
+            allowed = TEMPLATE_SLOTS.get(name)
+            if allowed is not None and not template.fields <= allowed:
+                unknown = ", ".join(sorted(template.fields - allowed))
+                raise ValueError(f"{name}: unknown slot(s) {unknown}; allowed: {', '.join(sorted(allowed))}")
+            self.templates[name] = template
+        self.max_partials = max_partials
+        self._partials: Dict[tuple, MessageTemplate] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # For worker processes: the lock can't be pickled and partials are rebuilt on use
+        return {"templates": self.templates, "max_partials": self.max_partials}
+
+    def __setstate__(self, state) -> None:
+        self.templates = state["templates"]
+        self.max_partials = state["max_partials"]
+        self._partials = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_directory(cls, directory: str, defaults: Optional[Mapping[str, str]] = None) -> "TemplateSet":
+        """
+        Load `<name>.txt` files from a directory
+
+        Files override the defaults (DEFAULT_TEMPLATES unless given);
+        missing files keep the default wording.
+        """
+        sources = dict(DEFAULT_TEMPLATES if defaults is None else defaults)
+        for filename in sorted(os.listdir(directory)):
+            name, extension = os.path.splitext(filename)
+            if extension != ".txt":
+                continue
+            with open(os.path.join(directory, filename), encoding="utf-8") as f:
+                sources[name] = f.read().rstrip("\n")
+        return cls(sources)
+
+    def save(self, directory: str, names: Optional[Iterable[str]] = None) -> None:
+        """Write templates as `<name>.txt` files (e.g. to start editing the defaults)"""
+        os.makedirs(directory, exist_ok=True)
+        for name in names if names is not None else self.templates:
+            template = self.templates[name]
+            source = template.literals[0].replace("{", "{{").replace("}", "}}")
+            for slot, literal in zip(template.slots, template.literals[1:]):
+                source += "{" + slot + "}" + literal.replace("{", "{{").replace("}", "}}")
+            with open(os.path.join(directory, f"{name}.txt"), "w", encoding="utf-8") as f:
+                f.write(source + "\n")
+
+    def for_job(self, name: str, **static: str) -> MessageTemplate:
+        """
+        The template `name` with the given job-level slots filled in
+
+        Partials are cached by their filled-in values, so callers don't
+        need to invalidate anything when a job's data changes. Once
+        max_partials are cached the oldest entry is dropped.
+        """
+        key = (name, *static.items())
+        partial = self._partials.get(key)
+        if partial is None:
+            partial = self.templates[name].partial(**static)
+            with self._lock:
+                if len(self._partials) >= self.max_partials:
+                    del self._partials[next(iter(self._partials))]
+                self._partials[key] = partial
+        return partial
@@ -13,9 +13,28 @@ Author: RecruitEM Team
 Date: Dec 2024
 """
 
-from typing import TypedDict, Literal
+from typing import TypedDict, Literal, NamedTuple, Iterable, List, Dict, Tuple, Optional, Mapping
+from types import MappingProxyType
+import contextvars
 import os
+from time import perf_counter_ns
 from datetime import datetime
+import threading
+# asyncio (about half the import time of this module), anthropic, NumPy
+# and sqlite3 are imported where first used, so the sync assessment path
+# never loads them; preload() imports them ahead of the first request
+
+from agent_registry import AgentRegistry
+from candidate import CandidateRecord, shared_job
+from catalog import JobCatalog, DictCatalog
+from events import EventLog, ConsoleSink, NullSink, JSONLinesSink, DEBUG, INFO, WARNING
+from instrumentation import StageTimer
+from keyword_matcher import KeywordMatcher
+from message_templates import TemplateSet, DEFAULT_TEMPLATES
+from resilience import CallGuard, CircuitBreaker, CircuitOpenError, RetryPolicy
+from retrieval import BM25Index
+from single_flight import SingleFlight
+from tip_cache import TipCache, tip_key
 
 # ANSI color codes for terminal output
 class Colors:
@@ -35,6 +54,109 @@ class Colors:
     BG_BLUE = '\033[44m'
     BG_CYAN = '\033[46m'
 
+# ============= EVENTS (Observability) =============
+
+_BANNER = "=" * 70
+
+_ROUTE_LABELS = {
+    "assessment": "ASSESSMENT AGENT (test logistics)",
+    "interview": "INTERVIEW AGENT (prep coaching)"
+}
+
+_AGENT_COLORS = {
+    "assessment": Colors.BLUE,
+    "interview": Colors.MAGENTA
+}
+
+def _format_route(fields: dict) -> str:
+    agent = fields["agent"]
+    label = _ROUTE_LABELS.get(agent, f"{agent.upper()} AGENT")
+    return f"   {Colors.GREEN}✓ Decision: Route to {label}{Colors.RESET}"
+
+def _format_agent_start(fields: dict) -> str:
+    agent = fields["agent"]
+    color = _AGENT_COLORS.get(agent, Colors.CYAN)
+    return f"\n{color}{Colors.BOLD}→ {agent.title()} Agent: Processing for {fields['candidate_name']}...{Colors.RESET}"
+
+def _format_batch_done(fields: dict) -> str:
+    lines = [
+        f"\n{Colors.GREEN}{Colors.BOLD}✓ Orchestrator: Batch completed!{Colors.RESET}",
+        f"   {Colors.WHITE}• Candidates: {fields['candidates']} across {fields['jobs']} jobs{Colors.RESET}",
+        f"   {Colors.WHITE}• Assessment: {fields['assessment']} | Interview: {fields['interview']}{Colors.RESET}",
+    ]
+    if "claude_calls" in fields:
+        lines.append(f"   {Colors.WHITE}• Claude tips: {fields['claude_calls']} calls, {fields['tips_saved']} saved "
+                     f"({fields['tips_cached']} cached, {fields['tips_coalesced']} coalesced){Colors.RESET}")
+    lines.append(_BANNER)
+    return "\n".join(lines)
+
+# How each event looks on the console (the original coloured output)
+CONSOLE_FORMATS = {
+    "workflow.start": f"{_BANNER}\n{Colors.BOLD}{Colors.WHITE}→ Orchestrator: Starting multi-agent workflow...{Colors.RESET}\n{_BANNER}",
+    "workflow.state": (
+        f"{Colors.CYAN}→ Initial State:{Colors.RESET}\n"
+        f"   {Colors.WHITE}• Candidate: {{candidate_name}} ({{candidate_email}}){Colors.RESET}\n"
+        f"   {Colors.WHITE}• Job: {{job_title}} ({{job_id}}){Colors.RESET}\n"
+        f"   {Colors.WHITE}• Status: {{status}}{Colors.RESET}"
+    ),
+    "workflow.done": (
+        f"\n{Colors.GREEN}{Colors.BOLD}✓ Orchestrator: Workflow completed!{Colors.RESET}\n"
+        f"   {Colors.WHITE}• Agent Used: {{agent}}{Colors.RESET}\n"
+        f"   {Colors.WHITE}• Output Length: {{chars}} chars{Colors.RESET}\n"
+        f"{_BANNER}"
+    ),
+    "batch.start": f"{_BANNER}\n{Colors.BOLD}{Colors.WHITE}→ Orchestrator: Starting batch workflow...{Colors.RESET}\n{_BANNER}",
+    "batch.done": _format_batch_done,
+    "job.not_found": f"{Colors.RED}{Colors.BOLD}! Warning: Job ID '{{job_id}}' not found, using generic data{Colors.RESET}",
+    "router.start": f"\n{Colors.YELLOW}{Colors.BOLD}→ Router: Analyzing status='{{status}}'...{Colors.RESET}",
+    "router.decision": _format_route,
+    "agent.start": _format_agent_start,
+    "agent.drafted": f"   {Colors.GREEN}✓ Message drafted: {{chars}} characters{Colors.RESET}",
+    "tool.get_test_link": f"  {Colors.CYAN}→ Tool: get_test_link('{{role}}') → {{link}}{Colors.RESET}",
+    "tool.rag_search": f"  {Colors.CYAN}→ Tool: rag_search('{{query}}'){Colors.RESET}",
+    "rag.found_jd": f"     {Colors.CYAN}→ Found JD: {{snippet:.80}}...{Colors.RESET}",
+    "rag.found_tip": f"     {Colors.CYAN}→ Found tip for '{{keyword}}'{Colors.RESET}",
+    "rag.similar_tip": f"     {Colors.CYAN}→ Found similar tip for '{{keyword}}' (score {{score:.2f}}){Colors.RESET}",
+    "tool.generate_prep_tip": f"  {Colors.CYAN}→ Tool: generate_prep_tip(use_claude={{use_claude}}){Colors.RESET}",
+    "tool.generate_prep_tip_async": f"  {Colors.CYAN}→ Tool: generate_prep_tip_async(use_claude={{use_claude}}){Colors.RESET}",
+    "tip.cached": f"     {Colors.CYAN}→ Cached tip: {{tip:.60}}...{Colors.RESET}",
+    "tip.generated": f"     {Colors.CYAN}→ Claude generated tip: {{tip:.60}}...{Colors.RESET}",
+    "tip.coalesced": f"     {Colors.CYAN}→ Shared in-flight Claude tip: {{tip:.60}}...{Colors.RESET}",
+    "tip.claude_error": f"     {Colors.RED}! Warning: Claude API error: {{error}}, falling back to keyword search{Colors.RESET}",
+    "tip.circuit_open": f"     {Colors.YELLOW}→ Claude API unavailable (circuit open), using keyword search{Colors.RESET}",
+    "bulk.submitted": f"  {Colors.CYAN}→ Claude message batch: {{requests}} tip requests submitted, waiting for results...{Colors.RESET}",
+    "bulk.poll": f"     {Colors.CYAN}→ Claude message batch {{batch_id}}: {{status}}{Colors.RESET}",
+    "bulk.poll_error": f"     {Colors.YELLOW}→ Claude message batch {{batch_id}}: check failed ({{error}}), retrying{Colors.RESET}",
+    "bulk.error": f"     {Colors.RED}! Warning: Claude message batch failed: {{error}}, falling back to keyword search{Colors.RESET}",
+    "bulk.done": f"     {Colors.GREEN}✓ Claude message batch: {{generated}} tips generated, {{failed}} keyword fallbacks, {{cached}} cached{Colors.RESET}",
+    "data.reloaded": f"{Colors.GREEN}✓ Data reloaded: version {{version}} ({{jobs}} jobs, {{tips}} tips, {{seconds:.3f}}s){Colors.RESET}",
+    "data.reload_failed": f"{Colors.RED}! Warning: Data reload failed, keeping current data: {{error}}{Colors.RESET}",
+    "preload.done": (
+        f"{Colors.GREEN}✓ Preloaded in {{seconds:.3f}}s (caches={{caches}}, claude={{claude}}, "
+        f"semantic={{semantic}}, asyncio={{asyncio}}){Colors.RESET}"
+    ),
+    "preload.claude_unavailable": f"{Colors.RED}! Warning: Claude client not preloaded: {{error}}{Colors.RESET}"
+}
+
+def console_sink(level="debug", stream=None) -> ConsoleSink:
+    """The default coloured console output as a sink"""
+    return ConsoleSink(CONSOLE_FORMATS, level=level, stream=stream)
+
+# Where every agent/tool event goes. Swap the sink with set_event_sink():
+#   set_event_sink(NullSink())                      # silent, fastest
+#   set_event_sink(JSONLinesSink("events.jsonl"))   # structured log
+EVENTS = EventLog(console_sink())
+
+def set_event_sink(sink) -> None:
+    """Send orchestrator events to `sink` (ConsoleSink, JSONLinesSink, NullSink, ...)"""
+    EVENTS.set_sink(sink)
+
+# Per-stage latency histograms (instrumentation.py), off unless a run is active:
+#   with TIMINGS.run(attach=True) as profile:
+#       orchestrate_many(updates)
+#   print(profile.report())
+TIMINGS = StageTimer()
+
 # ============= DATA (Inline) =============
 
 TEST_LINKS = {
@@ -72,6 +194,9 @@ INTERVIEW_TIPS_DB = {
     "kubernetes": "Know the difference between Deployments, StatefulSets, and DaemonSets."
 }
 
+GENERIC_JOB_TITLE = "Software Engineer"
+GENERIC_JOB_DESCRIPTION = "Software engineering role requiring technical expertise."
+
 # ============= STATE MANAGEMENT =============
 
 class AgentState(TypedDict):
@@ -85,6 +210,484 @@ class AgentState(TypedDict):
     output_message: str
     metadata: dict
 
+class StatusUpdate(NamedTuple):
+    """A single candidate status change, as fed to orchestrate_many()"""
+    candidate_name: str
+    candidate_email: str
+    status: str
+    job_id: str
+
+# ============= CLAUDE SETTINGS =============
+
+CLAUDE_MODEL = "claude-3-5-sonnet-20241022"
+PREP_TIP_MAX_TOKENS = 100
+
+PREP_TIP_PROMPT = """Based on this job description, give ONE specific, high-impact tip to help a candidate prepare for their interview. Keep it under 50 words.
+
+Job Description: {job_description}
+
+Tip:"""
+
+# Max Claude calls in flight at once for the async batch path
+DEFAULT_MAX_CONCURRENCY = 8
+
+# ============= CLAUDE CLIENTS =============
+
+class ClientHolder:
+    """
+    Process-wide, lazily created API client
+    
+    The first get() builds the client with `factory`; every later call
+    reuses it, so repeated interview tips share one HTTP connection pool
+    (keep-alive, no TLS handshake per candidate). Creation is guarded by
+    a lock, so concurrent first callers still build only one client.
+    
+    Args:
+        factory: Zero-argument callable returning a new client
+        per_loop: If True, the client is tied to the running asyncio
+                  event loop and rebuilt when called from a different
+                  loop (async HTTP pools cannot be shared across loops)
+    """
+    
+    def __init__(self, factory, per_loop: bool = False):
+        self._factory = factory
+        self._per_loop = per_loop
+        self._client = None
+        self._loop = None
+        self._explicit = False
+        self._lock = threading.Lock()
+    
+    def _current_loop(self):
+        if not self._per_loop:
+            return None
+        import asyncio
+        return asyncio.get_running_loop()
+    
+    def get(self):
+        """Return the shared client, creating it on first use"""
+        loop = self._current_loop()
+        client = self._client
+        if client is not None and (self._explicit or self._loop is loop):
+            return client
+        with self._lock:
+            if self._client is None or not (self._explicit or self._loop is loop):
+                self._client = self._factory()
+                self._loop = loop
+            return self._client
+    
+    def set(self, client) -> None:
+        """Install a specific client (e.g. a test double) until reset()"""
+        with self._lock:
+            self._client = client
+            self._loop = None
+            self._explicit = client is not None
+    
+    def is_set(self) -> bool:
+        """True if a client was installed explicitly with set()"""
+        return self._explicit
+    
+    def reset(self) -> None:
+        """Forget the current client without closing it (e.g. after fork)"""
+        with self._lock:
+            self._client = None
+            self._loop = None
+            self._explicit = False
+    
+    def close(self) -> None:
+        """Close the current client's connections (sync clients only) and forget it"""
+        with self._lock:
+            client, self._client = self._client, None
+            self._loop = None
+            self._explicit = False
+        close = getattr(client, "close", None)
+        if close is None:
+            return
+        import asyncio
+        if not asyncio.iscoroutinefunction(close):
+            close()
+
+# Retries are left to _claude_guard, so the SDK's own are turned off
+def _new_anthropic_client():
+    from anthropic import Anthropic
+    return Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"), max_retries=0)
+
+def _new_async_anthropic_client():
+    from anthropic import AsyncAnthropic
+    return AsyncAnthropic(api_key=os.getenv("ANTHROPIC_API_KEY"), max_retries=0)
+
+_anthropic_client = ClientHolder(_new_anthropic_client)
+_async_anthropic_client = ClientHolder(_new_async_anthropic_client, per_loop=True)
+
+def get_anthropic_client():
+    """Shared synchronous Anthropic client (created on first use)"""
+    return _anthropic_client.get()
+
+def get_async_anthropic_client():
+    """Shared AsyncAnthropic client for the running event loop (created on first use)"""
+    return _async_anthropic_client.get()
+
+def set_anthropic_client(client) -> None:
+    """Use `client` for all synchronous Claude calls until reset_anthropic_clients()"""
+    _anthropic_client.set(client)
+
+def set_async_anthropic_client(client) -> None:
+    """Use `client` for all async Claude calls until reset_anthropic_clients()"""
+    _async_anthropic_client.set(client)
+
+def close_anthropic_clients() -> None:
+    """Close pooled connections and drop the shared clients (they are rebuilt lazily)"""
+    _anthropic_client.close()
+    _async_anthropic_client.close()
+
+def reset_anthropic_clients() -> None:
+    """Drop the shared clients without closing them, e.g. in a forked worker"""
+    _anthropic_client.reset()
+    _async_anthropic_client.reset()
+
+# Every Claude call goes through one CallGuard (resilience.py): a
+# per-try timeout, jittered exponential retries and a circuit breaker
+# shared by the sync and async paths. A slow or failing API costs a
+# candidate at most RetryPolicy.max_elapsed(), then nothing while the
+# breaker is open; they get the keyword tip instead.
+_claude_guard = CallGuard(RetryPolicy(attempts=3, timeout=10.0), CircuitBreaker(failure_threshold=5, cooldown=30.0))
+
+def get_claude_guard() -> CallGuard:
+    """The guard (timeouts, retries, circuit breaker) around Claude calls"""
+    return _claude_guard
+
+def set_claude_guard(guard: CallGuard) -> None:
+    """Replace the guard, e.g. CallGuard(RetryPolicy(timeout=3.0)) for a tighter deadline"""
+    global _claude_guard
+    _claude_guard = guard
+
+# A forked child must not share the parent's sockets
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=reset_anthropic_clients)
+
+# ============= JOB CATALOG =============
+
+# Jobs and test links are read through a JobCatalog (catalog.py). The
+# default wraps the dicts above; large catalogs can live in SQLite:
+#   set_job_catalog(CachedCatalog(SQLiteCatalog("jobs.db")))
+_job_catalog: JobCatalog = DictCatalog(JOB_DESCRIPTIONS, TEST_LINKS)
+
+def _catalog() -> JobCatalog:
+    snapshot = _active_snapshot()
+    return snapshot.catalog if snapshot is not None else _job_catalog
+
+def _tips() -> Mapping[str, str]:
+    snapshot = _active_snapshot()
+    return snapshot.tips if snapshot is not None else INTERVIEW_TIPS_DB
+
+def get_job_catalog() -> JobCatalog:
+    """The catalog used for job and test-link lookups"""
+    return _catalog()
+
+def set_job_catalog(catalog: JobCatalog) -> None:
+    """Look jobs and test links up in `catalog` from now on"""
+    global _job_catalog, _vector_index
+    _job_catalog = catalog
+    # The vector index embeds job descriptions; rebuilt by preload() or the next semantic_search()
+    if _vector_index:
+        _vector_index = None
+
+# ============= DATA SNAPSHOTS =============
+
+class DataSnapshot:
+    """
+    Immutable jobs, test links and tips, with their search indexes built
+    
+    While a snapshot is installed (use_data_snapshot()) it is used
+    instead of the module dicts and their lazily built indexes. Every
+    orchestrate*() call pins the snapshot that was current when it
+    started, so swapping in a new one never changes the data under a
+    call in progress. See data_reload.py for reloading from files.
+    """
+    __slots__ = ("version", "catalog", "tips", "tips_index", "tip_matcher", "vector_index")
+    
+    def __init__(self, version: int, catalog: JobCatalog, tips: Mapping[str, str], tips_index: BM25Index,
+                 tip_matcher: KeywordMatcher, vector_index=None):
+        self.version = version
+        self.catalog = catalog
+        self.tips = tips
+        self.tips_index = tips_index
+        self.tip_matcher = tip_matcher
+        self.vector_index = vector_index
+    
+    @classmethod
+    def build(
+        cls,
+        jobs: Mapping[str, Mapping[str, str]],
+        test_links: Mapping[str, str],
+        tips: Mapping[str, str],
+        version: int = 0,
+        vectors: bool = True
+    ) -> "DataSnapshot":
+        """
+        Copy the data and build every derived index up front
+        
+        Args:
+            jobs: Job ID → {"title": ..., "description": ...}
+            test_links: Job title → assessment URL
+            tips: Keyword → interview tip
+            version: Caller-assigned version number
+            vectors: Also build the vector index for semantic search
+                     (skipped when NumPy is not installed)
+        """
+        jobs = MappingProxyType({
+            job_id: MappingProxyType({"title": info["title"], "description": info["description"]})
+            for job_id, info in jobs.items()
+        })
+        catalog = DictCatalog(jobs, MappingProxyType(dict(test_links)))
+        return cls.from_catalog(catalog, tips, version, vectors)
+    
+    @classmethod
+    def from_catalog(
+        cls,
+        catalog: JobCatalog,
+        tips: Mapping[str, str],
+        version: int = 0,
+        vectors: bool = True,
+        job_vectors=None
+    ) -> "DataSnapshot":
+        """
+        Like build(), for jobs and test links already in a JobCatalog (used as is)
+        
+        Args:
+            job_vectors: A vector index whose job rows still match the
+                         catalog (e.g. the previous snapshot's); they are
+                         reused and only the tips are embedded
+        """
+        tips = MappingProxyType(dict(tips))
+        return cls(version, catalog, tips, _build_tips_index(tips), KeywordMatcher(tips),
+                   _build_vector_index(tips, catalog, job_vectors) if vectors else None)
+    
+    def __reduce__(self):
+        # Sent to spawned worker processes: send the data, rebuild the indexes there
+        return DataSnapshot.from_catalog, (self.catalog, dict(self.tips), self.version,
+                                           self.vector_index is not None)
+
+# The installed snapshot, or None to use the module dicts
+_data_snapshot: Optional[DataSnapshot] = None
+
+# The snapshot pinned by the orchestrate*() call running in this context
+_pinned_snapshot: contextvars.ContextVar = contextvars.ContextVar("pinned_snapshot", default=None)
+
+def _active_snapshot() -> Optional[DataSnapshot]:
+    snapshot = _pinned_snapshot.get()
+    return snapshot if snapshot is not None else _data_snapshot
+
+def _pin_snapshot() -> contextvars.Token:
+    """Keep using the current snapshot until _pinned_snapshot.reset(token)"""
+    return _pinned_snapshot.set(_active_snapshot())
+
+def get_data_snapshot() -> Optional[DataSnapshot]:
+    """The installed data snapshot, or None when the module dicts are used"""
+    return _data_snapshot
+
+def use_data_snapshot(snapshot: Optional[DataSnapshot]) -> None:
+    """Install a data snapshot (None goes back to the module dicts); running calls keep theirs"""
+    global _data_snapshot
+    _data_snapshot = snapshot
+
+# ============= SEARCH INDEX =============
+
+# BM25 index over INTERVIEW_TIPS_DB, built on first search
+_tips_index: Optional[BM25Index] = None
+
+def _tip_document(keyword: str, tip: str) -> str:
+    """Indexed text for a tip: its keyword plus the advice itself"""
+    return f"{keyword} {tip}"
+
+def _build_tips_index(tips: Mapping[str, str]) -> BM25Index:
+    return BM25Index.from_documents((keyword, _tip_document(keyword, tip)) for keyword, tip in tips.items())
+
+def _get_tips_index() -> BM25Index:
+    global _tips_index
+    snapshot = _active_snapshot()
+    if snapshot is not None:
+        return snapshot.tips_index
+    if _tips_index is None:
+        _tips_index = _build_tips_index(INTERVIEW_TIPS_DB)
+    return _tips_index
+
+# Aho–Corasick matcher over the INTERVIEW_TIPS_DB keywords, compiled on
+# first use and recompiled whenever the tips change
+_tip_matcher: Optional[KeywordMatcher] = None
+
+def _get_tip_matcher() -> KeywordMatcher:
+    global _tip_matcher
+    snapshot = _active_snapshot()
+    if snapshot is not None:
+        return snapshot.tip_matcher
+    if _tip_matcher is None:
+        _tip_matcher = KeywordMatcher(INTERVIEW_TIPS_DB)
+    return _tip_matcher
+
+# Vector index over tips and job descriptions, built by preload() or the
+# first semantic_search() call (False when NumPy is not installed); the
+# rag_search() fallback only uses it once built, never building it on a
+# request
+_vector_index = None
+
+# Minimum cosine similarity for a semantic match to be used
+SEMANTIC_MIN_SCORE = 0.2
+
+def _build_vector_index(tips: Mapping[str, str], catalog: JobCatalog, job_vectors=None):
+    """
+    Vector index over tips and job descriptions, or None without NumPy
+    
+    With job_vectors (an index built for the same jobs), its job rows are
+    copied instead of embedding every job in the catalog again.
+    """
+    try:
+        from vector_index import VectorIndex
+    except ImportError:
+        return None
+    if job_vectors is not None:
+        index = job_vectors.copy()
+        for doc_id in index.ids():
+            if doc_id.startswith("tip:"):
+                index.remove(doc_id)
+    else:
+        index = VectorIndex()
+    index.add(
+        [f"tip:{keyword}" for keyword in tips],
+        [_tip_document(keyword, tip) for keyword, tip in tips.items()]
+    )
+    if job_vectors is None:
+        jobs = list(catalog.jobs())
+        index.add(
+            [f"job:{job.job_id}" for job in jobs],
+            [f"{job.title} {job.description}" for job in jobs]
+        )
+    return index
+
+def _get_vector_index(build: bool = True):
+    """The active vector index; with build=False, None unless it is already built"""
+    global _vector_index
+    snapshot = _active_snapshot()
+    if snapshot is not None:
+        return snapshot.vector_index
+    if _vector_index is None and build:
+        _vector_index = _build_vector_index(INTERVIEW_TIPS_DB, _job_catalog) or False
+    return _vector_index or None
+
+def rebuild_search_index() -> None:
+    """Rebuild the search indexes, e.g. after editing INTERVIEW_TIPS_DB in place"""
+    global _tips_index, _tip_matcher, _vector_index
+    _tips_index = None
+    _tip_matcher = None
+    if _vector_index:
+        _vector_index = None
+    _get_tips_index()
+
+def _check_tips_editable() -> None:
+    if _data_snapshot is not None:
+        raise RuntimeError("Tips come from the installed data snapshot; edit its source instead")
+
+def add_interview_tip(keyword: str, tip: str) -> None:
+    """Add or replace a tip and update the search indexes incrementally"""
+    global _tip_matcher
+    _check_tips_editable()
+    INTERVIEW_TIPS_DB[keyword] = tip
+    _tip_matcher = None
+    _get_tips_index().add(keyword, _tip_document(keyword, tip))
+    if _vector_index:
+        _vector_index.add([f"tip:{keyword}"], [_tip_document(keyword, tip)])
+
+def remove_interview_tip(keyword: str) -> bool:
+    """Remove a tip and drop it from the search indexes; False if unknown"""
+    global _tip_matcher
+    _check_tips_editable()
+    if INTERVIEW_TIPS_DB.pop(keyword, None) is None:
+        return False
+    _tip_matcher = None
+    _get_tips_index().remove(keyword)
+    if _vector_index:
+        _vector_index.remove(f"tip:{keyword}")
+    return True
+
+def search_tips(query: str, top_k: int = 5) -> List[Tuple[str, str, float]]:
+    """
+    Rank the tips database against a free-text query
+    
+    Args:
+        query: Keywords or text (e.g. a job description)
+        top_k: Maximum number of results
+    
+    Returns:
+        (keyword, tip, score) triples, best first
+    """
+    tips = _tips()
+    return [
+        (keyword, tips[keyword], score)
+        for keyword, score in _get_tips_index().search(query, top_k)
+    ]
+
+def semantic_search(query: str, top_k: int = 3, index=None) -> List[Tuple[str, str, float]]:
+    """
+    Rank tips and job descriptions by embedding similarity
+    
+    Uses the local vector index (vector_index.py), which tolerates
+    wording that shares no exact keyword with the knowledge base
+    (e.g. "reactjs" → the React tip).
+    
+    Args:
+        query: Free-text query
+        top_k: Maximum number of results
+        index: Vector index to search (default: the active one, built
+               now if needed, which embeds every job in the catalog)
+    
+    Returns:
+        (doc_id, text, score) triples, best first. doc_id is
+        "tip:<keyword>" or "job:<job_id>". Empty if NumPy is not installed.
+    """
+    if index is None:
+        index = _get_vector_index()
+    if index is None:
+        return []
+    
+    results = []
+    for doc_id, score in index.search(query, top_k):
+        kind, key = doc_id.split(":", 1)
+        if kind == "tip":
+            text = _tips().get(key)
+        else:
+            job = _catalog().get(key)
+            text = f"{job.title}: {job.description}" if job else None
+        if text is not None:
+            results.append((doc_id, text, score))
+    return results
+
+# ============= TIP CACHE =============
+
+# Claude tips depend only on (model, prompt template, job description),
+# so candidates for the same job share one generated tip
+_tip_cache = TipCache()
+
+# Concurrent requests for the same tip (same key) share one Claude call:
+# threads through TIP_FLIGHTS.do(), asyncio tasks through do_async()
+TIP_FLIGHTS = SingleFlight()
+
+# Tip outcomes of the orchestrate_many*() batch running in this context,
+# reported with its batch.done event
+_batch_tip_counts: contextvars.ContextVar = contextvars.ContextVar("batch_tip_counts", default=None)
+
+def _count_tip(outcome: str) -> None:
+    counts = _batch_tip_counts.get()
+    if counts is not None:
+        counts[outcome] += 1
+
+def get_tip_cache() -> TipCache:
+    """The cache consulted by generate_prep_tip() before calling Claude"""
+    return _tip_cache
+
+def set_tip_cache(cache: TipCache) -> None:
+    """Replace the tip cache, e.g. with one backed by a SQLiteTipStore"""
+    global _tip_cache
+    _tip_cache = cache
+
 # ============= TOOLS (Simple Functions) =============
 
 def get_test_link(role: str) -> str:
@@ -97,40 +700,92 @@ def get_test_link(role: str) -> str:
     Returns:
         Assessment URL
     """
-    link = TEST_LINKS.get(role, "https://assess.example.com/general")
-    print(f"  {Colors.CYAN}→ Tool: get_test_link('{role}') → {link}{Colors.RESET}")
+    timed = TIMINGS.enabled
+    if timed:
+        start = perf_counter_ns()
+    link = _catalog().test_link(role) or "https://assess.example.com/general"
+    if EVENTS.level <= DEBUG:
+        EVENTS.emit(DEBUG, "tool.get_test_link", role=role, link=link)
+    if timed:
+        TIMINGS.record("get_test_link", start)
     return link
 
-def rag_search(query: str) -> str:
+def rag_search(query: str, semantic: bool = True) -> str:
     """
     Tool: Simple RAG (Retrieval Augmented Generation) search
     
-    Performs keyword matching in job descriptions and tips database.
-    In production, this would query a vector database.
+    Looks up a job description by ID; otherwise returns the tip that
+    ranks highest for the query under BM25 (see search_tips()). Queries
+    with no keyword overlap fall back to the vector index
+    (see semantic_search()) if it has been built, e.g. by preload().
     
     Args:
         query: Search query (job ID or keywords)
+        semantic: Allow the vector index fallback (agents looking up a
+                  job ID pass False)
     
     Returns:
         Relevant snippet from knowledge base
     """
-    print(f"  {Colors.CYAN}→ Tool: rag_search('{query}'){Colors.RESET}")
-    
-    # First, try to find by job ID
-    if query in JOB_DESCRIPTIONS:
-        jd = JOB_DESCRIPTIONS[query]
-        snippet = f"{jd['title']}: {jd['description'][:150]}..."
-        print(f"     {Colors.CYAN}→ Found JD: {snippet[:80]}...{Colors.RESET}")
-        return snippet
-    
-    # Otherwise, keyword search in tips
-    query_lower = query.lower()
-    for keyword, tip in INTERVIEW_TIPS_DB.items():
-        if keyword in query_lower:
-            print(f"     {Colors.CYAN}→ Found tip for '{keyword}'{Colors.RESET}")
+    timed = TIMINGS.enabled
+    if timed:
+        start = perf_counter_ns()
+    try:
+        if EVENTS.level <= DEBUG:
+            EVENTS.emit(DEBUG, "tool.rag_search", query=query)
+        
+        # First, try to find by job ID
+        job = _catalog().get(query)
+        if job is not None:
+            snippet = f"{job.title}: {job.description[:150]}..."
+            if EVENTS.level <= DEBUG:
+                EVENTS.emit(DEBUG, "rag.found_jd", job_id=query, snippet=snippet)
+            return snippet
+        
+        # Otherwise, ranked search over the tips index
+        results = search_tips(query, top_k=1)
+        if results:
+            keyword, tip, _ = results[0]
+            if EVENTS.level <= DEBUG:
+                EVENTS.emit(DEBUG, "rag.found_tip", keyword=keyword)
             return tip
+        
+        # Last resort, nearest tip by embedding similarity
+        index = _get_vector_index(build=False) if semantic else None
+        if index is not None:
+            for doc_id, text, score in semantic_search(query, top_k=3, index=index):
+                if score < SEMANTIC_MIN_SCORE:
+                    break
+                if doc_id.startswith("tip:"):
+                    if EVENTS.level <= DEBUG:
+                        EVENTS.emit(DEBUG, "rag.similar_tip", keyword=doc_id[4:], score=score)
+                    return text
+        
+        return "No specific tips found. General advice: Review the job description carefully and prepare examples from your past experience."
+    finally:
+        if timed:
+            TIMINGS.record("rag_search", start)
+
+def _prep_tip_request(job_description: str) -> dict:
+    """Keyword arguments for the Claude messages.create call behind a prep tip"""
+    return {
+        "model": CLAUDE_MODEL,
+        "max_tokens": PREP_TIP_MAX_TOKENS,
+        "messages": [{"role": "user", "content": PREP_TIP_PROMPT.format(job_description=job_description)}]
+    }
+
+def _keyword_tip(job_description: str) -> str:
+    """
+    Fallback tip: the tip for the most relevant tips-DB keyword in the job description
     
-    return "No specific tips found. General advice: Review the job description carefully and prepare examples from your past experience."
+    Keywords are found in a single pass and ranked by how often they
+    occur, then by first position (see KeywordMatcher.rank()).
+    """
+    keyword = _get_tip_matcher().best(job_description)
+    if keyword is not None:
+        return _tips()[keyword]
+    
+    return "Study the job requirements and prepare concrete examples from your experience."
 
 def generate_prep_tip(job_description: str, use_claude: bool = False) -> str:
     """
@@ -143,44 +798,258 @@ def generate_prep_tip(job_description: str, use_claude: bool = False) -> str:
     Returns:
         Interview preparation tip
     """
-    print(f"  {Colors.CYAN}→ Tool: generate_prep_tip(use_claude={use_claude}){Colors.RESET}")
-    
-    if use_claude and os.getenv("ANTHROPIC_API_KEY"):
-        try:
-            from anthropic import Anthropic
+    timed = TIMINGS.enabled
+    if timed:
+        start = perf_counter_ns()
+    try:
+        if EVENTS.level <= DEBUG:
+            EVENTS.emit(DEBUG, "tool.generate_prep_tip", use_claude=use_claude)
+        
+        if use_claude and (_anthropic_client.is_set() or os.getenv("ANTHROPIC_API_KEY")):
+            key = tip_key(CLAUDE_MODEL, PREP_TIP_PROMPT, job_description)
+            tip = _tip_cache.get(key)
+            if tip is not None:
+                _count_tip("cached")
+                if EVENTS.level <= DEBUG:
+                    EVENTS.emit(DEBUG, "tip.cached", tip=tip)
+                return tip
             
-            client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+            def fetch() -> str:
+                client = get_anthropic_client()
+                request = _prep_tip_request(job_description)
+                message = _claude_guard.call(lambda timeout: client.messages.create(**request, timeout=timeout))
+                tip = message.content[0].text.strip()
+                _tip_cache.put(key, tip)
+                return tip
             
-            prompt = f"""Based on this job description, give ONE specific, high-impact tip to help a candidate prepare for their interview. Keep it under 50 words.
+            try:
+                tip, shared = TIP_FLIGHTS.do(key, fetch)
+                _count_tip("coalesced" if shared else "claude_calls")
+                if EVENTS.level <= DEBUG:
+                    EVENTS.emit(DEBUG, "tip.coalesced" if shared else "tip.generated", tip=tip)
+                return tip
+                
+            except CircuitOpenError:
+                if EVENTS.level <= DEBUG:
+                    EVENTS.emit(DEBUG, "tip.circuit_open")
+            except Exception as e:
+                if EVENTS.level <= WARNING:
+                    EVENTS.emit(WARNING, "tip.claude_error", error=str(e))
+        
+        return _keyword_tip(job_description)
+    finally:
+        if timed:
+            TIMINGS.record("generate_prep_tip", start)
 
-Job Description: {job_description}
-
-Tip:"""
-            
-            message = client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=100,
-                messages=[{"role": "user", "content": prompt}]
-            )
+async def generate_prep_tip_async(job_description: str, use_claude: bool = False, client=None) -> str:
+    """
+    Tool: Generate personalized interview prep tip without blocking the event loop
+    
+    Same behaviour as generate_prep_tip(), but awaits an async Anthropic
+    client so many interview tips can be in flight at once.
+    
+    Args:
+        job_description: The job description text
+        use_claude: Whether to use Claude API (requires ANTHROPIC_API_KEY
+                    unless an explicit client is given)
+        client: Optional async client exposing `await messages.create(...)`;
+                defaults to the shared get_async_anthropic_client()
+    
+    Returns:
+        Interview preparation tip
+    """
+    timed = TIMINGS.enabled
+    if timed:
+        start = perf_counter_ns()
+    try:
+        if EVENTS.level <= DEBUG:
+            EVENTS.emit(DEBUG, "tool.generate_prep_tip_async", use_claude=use_claude)
+        
+        if use_claude and (client is not None or _async_anthropic_client.is_set() or os.getenv("ANTHROPIC_API_KEY")):
+            key = tip_key(CLAUDE_MODEL, PREP_TIP_PROMPT, job_description)
+            tip = _tip_cache.get(key)
+            if tip is not None:
+                _count_tip("cached")
+                if EVENTS.level <= DEBUG:
+                    EVENTS.emit(DEBUG, "tip.cached", tip=tip)
+                return tip
             
-            tip = message.content[0].text.strip()
-            print(f"     {Colors.CYAN}→ Claude generated tip: {tip[:60]}...{Colors.RESET}")
-            return tip
+            async def fetch() -> str:
+                api = client if client is not None else get_async_anthropic_client()
+                request = _prep_tip_request(job_description)
+                message = await _claude_guard.call_async(
+                    lambda timeout: api.messages.create(**request, timeout=timeout))
+                tip = message.content[0].text.strip()
+                _tip_cache.put(key, tip)
+                return tip
             
+            try:
+                tip, shared = await TIP_FLIGHTS.do_async(key, fetch)
+                _count_tip("coalesced" if shared else "claude_calls")
+                if EVENTS.level <= DEBUG:
+                    EVENTS.emit(DEBUG, "tip.coalesced" if shared else "tip.generated", tip=tip)
+                return tip
+                
+            except CircuitOpenError:
+                if EVENTS.level <= DEBUG:
+                    EVENTS.emit(DEBUG, "tip.circuit_open")
+            except Exception as e:
+                if EVENTS.level <= WARNING:
+                    EVENTS.emit(WARNING, "tip.claude_error", error=str(e))
+        
+        return _keyword_tip(job_description)
+    finally:
+        if timed:
+            TIMINGS.record("generate_prep_tip", start)
+
+def generate_prep_tips_bulk(
+    job_descriptions: Iterable[str],
+    client=None,
+    poll_interval: float = 30.0,
+    max_wait: float = 24 * 60 * 60.0
+) -> Dict[str, str]:
+    """
+    Tool: Interview prep tips for many job descriptions via the Message Batches API
+    
+    For offline runs: every distinct description not already in the tip
+    cache becomes one request of a message batch (see
+    message_batches.py), which is polled until it ends. Tips that come
+    back are cached like generate_prep_tip() results; descriptions whose
+    request failed, or all of them if the batch can't be submitted, get
+    the keyword fallback tip. Failed status checks are retried until
+    max_wait; batches still running then are cancelled, and the tips of
+    those that ended are kept.
+    
+    Args:
+        job_descriptions: Job description texts (duplicates are requested once)
+        client: Anthropic client; defaults to get_anthropic_client() when
+                ANTHROPIC_API_KEY is set (otherwise keyword tips only)
+        poll_interval: Seconds between batch status checks
+        max_wait: Give up on the batch after this many seconds
+    
+    Returns:
+        Job description → tip, for every distinct description
+    """
+    from message_batches import BatchTimeout, run_message_batch
+    
+    start = perf_counter_ns()
+    tips: Dict[str, str] = {}
+    requests: Dict[str, str] = {}
+    for description in dict.fromkeys(job_descriptions):
+        key = tip_key(CLAUDE_MODEL, PREP_TIP_PROMPT, description)
+        tip = _tip_cache.get(key)
+        if tip is not None:
+            _count_tip("cached")
+            tips[description] = tip
+        else:
+            requests[key] = description
+    
+    texts: Dict[str, str] = {}
+    if requests and (client is not None or _anthropic_client.is_set() or os.getenv("ANTHROPIC_API_KEY")):
+        def on_poll(batch_id: str, status: str) -> None:
+            if EVENTS.level <= DEBUG:
+                EVENTS.emit(DEBUG, "bulk.poll", batch_id=batch_id, status=status)
+        
+        def on_error(batch_id: str, error: Exception) -> None:
+            if EVENTS.level <= WARNING:
+                EVENTS.emit(WARNING, "bulk.poll_error", batch_id=batch_id, error=str(error))
+        
+        if EVENTS.level <= INFO:
+            EVENTS.emit(INFO, "bulk.submitted", requests=len(requests))
+        try:
+            texts = run_message_batch(
+                client if client is not None else get_anthropic_client(),
+                {key: _prep_tip_request(description) for key, description in requests.items()},
+                poll_interval=poll_interval, max_wait=max_wait, on_poll=on_poll, on_error=on_error,
+                call=_claude_guard.call
+            )
+        except BatchTimeout as e:
+            texts = e.texts
+            if EVENTS.level <= WARNING:
+                EVENTS.emit(WARNING, "bulk.error", error=str(e))
         except Exception as e:
-            print(f"     {Colors.RED}! Warning: Claude API error: {e}, falling back to keyword search{Colors.RESET}")
+            if EVENTS.level <= WARNING:
+                EVENTS.emit(WARNING, "bulk.error", error=str(e))
     
-    # Fallback: extract keywords and use tips DB
-    keywords = ["python", "sql", "react", "kubernetes", "fastapi"]
-    for keyword in keywords:
-        if keyword in job_description.lower():
-            return INTERVIEW_TIPS_DB.get(keyword, "Review the core concepts for this role.")
+    failed = 0
+    for key, description in requests.items():
+        text = texts.get(key)
+        if text:
+            tip = text.strip()
+            _tip_cache.put(key, tip)
+            _count_tip("claude_calls")
+        else:
+            tip = _keyword_tip(description)
+            failed += 1
+        tips[description] = tip
     
-    return "Study the job requirements and prepare concrete examples from your experience."
+    if TIMINGS.enabled:
+        TIMINGS.record("generate_prep_tips_bulk", start)
+    if EVENTS.level <= INFO:
+        EVENTS.emit(INFO, "bulk.done", tips=len(tips), generated=len(requests) - failed, failed=failed,
+                    cached=len(tips) - len(requests), seconds=(perf_counter_ns() - start) / 1e9)
+    return tips
+
+# ============= MESSAGES =============
+
+# Message wording lives in message_templates.py. To use edited copies,
+# point RECRUITEM_TEMPLATES_DIR at a directory of <name>.txt files or
+# call load_templates(directory).
+_templates: Optional[TemplateSet] = None
+
+def _get_templates() -> TemplateSet:
+    global _templates
+    if _templates is None:
+        directory = os.getenv("RECRUITEM_TEMPLATES_DIR")
+        _templates = TemplateSet.from_directory(directory) if directory else TemplateSet(DEFAULT_TEMPLATES)
+    return _templates
+
+def load_templates(directory: str) -> None:
+    """Use message templates from `<name>.txt` files in directory (missing ones keep the defaults)"""
+    set_templates(TemplateSet.from_directory(directory))
+
+def set_templates(templates: TemplateSet) -> None:
+    """Replace the message templates used by the agents"""
+    global _templates
+    _templates = templates
+
+def _assessment_template(job_title: str, test_link: str):
+    """Assessment invitation with the job-level slots filled (cached per job)"""
+    return _get_templates().for_job("assessment", job_title=job_title, test_link=test_link)
+
+def _interview_template(job_title: str, prep_tip: str, jd_snippet: str):
+    """Coaching message with the job-level slots filled (cached per job and tip)"""
+    return _get_templates().for_job("interview", job_title=job_title, prep_tip=prep_tip, jd_snippet=jd_snippet)
+
+def _draft_assessment_message(candidate_name: str, job_title: str, test_link: str) -> str:
+    """Draft the assessment invitation sent by the Assessment Agent"""
+    timed = TIMINGS.enabled
+    if timed:
+        start = perf_counter_ns()
+    message = _assessment_template(job_title, test_link).render({"candidate_name": candidate_name})
+    if timed:
+        TIMINGS.record("draft_message", start)
+    return message
+
+def _draft_interview_message(candidate_name: str, job_title: str, prep_tip: str, jd_snippet: str) -> str:
+    """Draft the coaching message sent by the Interview Agent"""
+    timed = TIMINGS.enabled
+    if timed:
+        start = perf_counter_ns()
+    message = _interview_template(job_title, prep_tip, jd_snippet).render({"candidate_name": candidate_name})
+    if timed:
+        TIMINGS.record("draft_message", start)
+    return message
 
 # ============= AGENTS (Specialists) =============
 
-def router_agent(state: AgentState) -> Literal["assessment", "interview"]:
+# Which agent handles which status. The built-in agents are registered
+# after the batch drafters below; add pipeline stages with
+# AGENTS.register(name, agent, statuses=[...]). Statuses nobody
+# registered for go to the interview agent.
+AGENTS = AgentRegistry(fallback="interview")
+
+def router_agent(state: AgentState) -> str:
     """
     Router Agent - The decision maker
     
@@ -192,22 +1061,29 @@ def router_agent(state: AgentState) -> Literal["assessment", "interview"]:
         state: Current agent state with candidate info and status
     
     Returns:
-        Next agent to call: 'assessment' or 'interview'
+        Name of the next agent to call (e.g. 'assessment' or 'interview')
+    
+    Raises:
+        ValueError: if no agent handles the status and AGENTS has no fallback
     """
+    timed = TIMINGS.enabled
+    if timed:
+        start = perf_counter_ns()
     status = state["status"]
-    print(f"\n{Colors.YELLOW}{Colors.BOLD}→ Router: Analyzing status='{status}'...{Colors.RESET}")
+    if EVENTS.level <= INFO:
+        EVENTS.emit(INFO, "router.start", status=status)
     
-    # Simple rule-based routing (could be LLM-based for complex scenarios)
-    if status.lower() == "assessment":
-        decision = "assessment"
-        print(f"   {Colors.GREEN}✓ Decision: Route to ASSESSMENT AGENT (test logistics){Colors.RESET}")
-    else:
-        decision = "interview"
-        print(f"   {Colors.GREEN}✓ Decision: Route to INTERVIEW AGENT (prep coaching){Colors.RESET}")
+    # Rule-based routing: one lookup in the registry's status table
+    decision = AGENTS.route(status)
+    
+    if EVENTS.level <= INFO:
+        EVENTS.emit(INFO, "router.decision", status=status, agent=decision)
+    if timed:
+        TIMINGS.record("router", start)
     
     return decision
 
-def assessment_agent(state: AgentState) -> AgentState:
+def assessment_agent(state: AgentState, use_claude: bool = False) -> AgentState:
     """
     Assessment Agent - Handles test logistics
     
@@ -217,28 +1093,19 @@ def assessment_agent(state: AgentState) -> AgentState:
     
     Args:
         state: Current agent state with candidate and job info
+        use_claude: Unused; accepted so every agent is called the same way
     
     Returns:
         Updated state with the generated message
     """
-    print(f"\n{Colors.BLUE}{Colors.BOLD}→ Assessment Agent: Processing for {state['candidate_name']}...{Colors.RESET}")
+    if EVENTS.level <= INFO:
+        EVENTS.emit(INFO, "agent.start", agent="assessment", candidate_name=state['candidate_name'])
     
     # Use tool to get test link
     test_link = get_test_link(state['job_title'])
     
     # Draft message
-    message = f"""Hi {state['candidate_name']}!
-
-Great news! You've been selected to move forward with the {state['job_title']} position.
-
-Next Step: Please complete your technical assessment at your earliest convenience.
-
-→ Assessment Link: {test_link}
-→ Time Limit: 60 minutes
-→ Tip: Review the job description before starting
-
-Best of luck!
-RecruitEM Team"""
+    message = _draft_assessment_message(state['candidate_name'], state['job_title'], test_link)
     
     state["output_message"] = message
     state["metadata"] = {
@@ -247,7 +1114,8 @@ RecruitEM Team"""
         "timestamp": datetime.now().isoformat()
     }
     
-    print(f"   {Colors.GREEN}✓ Message drafted: {len(message)} characters{Colors.RESET}")
+    if EVENTS.level <= INFO:
+        EVENTS.emit(INFO, "agent.drafted", agent=state["metadata"]["agent"], chars=len(message))
     return state
 
 def interview_agent(state: AgentState, use_claude: bool = False) -> AgentState:
@@ -266,31 +1134,40 @@ def interview_agent(state: AgentState, use_claude: bool = False) -> AgentState:
     Returns:
         Updated state with the generated coaching message
     """
-    print(f"\n{Colors.MAGENTA}{Colors.BOLD}→ Interview Agent: Processing for {state['candidate_name']}...{Colors.RESET}")
+    if EVENTS.level <= INFO:
+        EVENTS.emit(INFO, "agent.start", agent="interview", candidate_name=state['candidate_name'])
     
     # Use RAG to get relevant context
-    jd_snippet = rag_search(state['job_id'])
+    jd_snippet = rag_search(state['job_id'], semantic=False)
     
     # Generate personalized tip
     prep_tip = generate_prep_tip(state['job_description'], use_claude=use_claude)
     
-    # Draft message
-    message = f"""Hi {state['candidate_name']}!
-
-Congratulations on reaching the interview stage for {state['job_title']}!
-
-→ Your interview is coming up soon. Here's a personalized tip to help you prepare:
-
-→ Key Focus Area:
-{prep_tip}
+    return _complete_interview(state, prep_tip, jd_snippet)
 
-→ Role Context:
-{jd_snippet}
-
-Remember: Prepare specific examples from your experience that demonstrate these skills.
+async def interview_agent_async(state: AgentState, use_claude: bool = False, client=None) -> AgentState:
+    """
+    Interview Agent (async) - Same coaching flow, awaiting the Claude tip
+    
+    Args:
+        state: Current agent state with candidate and job info
+        use_claude: If True, uses Claude AI for tip generation
+        client: Optional async Anthropic-compatible client
+    
+    Returns:
+        Updated state with the generated coaching message
+    """
+    if EVENTS.level <= INFO:
+        EVENTS.emit(INFO, "agent.start", agent="interview", candidate_name=state['candidate_name'])
+    
+    jd_snippet = rag_search(state['job_id'], semantic=False)
+    prep_tip = await generate_prep_tip_async(state['job_description'], use_claude=use_claude, client=client)
+    
+    return _complete_interview(state, prep_tip, jd_snippet)
 
-You've got this!
-RecruitEM Team"""
+def _complete_interview(state: AgentState, prep_tip: str, jd_snippet: str) -> AgentState:
+    """Draft the coaching message and record interview metadata on the state"""
+    message = _draft_interview_message(state['candidate_name'], state['job_title'], prep_tip, jd_snippet)
     
     state["output_message"] = message
     state["metadata"] = {
@@ -299,11 +1176,131 @@ RecruitEM Team"""
         "timestamp": datetime.now().isoformat()
     }
     
-    print(f"   {Colors.GREEN}✓ Message drafted: {len(message)} characters{Colors.RESET}")
+    if EVENTS.level <= INFO:
+        EVENTS.emit(INFO, "agent.drafted", agent=state["metadata"]["agent"], chars=len(message))
     return state
 
 # ============= ORCHESTRATOR (The Flow) =============
 
+def warm_caches() -> None:
+    """
+    Build the tips index, keyword matcher and message templates now
+    
+    They are otherwise built on first use; long-lived workers call this
+    once at startup so no request pays for it.
+    """
+    _get_tips_index()
+    _get_tip_matcher()
+    _get_templates()
+
+def process_settings() -> Tuple[JobCatalog, Optional[DataSnapshot], TemplateSet]:
+    """
+    The installed job catalog, data snapshot and message templates
+    
+    Worker processes pass them to install_process_settings() so they
+    use the same data as the parent, whether forked or spawned (all
+    three can be pickled).
+    """
+    return _job_catalog, _data_snapshot, _get_templates()
+
+def install_process_settings(
+    catalog: JobCatalog,
+    snapshot: Optional[DataSnapshot],
+    templates: TemplateSet
+) -> None:
+    """Install settings from process_settings(), reopening connections inherited through a fork"""
+    set_job_catalog(catalog.reopened())
+    if snapshot is not None:
+        reopened = snapshot.catalog.reopened()
+        if reopened is not snapshot.catalog:
+            snapshot = DataSnapshot(snapshot.version, reopened, snapshot.tips, snapshot.tips_index,
+                                    snapshot.tip_matcher, snapshot.vector_index)
+    use_data_snapshot(snapshot)
+    set_templates(templates)
+
+def preload(use_claude: bool = True, semantic: bool = True, async_paths: bool = True) -> Dict[str, bool]:
+    """
+    Import and build everything a first request would otherwise pay for
+    
+    Serverless and long-lived workers call this once at startup (or
+    from a warm-up hook) so the first interview doesn't absorb the
+    anthropic import, client construction or index builds.
+    
+    Args:
+        use_claude: Import anthropic and build the shared client (only
+                    when ANTHROPIC_API_KEY is set or a client was installed)
+        semantic: Build the vector index (imports NumPy)
+        async_paths: Import asyncio for the *_async entry points
+    
+    Returns:
+        What was loaded: {"caches", "claude", "semantic", "asyncio"} → bool
+    """
+    start = perf_counter_ns()
+    warm_caches()
+    loaded = {"caches": True, "claude": False, "semantic": False, "asyncio": False}
+    if async_paths:
+        import asyncio  # noqa: F401
+        loaded["asyncio"] = True
+    if semantic:
+        loaded["semantic"] = _get_vector_index() is not None
+    if use_claude and (_anthropic_client.is_set() or os.getenv("ANTHROPIC_API_KEY")):
+        try:
+            get_anthropic_client()  # imports anthropic, which also holds AsyncAnthropic
+            tip_key(CLAUDE_MODEL, PREP_TIP_PROMPT, "")
+            loaded["claude"] = True
+        except ImportError as e:
+            if EVENTS.level <= WARNING:
+                EVENTS.emit(WARNING, "preload.claude_unavailable", error=str(e))
+    if EVENTS.level <= INFO:
+        EVENTS.emit(INFO, "preload.done", seconds=(perf_counter_ns() - start) / 1e9, **loaded)
+    return loaded
+
+def _resolve_job(job_id: str) -> Tuple[str, str]:
+    """Look up (job_title, job_description) for a job ID, falling back to generic data"""
+    job = _catalog().get(job_id)
+    if job is None:
+        if EVENTS.level <= WARNING:
+            EVENTS.emit(WARNING, "job.not_found", job_id=job_id)
+        return GENERIC_JOB_TITLE, GENERIC_JOB_DESCRIPTION
+    return job.title, job.description
+
+def _start_workflow(
+    candidate_name: str,
+    candidate_email: str,
+    status: str,
+    job_id: str
+) -> AgentState:
+    """Print the workflow banner and build the initial state for one candidate"""
+    if EVENTS.level <= INFO:
+        EVENTS.emit(INFO, "workflow.start")
+    
+    # Step 1: Initialize state with candidate and job information
+    job_title, job_description = _resolve_job(job_id)
+    
+    state: AgentState = {
+        "job_id": job_id,
+        "candidate_name": candidate_name,
+        "candidate_email": candidate_email,
+        "status": status,
+        "job_title": job_title,
+        "job_description": job_description,
+        "output_message": "",
+        "metadata": {}
+    }
+    
+    if EVENTS.level <= INFO:
+        EVENTS.emit(INFO, "workflow.state", candidate_name=candidate_name, candidate_email=candidate_email,
+                    job_title=job_title, job_id=job_id, status=status)
+    
+    return state
+
+def _finish_workflow(state: AgentState) -> str:
+    """Print the completion summary and return the final message"""
+    if EVENTS.level <= INFO:
+        EVENTS.emit(INFO, "workflow.done", agent=state['metadata']['agent'], chars=len(state['output_message']))
+    
+    return state["output_message"]
+
 def orchestrate(
     candidate_name: str,
     candidate_email: str,
@@ -332,52 +1329,531 @@ def orchestrate(
     Returns:
         The final message string to send to the candidate
     """
-    print("=" * 70)
-    print(f"{Colors.BOLD}{Colors.WHITE}→ Orchestrator: Starting multi-agent workflow...{Colors.RESET}")
-    print("=" * 70)
+    token = _pin_snapshot()
+    timing = TIMINGS.start_call() if TIMINGS.enabled else None
+    state = None
+    try:
+        state = _start_workflow(candidate_name, candidate_email, status, job_id)
+        
+        # Step 2: Router decides the path
+        agent = AGENTS.get(router_agent(state))
+        
+        # Step 3: Delegate to specialist
+        if timing is not None:
+            start = perf_counter_ns()
+        state = agent.run(state, use_claude)
+        if timing is not None:
+            TIMINGS.record(f"agent.{agent.name}", start)
+        
+        # Step 4: Return result
+        return _finish_workflow(state)
+    finally:
+        if timing is not None:
+            TIMINGS.finish_call("orchestrate", timing, [state] if state is not None else [])
+        _pinned_snapshot.reset(token)
+
+async def orchestrate_async(
+    candidate_name: str,
+    candidate_email: str,
+    status: Literal["Assessment", "Interview"],
+    job_id: str,
+    use_claude: bool = False,
+    client=None
+) -> str:
+    """
+    Async Orchestrator - orchestrate() for use inside an event loop
     
-    # Step 1: Initialize state with candidate and job information
-    if job_id not in JOB_DESCRIPTIONS:
-        print(f"{Colors.RED}{Colors.BOLD}! Warning: Job ID '{job_id}' not found, using generic data{Colors.RESET}")
-        job_title = "Software Engineer"
-        job_description = "Software engineering role requiring technical expertise."
-    else:
-        job_info = JOB_DESCRIPTIONS[job_id]
-        job_title = job_info["title"]
-        job_description = job_info["description"]
+    Assessment candidates need no network and complete without
+    suspending; interview candidates await the Claude tip so other
+    candidates can make progress meanwhile.
     
-    state: AgentState = {
-        "job_id": job_id,
-        "candidate_name": candidate_name,
-        "candidate_email": candidate_email,
-        "status": status,
-        "job_title": job_title,
-        "job_description": job_description,
-        "output_message": "",
-        "metadata": {}
-    }
+    Args:
+        candidate_name: The candidate's name
+        candidate_email: The candidate's email address
+        status: Current recruitment status ("Assessment" or "Interview")
+        job_id: The job posting ID (e.g., "J123")
+        use_claude: If True, uses Claude AI for interview tips (optional)
+        client: Optional async Anthropic-compatible client
     
-    print(f"{Colors.CYAN}→ Initial State:{Colors.RESET}")
-    print(f"   {Colors.WHITE}• Candidate: {candidate_name} ({candidate_email}){Colors.RESET}")
-    print(f"   {Colors.WHITE}• Job: {job_title} ({job_id}){Colors.RESET}")
-    print(f"   {Colors.WHITE}• Status: {status}{Colors.RESET}")
+    Returns:
+        The final message string to send to the candidate
+    """
+    token = _pin_snapshot()
+    timing = TIMINGS.start_call() if TIMINGS.enabled else None
+    state = None
+    try:
+        state = _start_workflow(candidate_name, candidate_email, status, job_id)
+        
+        agent = AGENTS.get(router_agent(state))
+        if timing is not None:
+            start = perf_counter_ns()
+        if agent.run_async is not None:
+            state = await agent.run_async(state, use_claude, client)
+        else:
+            state = agent.run(state, use_claude)
+        if timing is not None:
+            TIMINGS.record(f"agent.{agent.name}", start)
+        
+        return _finish_workflow(state)
+    finally:
+        if timing is not None:
+            TIMINGS.finish_call("orchestrate", timing, [state] if state is not None else [])
+        _pinned_snapshot.reset(token)
+
+def _plan_batch(
+    updates: Iterable[StatusUpdate],
+    compact: bool = False
+) -> Tuple[List[AgentState], Dict[str, List[AgentState]], int]:
+    """
+    Print the batch banner and build states for every update
     
-    # Step 2: Router decides the path
-    next_agent = router_agent(state)
+    Jobs are resolved once per distinct job_id and the router is
+    consulted once per distinct status. With compact, states are
+    CandidateRecords sharing one Job per job_id (see candidate.py).
     
-    # Step 3: Delegate to specialist
-    if next_agent == "assessment":
-        state = assessment_agent(state)
-    else:
-        state = interview_agent(state, use_claude=use_claude)
+    Returns:
+        (states in input order, states grouped by routed agent, distinct job count)
+    """
+    if EVENTS.level <= INFO:
+        EVENTS.emit(INFO, "batch.start")
     
-    # Step 4: Return result
-    print(f"\n{Colors.GREEN}{Colors.BOLD}✓ Orchestrator: Workflow completed!{Colors.RESET}")
-    print(f"   {Colors.WHITE}• Agent Used: {state['metadata']['agent']}{Colors.RESET}")
-    print(f"   {Colors.WHITE}• Output Length: {len(state['output_message'])} chars{Colors.RESET}")
-    print("=" * 70)
+    jobs: Dict[str, tuple] = {}
+    routes: Dict[str, str] = {}
+    groups: Dict[str, List[AgentState]] = {name: [] for name in AGENTS.names()}
+    states: List[AgentState] = []
     
-    return state["output_message"]
+    for candidate_name, candidate_email, status, job_id in updates:
+        job = jobs.get(job_id)
+        if job is None:
+            job = jobs[job_id] = shared_job(job_id, *_resolve_job(job_id)) if compact else _resolve_job(job_id)
+        
+        if compact:
+            state = CandidateRecord(candidate_name, candidate_email, status, job)
+        else:
+            state = {
+                "job_id": job_id,
+                "candidate_name": candidate_name,
+                "candidate_email": candidate_email,
+                "status": status,
+                "job_title": job[0],
+                "job_description": job[1],
+                "output_message": "",
+                "metadata": {}
+            }
+        
+        decision = routes.get(status)
+        if decision is None:
+            decision = routes[status] = router_agent(state)
+        
+        groups.setdefault(decision, []).append(state)
+        states.append(state)
+    
+    return states, groups, len(jobs)
+
+def _draft_assessment_group(group: List[AgentState], timestamp: str) -> None:
+    """Draft assessment invitations, fetching one test link and template per role"""
+    roles: Dict[str, tuple] = {}
+    timed = TIMINGS.enabled
+    for state in group:
+        job_title = state["job_title"]
+        role = roles.get(job_title)
+        if role is None:
+            test_link = get_test_link(job_title)
+            role = roles[job_title] = (test_link, _assessment_template(job_title, test_link))
+        test_link, template = role
+        if timed:
+            start = perf_counter_ns()
+        state["output_message"] = template.render(state)
+        if timed:
+            TIMINGS.record("draft_message", start)
+        state["metadata"] = {"agent": "assessment", "test_link": test_link, "timestamp": timestamp}
+
+def _draft_interview_group(group: List[AgentState], timestamp: str, tips: Optional[List[str]] = None) -> None:
+    """
+    Draft coaching messages, building one role context per job
+    
+    Args:
+        group: Interview states to fill in
+        timestamp: Timestamp recorded in each state's metadata
+        tips: Optional per-candidate tips (e.g. from Claude), aligned with
+              group; defaults to one keyword tip per job
+    """
+    contexts: Dict[str, tuple] = {}
+    timed = TIMINGS.enabled
+    for index, state in enumerate(group):
+        job_id = state["job_id"]
+        context = contexts.get(job_id)
+        if context is None:
+            jd_snippet = rag_search(job_id, semantic=False)
+            prep_tip = None if tips is not None else generate_prep_tip(state["job_description"])
+            template = None if tips is not None else _interview_template(state["job_title"], prep_tip, jd_snippet)
+            context = contexts[job_id] = (jd_snippet, prep_tip, template)
+        jd_snippet, prep_tip, template = context
+        if timed:
+            start = perf_counter_ns()
+        if tips is not None:
+            prep_tip = tips[index]
+            template = _interview_template(state["job_title"], prep_tip, jd_snippet)
+        state["output_message"] = template.render(state)
+        if timed:
+            TIMINGS.record("draft_message", start)
+        state["metadata"] = {"agent": "interview", "prep_tip": prep_tip, "timestamp": timestamp}
+
+def _draft_interview_batch(group: List[AgentState], timestamp: str, use_claude: bool = False) -> None:
+    """Interview batch drafter: a Claude tip per candidate with use_claude, else a keyword tip per job"""
+    tips = None
+    if use_claude:
+        tips = [generate_prep_tip(state["job_description"], use_claude=True) for state in group]
+    _draft_interview_group(group, timestamp, tips)
+
+async def _draft_interview_batch_async(
+    group: List[AgentState],
+    timestamp: str,
+    use_claude: bool = False,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    client=None
+) -> None:
+    """Interview batch drafter with Claude tips requested concurrently"""
+    tips = None
+    if use_claude and group:
+        import asyncio
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def tip_for(state: AgentState) -> str:
+            async with semaphore:
+                return await generate_prep_tip_async(state["job_description"], use_claude=True, client=client)
+        
+        tips = await asyncio.gather(*(tip_for(state) for state in group))
+    _draft_interview_group(group, timestamp, tips)
+
+def _draft_interview_batch_bulk(
+    group: List[AgentState],
+    timestamp: str,
+    client=None,
+    poll_interval: float = 30.0,
+    max_wait: float = 24 * 60 * 60.0
+) -> None:
+    """Interview bulk drafter: Claude tips for the group's distinct jobs from one message batch"""
+    descriptions = [state["job_description"] for state in group]
+    tips = generate_prep_tips_bulk(descriptions, client, poll_interval, max_wait)
+    counts = _batch_tip_counts.get()
+    if counts is not None:
+        counts["coalesced"] += len(descriptions) - len(tips)
+    _draft_interview_group(group, timestamp, [tips[description] for description in descriptions])
+
+def _assessment_context(job_id: str, job_title: str, job_description: str, timestamp: str, use_claude: bool) -> tuple:
+    """Assessment message context of one job for orchestrate_columns()"""
+    test_link = get_test_link(job_title)
+    return (_assessment_template(job_title, test_link),
+            {"agent": "assessment", "test_link": test_link, "timestamp": timestamp}, job_title, job_description)
+
+def _interview_context(job_id: str, job_title: str, job_description: str, timestamp: str, use_claude: bool) -> tuple:
+    """Interview message context of one job for orchestrate_columns()"""
+    jd_snippet = rag_search(job_id, semantic=False)
+    prep_tip = generate_prep_tip(job_description, use_claude=use_claude)
+    return (_interview_template(job_title, prep_tip, jd_snippet),
+            {"agent": "interview", "prep_tip": prep_tip, "timestamp": timestamp}, job_title, job_description)
+
+def _draft_assessment_batch(group: List[AgentState], timestamp: str, use_claude: bool = False) -> None:
+    """Assessment batch drafter (assessments never use Claude)"""
+    _draft_assessment_group(group, timestamp)
+
+AGENTS.register("assessment", assessment_agent, statuses=["assessment"], batch=_draft_assessment_batch)
+AGENTS.register("interview", interview_agent, statuses=["interview"], run_async=interview_agent_async,
+                batch=_draft_interview_batch, batch_async=_draft_interview_batch_async,
+                bulk=_draft_interview_batch_bulk)
+
+# Batch drafter → builder of its per-job context, for agents whose
+# messages depend on the candidate only through candidate_name
+_COLUMN_CONTEXTS = {_draft_assessment_batch: _assessment_context, _draft_interview_batch: _interview_context}
+
+def _run_each(agent, group: List[AgentState], use_claude: bool) -> None:
+    """Batch fallback for agents without a batch drafter: run the agent per state"""
+    for state in group:
+        result = agent.run(state, use_claude)
+        if result is not state:
+            state.update(result)
+
+def _draft_groups(groups: Dict[str, List[AgentState]], timestamp: str, use_claude: bool) -> None:
+    """Hand each routed group to its agent's batch drafter"""
+    for name, group in groups.items():
+        if not group:
+            continue
+        agent = AGENTS.get(name)
+        if agent.batch is not None:
+            agent.batch(group, timestamp, use_claude)
+        else:
+            _run_each(agent, group, use_claude)
+
+async def _draft_groups_async(
+    groups: Dict[str, List[AgentState]],
+    timestamp: str,
+    use_claude: bool,
+    max_concurrency: int,
+    client
+) -> None:
+    """_draft_groups() preferring each agent's async drafter"""
+    for name, group in groups.items():
+        if not group:
+            continue
+        agent = AGENTS.get(name)
+        if agent.batch_async is not None:
+            await agent.batch_async(group, timestamp, use_claude, max_concurrency, client)
+        elif agent.batch is not None:
+            agent.batch(group, timestamp, use_claude)
+        elif agent.run_async is not None:
+            import asyncio
+            semaphore = asyncio.Semaphore(max_concurrency)
+            
+            async def run(state: AgentState) -> None:
+                async with semaphore:
+                    result = await agent.run_async(state, use_claude, client)
+                if result is not state:
+                    state.update(result)
+            
+            await asyncio.gather(*(run(state) for state in group))
+        else:
+            _run_each(agent, group, use_claude)
+
+def _finish_batch(states: List[AgentState], groups: Dict[str, List[AgentState]], job_count: int) -> None:
+    """Print the batch completion summary (with Claude call counts when tips used Claude)"""
+    _emit_batch_done(len(states), job_count, len(groups.get('assessment', ())), len(groups.get('interview', ())))
+
+def _emit_batch_done(candidates: int, job_count: int, assessment: int, interview: int) -> None:
+    if EVENTS.level <= INFO:
+        fields = {}
+        counts = _batch_tip_counts.get()
+        if counts is not None:
+            fields = {"claude_calls": counts["claude_calls"], "tips_cached": counts["cached"],
+                      "tips_coalesced": counts["coalesced"], "tips_saved": counts["cached"] + counts["coalesced"]}
+        EVENTS.emit(INFO, "batch.done", candidates=candidates, jobs=job_count,
+                    assessment=assessment, interview=interview, **fields)
+
+def _start_tip_counts(use_claude: bool) -> Optional[contextvars.Token]:
+    if not use_claude:
+        return None
+    return _batch_tip_counts.set({"claude_calls": 0, "cached": 0, "coalesced": 0})
+
+def orchestrate_many(
+    updates: Iterable[StatusUpdate],
+    use_claude: bool = False,
+    compact: bool = False
+) -> List[AgentState]:
+    """
+    Batch Orchestrator - Runs many status updates through one workflow
+    
+    Same flow as orchestrate(), but shared work is done once per batch
+    instead of once per candidate:
+    - job metadata is resolved once per distinct job_id
+    - the router is consulted once per distinct status
+    - test links are fetched once per role, and the interview context
+      (rag_search + keyword tips) is built once per job
+    
+    Candidate-specific messages are still drafted individually. When
+    use_claude is True each interview candidate gets their own tip, as
+    with orchestrate().
+    
+    Args:
+        updates: Iterable of StatusUpdate (or plain
+                 (name, email, status, job_id) tuples)
+        use_claude: If True, uses Claude AI for interview tips (optional)
+        compact: Return CandidateRecords instead of AgentState dicts: the
+                 same keys in a fraction of the memory, for very large
+                 batches (see candidate.py)
+    
+    Returns:
+        Final agent states, in input order. Each state's output_message
+        is the message orchestrate() would have returned.
+    """
+    token = _pin_snapshot()
+    counts_token = _start_tip_counts(use_claude)
+    timing = TIMINGS.start_call() if TIMINGS.enabled else None
+    states = []
+    try:
+        states, groups, job_count = _plan_batch(updates, compact)
+        timestamp = datetime.now().isoformat()
+        
+        _draft_groups(groups, timestamp, use_claude)
+        
+        _finish_batch(states, groups, job_count)
+        return states
+    finally:
+        if timing is not None:
+            TIMINGS.finish_call("orchestrate_many", timing, states)
+        if counts_token is not None:
+            _batch_tip_counts.reset(counts_token)
+        _pinned_snapshot.reset(token)
+
+async def orchestrate_many_async(
+    updates: Iterable[StatusUpdate],
+    use_claude: bool = False,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    client=None,
+    compact: bool = False
+) -> List[AgentState]:
+    """
+    Async Batch Orchestrator - orchestrate_many() with concurrent Claude tips
+    
+    Assessment candidates are drafted synchronously and never touch the
+    event loop. With use_claude, interview tips are requested
+    concurrently, with at most max_concurrency calls in flight, so a
+    batch costs roughly (interview candidates / max_concurrency) round
+    trips instead of one round trip per candidate.
+    
+    Args:
+        updates: Iterable of StatusUpdate (or plain
+                 (name, email, status, job_id) tuples)
+        use_claude: If True, uses Claude AI for interview tips (optional)
+        max_concurrency: Maximum number of Claude calls in flight
+        client: Optional async Anthropic-compatible client; defaults to
+                the shared get_async_anthropic_client()
+        compact: Return CandidateRecords, as for orchestrate_many()
+    
+    Returns:
+        Final agent states, in input order
+    """
+    if max_concurrency < 1:
+        raise ValueError(f"max_concurrency must be >= 1, got {max_concurrency}")
+    
+    token = _pin_snapshot()
+    counts_token = _start_tip_counts(use_claude)
+    timing = TIMINGS.start_call() if TIMINGS.enabled else None
+    states = []
+    try:
+        states, groups, job_count = _plan_batch(updates, compact)
+        timestamp = datetime.now().isoformat()
+        
+        await _draft_groups_async(groups, timestamp, use_claude, max_concurrency, client)
+        
+        _finish_batch(states, groups, job_count)
+        return states
+    finally:
+        if timing is not None:
+            TIMINGS.finish_call("orchestrate_many", timing, states)
+        if counts_token is not None:
+            _batch_tip_counts.reset(counts_token)
+        _pinned_snapshot.reset(token)
+
+def orchestrate_columns(updates, use_claude: bool = False):
+    """
+    Columnar Orchestrator - orchestrate_many() over whole columns (requires NumPy)
+    
+    For million-candidate runs. Updates become parallel columns with
+    categorical status and job codes (columnar.CandidateColumns); each
+    distinct status is routed and each distinct job resolved once, the
+    agent of every row is one array lookup, and rows are grouped by
+    (agent, job) with np.unique. The built-in agents draft one message
+    context per group; candidates' messages are rendered only when the
+    result is read. Rows of other registered agents are drafted through
+    their batch drafter as in orchestrate_many().
+    
+    Args:
+        updates: CandidateColumns, or an iterable of StatusUpdate (or
+                 plain (name, email, status, job_id) tuples)
+        use_claude: If True, uses Claude AI for interview tips (one per job)
+    
+    Returns:
+        columnar.ColumnarBatch: iterate it for AgentStates, or call
+        messages() for just the messages, in input order
+    """
+    import numpy as np
+    from columnar import CandidateColumns, ColumnarBatch, group_by
+    
+    token = _pin_snapshot()
+    counts_token = _start_tip_counts(use_claude)
+    timing = TIMINGS.start_call() if TIMINGS.enabled else None
+    try:
+        columns = updates if isinstance(updates, CandidateColumns) else CandidateColumns.from_updates(updates)
+        if EVENTS.level <= INFO:
+            EVENTS.emit(INFO, "batch.start")
+        
+        agents = AGENTS.names()
+        agent_index = {name: code for code, name in enumerate(agents)}
+        status_agents = np.array([agent_index[AGENTS.route(status)] for status in columns.statuses],
+                                 dtype=np.int32)
+        agent_codes = status_agents[columns.status_codes] if len(columns) else np.zeros(0, np.int32)
+        jobs = [_resolve_job(job_id) for job_id in columns.job_ids]
+        groups, group_codes = group_by(agent_codes, columns.job_codes, sizes=(len(agents), len(jobs)))
+        
+        timestamp = datetime.now().isoformat()
+        contexts: List[Optional[tuple]] = []
+        drafted: Dict[int, AgentState] = {}
+        for group, (agent_code, job_code) in enumerate(groups.tolist()):
+            agent = AGENTS.get(agents[agent_code])
+            job_id = columns.job_ids[job_code]
+            build = _COLUMN_CONTEXTS.get(agent.batch)
+            if build is not None:
+                contexts.append(build(job_id, *jobs[job_code], timestamp, use_claude))
+                continue
+            contexts.append(None)
+            rows = np.flatnonzero(group_codes == group).tolist()
+            states = [{"job_id": job_id, "candidate_name": columns.names[row], "candidate_email": columns.emails[row],
+                       "status": columns.statuses[columns.status_codes[row]], "job_title": jobs[job_code][0],
+                       "job_description": jobs[job_code][1], "output_message": "", "metadata": {}} for row in rows]
+            _draft_groups({agent.name: states}, timestamp, use_claude)
+            drafted.update(zip(rows, states))
+        
+        batch = ColumnarBatch(columns, agents, agent_codes, group_codes, contexts, drafted)
+        counts = batch.agent_counts()
+        _emit_batch_done(len(columns), len(jobs), counts.get("assessment", 0), counts.get("interview", 0))
+        return batch
+    finally:
+        if timing is not None:
+            TIMINGS.finish_call("orchestrate_columns", timing, [])
+        if counts_token is not None:
+            _batch_tip_counts.reset(counts_token)
+        _pinned_snapshot.reset(token)
+
+def orchestrate_many_bulk(
+    updates: Iterable[StatusUpdate],
+    client=None,
+    poll_interval: float = 30.0,
+    max_wait: float = 24 * 60 * 60.0
+) -> List[AgentState]:
+    """
+    Bulk Orchestrator - orchestrate_many() with Claude tips from one message batch
+    
+    For nightly runs that don't need interactive latency: each agent
+    registered with a bulk drafter gets its whole group at once. The
+    interview agent's sends the distinct job descriptions to Claude as
+    a single message batch (generate_prep_tips_bulk()) and drafts the
+    messages from its results once it ends; candidates whose tip
+    request failed get the keyword tip. Other agents are drafted as in
+    orchestrate_many().
+    
+    Args:
+        updates: Iterable of StatusUpdate (or plain
+                 (name, email, status, job_id) tuples)
+        client: Anthropic client; defaults to the shared get_anthropic_client()
+        poll_interval: Seconds between batch status checks
+        max_wait: Give up on the batch (keyword tips) after this many seconds
+    
+    Returns:
+        Final agent states, in input order
+    """
+    token = _pin_snapshot()
+    counts_token = _start_tip_counts(True)
+    timing = TIMINGS.start_call() if TIMINGS.enabled else None
+    states = []
+    try:
+        states, groups, job_count = _plan_batch(updates)
+        
+        timestamp = datetime.now().isoformat()
+        drafted = set()
+        for name, group in groups.items():
+            agent = AGENTS.get(name)
+            if group and agent.bulk is not None:
+                agent.bulk(group, timestamp, client, poll_interval, max_wait)
+                drafted.add(name)
+        _draft_groups({name: group for name, group in groups.items() if name not in drafted}, timestamp, False)
+        
+        _finish_batch(states, groups, job_count)
+        return states
+    finally:
+        if timing is not None:
+            TIMINGS.finish_call("orchestrate_many", timing, states)
+        _batch_tip_counts.reset(counts_token)
+        _pinned_snapshot.reset(token)
 
 # ============= MAIN ENTRY POINT =============
 
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Parallel Runner - Bulk orchestration across CPU cores
+=====================================================
+
+orchestrate_many() runs on one core. For bulk jobs (e.g. nightly
+re-sends over hundreds of thousands of candidates) run_parallel()
+splits the updates into chunks and runs each chunk through
+orchestrate_many() in a pool of worker processes:
+
+    updates → chunks of chunk_size → ProcessPoolExecutor → (index, state) stream
+
+Each worker installs the parent's job catalog, data snapshot and
+message templates (see orchestrator.process_settings(); SQLite catalogs
+get their own connection) and builds the tips index and keyword matcher
+once when it starts, so chunks only pay for drafting. Only a bounded
+number of chunks are in flight at a time, so the input can be a lazy
+iterable larger than memory.
+
+Workers send their events to a NullSink; the parent's console stays quiet.
+
+Author: RecruitEM Team
+"""
+
+import itertools
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import orchestrator
+from events import NullSink
+from orchestrator import AgentState, StatusUpdate
+
+DEFAULT_CHUNK_SIZE = 1000
+
+def _init_worker(settings: tuple) -> None:
+    """Runs once in each worker process before it takes any chunk"""
+    orchestrator.set_event_sink(NullSink())
+    orchestrator.install_process_settings(*settings)
+    orchestrator.warm_caches()
+
+def _run_chunk(start: int, chunk: List[StatusUpdate], use_claude: bool) -> Tuple[int, List[AgentState]]:
+    return start, orchestrator.orchestrate_many(chunk, use_claude=use_claude)
+
+def _chunks(updates: Iterable[StatusUpdate], chunk_size: int) -> Iterator[Tuple[int, List[StatusUpdate]]]:
+    """(index of first update, updates) pairs of at most chunk_size updates"""
+    iterator = iter(updates)
+    start = 0
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+def run_parallel(
+    updates: Iterable[StatusUpdate],
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ordered: bool = True,
+    use_claude: bool = False,
+    max_pending: Optional[int] = None,
+    mp_context=None
+) -> Iterator[Tuple[int, AgentState]]:
+    """
+    Run status updates through orchestrate_many() in worker processes
+
+    Args:
+        updates: Iterable of StatusUpdate (or plain
+                 (name, email, status, job_id) tuples); consumed lazily
+        workers: Worker processes (default: os.cpu_count())
+        chunk_size: Updates per task; larger chunks amortise more
+                    per-job work and pickling overhead
+        ordered: If True, yield results in input order; otherwise yield
+                 each chunk as soon as it completes
+        use_claude: If True, uses Claude AI for interview tips (optional)
+        max_pending: Chunks submitted but not yet yielded (default: 2 per
+                     worker), which bounds memory use
+        mp_context: Optional multiprocessing context, e.g.
+                    multiprocessing.get_context("spawn")
+
+    Yields:
+        (input index, final agent state) pairs
+    """
+    workers = workers or os.cpu_count() or 1
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be >= 1, got {chunk_size}")
+    max_pending = max_pending or 2 * workers
+
+    chunks = _chunks(updates, chunk_size)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context, initializer=_init_worker,
+                             initargs=(orchestrator.process_settings(),)) as pool:
+        pending = deque()
+
+        def submit(count: int) -> None:
+            for start, chunk in itertools.islice(chunks, count):
+                pending.append(pool.submit(_run_chunk, start, chunk, use_claude))
+
+        submit(max_pending)
+        try:
+            while pending:
+                if ordered:
+                    done = [pending.popleft()]
+                else:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    done = [future for future in pending if future in finished]
+                    for future in done:
+                        pending.remove(future)
+
+                for future in done:
+                    start, states = future.result()
+                    submit(1)
+                    yield from enumerate(states, start)
+        finally:
+            # Stopped early (or a chunk failed): don't run chunks nobody will read
+            for future in pending:
+                future.cancel()
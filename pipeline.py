@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Pipeline - Stream status updates from a file through the orchestrator
+=====================================================================
+
+Reads status updates line by line from JSONL or CSV, runs them through
+orchestrate_many() in fixed-size batches and writes one JSON result
+per line. Input, batches and output are all generators, so memory use
+depends on the batch size, not on the size of the input.
+
+    JSONL / CSV → read_updates() → batches → orchestrate_many() → result_record() → JSONL
+
+Each input record needs candidate_name, candidate_email, status and
+job_id (JSON keys or CSV header columns). Records that can't be used
+are reported on stderr and skipped.
+
+Usage:
+    python3 -m pipeline updates.jsonl -o results.jsonl
+    cat updates.csv | python3 -m pipeline --format csv > results.jsonl
+    python3 -m pipeline updates.jsonl --workers 4 --log events.jsonl
+    python3 -m pipeline updates.jsonl --dedup seen.db --retention-days 30
+
+Author: RecruitEM Team
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import sys
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional, TextIO
+
+import orchestrator
+from events import JSONLinesSink, NullSink
+from orchestrator import AgentState, StatusUpdate
+
+DEFAULT_BATCH_SIZE = 1000
+
+FORMATS = ("jsonl", "csv")
+
+# Called with (line number, reason) for every skipped input record
+ErrorHandler = Callable[[int, str], None]
+
+class PipelineStats(NamedTuple):
+    """Record counts for one pipeline run"""
+    read: int
+    written: int
+    skipped: int
+
+# ============= INPUT =============
+
+def parse_update(record) -> StatusUpdate:
+    """
+    The StatusUpdate for one decoded input record (JSON object or CSV row)
+
+    Raises:
+        ValueError: if the record isn't an object with non-empty string
+                    candidate_name, candidate_email, status and job_id
+    """
+    if not isinstance(record, dict):
+        raise ValueError("expected an object with candidate_name, candidate_email, status and job_id")
+    try:
+        values = [record[field] for field in StatusUpdate._fields]
+    except KeyError as e:
+        raise ValueError(f"missing field {e.args[0]!r}") from None
+    if not all(isinstance(value, str) and value for value in values):
+        raise ValueError("fields must be non-empty strings")
+    return StatusUpdate(*values)
+
+def _update_from(record, line: int, on_error: ErrorHandler) -> Optional[StatusUpdate]:
+    try:
+        return parse_update(record)
+    except ValueError as e:
+        on_error(line, str(e))
+        return None
+
+def _read_jsonl(stream: TextIO, on_error: ErrorHandler) -> Iterator[StatusUpdate]:
+    for line, text in enumerate(stream, 1):
+        if not text.strip():
+            continue
+        try:
+            record = json.loads(text)
+        except ValueError as e:
+            on_error(line, f"invalid JSON: {e}")
+            continue
+        update = _update_from(record, line, on_error)
+        if update is not None:
+            yield update
+
+def _read_csv(stream: TextIO, on_error: ErrorHandler) -> Iterator[StatusUpdate]:
+    reader = csv.DictReader(stream)
+    for record in reader:
+        update = _update_from(record, reader.line_num, on_error)
+        if update is not None:
+            yield update
+
+def read_updates(stream: TextIO, format: str = "jsonl", on_error: Optional[ErrorHandler] = None) -> Iterator[StatusUpdate]:
+    """
+    Lazily parse status updates from a text stream
+
+    Args:
+        stream: JSONL (one object per line) or CSV with a header row.
+                Open CSV files with newline="".
+        format: "jsonl" or "csv"
+        on_error: Called with (line number, reason) for each unusable
+                  record; by default such records raise ValueError
+
+    Yields:
+        StatusUpdate per usable record, in input order
+    """
+    if on_error is None:
+        def on_error(line: int, reason: str) -> None:
+            raise ValueError(f"line {line}: {reason}")
+    if format == "jsonl":
+        return _read_jsonl(stream, on_error)
+    if format == "csv":
+        return _read_csv(stream, on_error)
+    raise ValueError(f"Unknown format {format!r}; expected one of {FORMATS}")
+
+# ============= PROCESSING =============
+
+def result_record(state: AgentState) -> dict:
+    """The output line for one final agent state"""
+    return {
+        "candidate_name": state["candidate_name"],
+        "candidate_email": state["candidate_email"],
+        "job_id": state["job_id"],
+        "agent": state["metadata"]["agent"],
+        "message": state["output_message"],
+        "metadata": state["metadata"]
+    }
+
+def process(
+    updates: Iterable[StatusUpdate],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    use_claude: bool = False,
+    workers: int = 1,
+    dedup=None
+) -> Iterator[AgentState]:
+    """
+    Run updates through orchestrate_many() batch by batch
+
+    At most one batch (or, with workers > 1, a few batches per worker;
+    see parallel.run_parallel()) is held in memory at a time.
+
+    With a dedup.Deduplicator, updates it has already seen are skipped,
+    and each state is marked as seen once the consumer has taken it and
+    asked for the next (in batches of batch_size).
+
+    Yields:
+        Final agent states, in input order
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+
+    if dedup is not None:
+        yield from _mark_processed(process(dedup.unseen(updates), batch_size, use_claude, workers), dedup, batch_size)
+        return
+
+    if workers > 1:
+        from parallel import run_parallel
+        for _, state in run_parallel(updates, workers=workers, chunk_size=batch_size, use_claude=use_claude):
+            yield state
+        return
+
+    iterator = iter(updates)
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        yield from orchestrator.orchestrate_many(batch, use_claude=use_claude)
+
+def _mark_processed(states: Iterable[AgentState], dedup, batch_size: int) -> Iterator[AgentState]:
+    """
+    Pass states through, marking them in dedup after the consumer is done with them
+
+    If the consumer stops early, the states not marked yet are released
+    in dedup instead, so a later run processes them again.
+    """
+    from dedup import event_key
+    keys = []
+    try:
+        for state in states:
+            keys.append(event_key(state["candidate_email"], state["job_id"], state["status"]))
+            yield state
+            if len(keys) >= batch_size:
+                dedup.mark_keys(keys)
+                keys = []
+        dedup.mark_keys(keys)
+        keys = []
+    finally:
+        if keys:
+            dedup.release_keys(keys)
+
+def write_results(states: Iterable[AgentState], stream: TextIO) -> int:
+    """Write one JSON result per line; returns the number written"""
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    written = 0
+    for state in states:
+        stream.write(dumps(result_record(state)) + "\n")
+        written += 1
+    return written
+
+def run_pipeline(
+    source: TextIO,
+    sink: TextIO,
+    format: str = "jsonl",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    use_claude: bool = False,
+    workers: int = 1,
+    on_error: Optional[ErrorHandler] = None,
+    dedup=None
+) -> PipelineStats:
+    """
+    Read updates from source, orchestrate them and write results to sink
+
+    Args:
+        source: Input text stream (see read_updates())
+        sink: Output text stream, one JSON result per line
+        format: "jsonl" or "csv"
+        batch_size: Updates passed to orchestrate_many() at a time
+        use_claude: If True, uses Claude AI for interview tips (optional)
+        workers: Worker processes (1 = run in this process)
+        on_error: Called for each skipped record (default: ignore it)
+        dedup: Optional dedup.Deduplicator; updates it has seen are
+               neither processed nor written (see process())
+
+    Returns:
+        PipelineStats with the records read, written and skipped
+        (duplicates count as read, but not as written or skipped)
+    """
+    skipped = 0
+    seen_before = dedup.duplicates if dedup is not None else 0
+
+    def skip(line: int, reason: str) -> None:
+        nonlocal skipped
+        skipped += 1
+        if on_error is not None:
+            on_error(line, reason)
+
+    written = write_results(
+        process(read_updates(source, format, skip), batch_size, use_claude, workers, dedup), sink
+    )
+    duplicates = dedup.duplicates - seen_before if dedup is not None else 0
+    return PipelineStats(read=written + skipped + duplicates, written=written, skipped=skipped)
+
+# ============= CLI =============
+
+def _detect_format(path: str) -> str:
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python3 -m pipeline",
+        description="Orchestrate status updates from JSONL or CSV, writing one JSON result per line."
+    )
+    parser.add_argument("input", nargs="?", default="-", help="input file (default: stdin)")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("--format", choices=FORMATS, help="input format (default: from the file extension, else jsonl)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="updates per batch")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (default: 1)")
+    parser.add_argument("--use-claude", action="store_true", help="generate interview tips with Claude")
+    parser.add_argument("--log", metavar="FILE", help="append orchestrator events to FILE as JSON lines")
+    parser.add_argument("--dedup", metavar="FILE", help="skip updates already processed, remembered in SQLite FILE")
+    parser.add_argument("--retention-days", type=float,
+                        help="with --dedup, treat events older than this as new again (default: forever)")
+    args = parser.parse_args(argv)
+
+    input_format = args.format or _detect_format(args.input)
+
+    # stdout carries the results, so events go to a file or nowhere
+    orchestrator.set_event_sink(JSONLinesSink(args.log, level="info") if args.log else NullSink())
+
+    def report(line: int, reason: str) -> None:
+        print(f"{args.input}:{line}: skipped: {reason}", file=sys.stderr)
+
+    dedup = None
+    if args.dedup:
+        from dedup import Deduplicator
+        retention = args.retention_days * 86400 if args.retention_days is not None else None
+        dedup = Deduplicator(args.dedup, retention=retention)
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8", newline="")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        stats = run_pipeline(source, sink, input_format, args.batch_size, args.use_claude, args.workers, report, dedup)
+        if dedup is not None:
+            dedup.purge_expired()
+    finally:
+        if dedup is not None:
+            dedup.close()
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+        orchestrator.EVENTS.sink.close()
+
+    duplicates = stats.read - stats.written - stats.skipped
+    print(f"{stats.written} written, {stats.skipped} skipped"
+          + (f", {duplicates} duplicates" if dedup is not None else ""), file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
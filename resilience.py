@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Resilience - Timeouts, retries and a circuit breaker for API calls
+==================================================================
+
+Claude tips are optional: when the API is slow or failing, a candidate
+should get the keyword fallback quickly rather than wait on it. A
+CallGuard wraps each call:
+
+    breaker open? → CircuitOpenError (caller falls back at once)
+    call(timeout) → retryable error? → jittered backoff → call again
+    consecutive failures ≥ threshold → breaker opens for `cooldown` seconds
+
+So a guarded call never takes longer than RetryPolicy.max_elapsed(),
+and while the API is down it costs nothing at all.
+
+Author: RecruitEM Team
+"""
+
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Dict, NamedTuple, Optional, TypeVar
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limits, server
+# errors and Anthropic's 529 "overloaded"
+RETRYABLE_STATUS = frozenset({408, 409, 429, 500, 502, 503, 504, 529})
+
+# Exception class names (anthropic / httpx) that mean the request never
+# got an answer; matched by name so anthropic needn't be imported
+_RETRYABLE_NAMES = frozenset({"APIConnectionError", "APITimeoutError", "TimeoutException", "NetworkError"})
+
+def is_retryable(error: BaseException) -> bool:
+    """True for timeouts, connection failures, 408/409/429 and 5xx responses"""
+    if isinstance(error, CircuitOpenError):
+        return False
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status in RETRYABLE_STATUS or status >= 500
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    return any(cls.__name__ in _RETRYABLE_NAMES for cls in type(error).__mro__)
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the API while the circuit breaker is open"""
+
+class RetryPolicy(NamedTuple):
+    """
+    How long one call may take and how often it is retried
+
+    Attributes:
+        attempts: Tries per call, including the first
+        timeout: Seconds allowed per try
+        base_delay: Backoff before the first retry; doubles per retry
+        max_delay: Cap on a single backoff
+    """
+    attempts: int = 3
+    timeout: float = 10.0
+    base_delay: float = 0.25
+    max_delay: float = 2.0
+
+    def backoff(self, retry: int) -> float:
+        """Upper bound of the backoff before retry number `retry` (0-based)"""
+        return min(self.max_delay, self.base_delay * 2 ** retry)
+
+    def delay(self, retry: int, rng: random.Random = random) -> float:
+        """Backoff with full jitter, so failing callers don't retry in lockstep"""
+        return rng.uniform(0, self.backoff(retry))
+
+    def max_elapsed(self) -> float:
+        """Worst-case seconds for one guarded call (every try times out)"""
+        return self.attempts * self.timeout + sum(self.backoff(retry) for retry in range(self.attempts - 1))
+
+class CircuitBreaker:
+    """
+    Stops calling an API that keeps failing
+
+    closed     calls go through; consecutive failures are counted
+    open       after failure_threshold failures: calls are rejected
+               until `cooldown` seconds have passed
+    half_open  one probe call is let through; success closes the
+               breaker, failure opens it for another cooldown
+
+    Args:
+        failure_threshold: Consecutive failures that open the breaker
+        cooldown: Seconds to stay open before probing
+        clock: Monotonic time source (injectable for tests)
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        if failure_threshold < 1:
+            raise ValueError(f"failure_threshold must be >= 1, got {failure_threshold}")
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """Current state: closed, open or half_open"""
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._probing or self._clock() - self._opened_at >= self.cooldown:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead now (claims the probe when half-open)"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probing or self._clock() - self._opened_at < self.cooldown:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+                self._probing = False
+
+    def release(self) -> None:
+        """Give back a probe claimed by allow() whose call never finished (e.g. was cancelled)"""
+        with self._lock:
+            self._probing = False
+
+    def reset(self) -> None:
+        """Close the breaker and forget past failures"""
+        self.record_success()
+
+class CallGuard:
+    """
+    Per-call timeout, jittered exponential retries and a circuit breaker
+
+    Guarded functions take the per-try timeout in seconds as their only
+    argument and pass it on to the client, e.g.
+
+        guard.call(lambda timeout: client.messages.create(**request, timeout=timeout))
+
+    Only retryable errors (see is_retryable()) are retried and counted
+    by the breaker; others mean the API answered and are raised at once.
+
+    Args:
+        policy: Timeout and retry settings
+        breaker: Circuit breaker (share one between the sync and async paths)
+        sleep: Blocking sleep used between sync retries (injectable for tests)
+        rng: Random source for the backoff jitter
+    """
+
+    def __init__(
+        self,
+        policy: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Optional[random.Random] = None
+    ):
+        self.policy = policy if policy is not None else RetryPolicy()
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self._sleep = sleep
+        self._rng = rng if rng is not None else random.Random()
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "attempts": 0, "retries": 0, "failures": 0, "rejected": 0}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def _admit(self) -> None:
+        self._count("calls")
+        if not self.breaker.allow():
+            self._count("rejected")
+            raise CircuitOpenError("Circuit breaker is open; skipping the API call")
+
+    def _should_retry(self, error: BaseException, attempt: int) -> bool:
+        """Book a failed try; True if the call should be tried again"""
+        if not is_retryable(error):
+            self.breaker.record_success()
+            return False
+        self.breaker.record_failure()
+        if attempt + 1 >= self.policy.attempts or self.breaker.state != "closed":
+            self._count("failures")
+            return False
+        self._count("retries")
+        return True
+
+    def call(self, func: Callable[[float], T]) -> T:
+        """
+        Call func(timeout) under the policy
+
+        Raises:
+            CircuitOpenError: if the breaker is open (nothing was called)
+            Exception: the last error once retries are exhausted
+        """
+        self._admit()
+        attempt = 0
+        while True:
+            self._count("attempts")
+            try:
+                result = func(self.policy.timeout)
+            except Exception as e:
+                if not self._should_retry(e, attempt):
+                    raise
+                self._sleep(self.policy.delay(attempt, self._rng))
+                attempt += 1
+            except BaseException:
+                self.breaker.release()
+                raise
+            else:
+                self.breaker.record_success()
+                return result
+
+    async def call_async(self, func: Callable[[float], Awaitable[T]]) -> T:
+        """
+        Await func(timeout) under the policy
+
+        The timeout is also enforced here with asyncio.wait_for(), so
+        clients that ignore it are still bounded.
+        """
+        import asyncio
+        self._admit()
+        attempt = 0
+        while True:
+            self._count("attempts")
+            try:
+                result = await asyncio.wait_for(func(self.policy.timeout), self.policy.timeout)
+            except asyncio.TimeoutError:
+                error = TimeoutError(f"No response within {self.policy.timeout}s")
+                if not self._should_retry(error, attempt):
+                    raise error from None
+            except Exception as e:
+                if not self._should_retry(e, attempt):
+                    raise
+            except BaseException:
+                self.breaker.release()
+                raise
+            else:
+                self.breaker.record_success()
+                return result
+            await asyncio.sleep(self.policy.delay(attempt, self._rng))
+            attempt += 1
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Counters and the breaker state
+
+        calls and attempts count every call and try, retries the tries
+        repeated after a retryable error, failures the calls given up
+        on after one, and rejected the calls skipped by the open breaker.
+        """
+        with self._lock:
+            stats: Dict[str, object] = dict(self._stats)
+        stats["breaker"] = self.breaker.state
+        return stats
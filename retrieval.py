@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Retrieval Engine - Inverted index with BM25 ranking
+===================================================
+
+Backs the rag_search tool. Documents are tokenized once when added;
+queries only touch the postings of their own terms, so query cost
+grows with how common the query terms are, not with corpus size.
+
+    text → tokenize() → postings {term: {doc_id: tf}} → BM25 top-k
+
+Author: RecruitEM Team
+"""
+
+import heapq
+import math
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how", "in",
+    "is", "it", "of", "on", "or", "that", "the", "to", "with"
+})
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase alphanumeric terms, dropping stopwords
+
+    Args:
+        text: Any text (document or query)
+
+    Returns:
+        Terms in order of appearance (duplicates kept)
+    """
+    return [term for term in _TOKEN_RE.findall(text.lower()) if term not in STOPWORDS]
+
+class BM25Index:
+    """
+    Inverted index over text documents, ranked with Okapi BM25
+
+    Documents can be added, replaced and removed at any time; the index
+    keeps per-term postings and document lengths up to date so no
+    rebuild is needed.
+
+    Args:
+        k1: Term-frequency saturation
+        b: Document-length normalisation (0 = none, 1 = full)
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_terms: Dict[str, Dict[str, int]] = {}
+        self._doc_len: Dict[str, int] = {}
+        self._texts: Dict[str, str] = {}
+        self._order: Dict[str, int] = {}   # doc_id → when it was added, for breaking ties
+        self._added = 0
+        self._total_len = 0
+
+    @classmethod
+    def from_documents(cls, documents: Iterable[Tuple[str, str]], **params) -> "BM25Index":
+        """Build an index from (doc_id, text) pairs"""
+        index = cls(**params)
+        for doc_id, text in documents:
+            index.add(doc_id, text)
+        return index
+
+    def add(self, doc_id: str, text: str) -> None:
+        """Index a document, replacing any previous document with the same ID"""
+        if doc_id in self._texts:
+            self.remove(doc_id)
+
+        terms: Dict[str, int] = {}
+        for term in tokenize(text):
+            terms[term] = terms.get(term, 0) + 1
+
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = tf
+
+        length = sum(terms.values())
+        self._doc_terms[doc_id] = terms
+        self._doc_len[doc_id] = length
+        self._texts[doc_id] = text
+        self._order[doc_id] = self._added
+        self._added += 1
+        self._total_len += length
+
+    def remove(self, doc_id: str) -> bool:
+        """Drop a document; returns False if it was not indexed"""
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return False
+
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+
+        self._total_len -= self._doc_len.pop(doc_id)
+        del self._texts[doc_id]
+        del self._order[doc_id]
+        return True
+
+    def get(self, doc_id: str) -> Optional[str]:
+        """Original text of a document, or None"""
+        return self._texts.get(doc_id)
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._texts
+
+    def search(self, query: str, top_k: int = 5) -> List[Tuple[str, float]]:
+        """
+        Rank documents against a query
+
+        Args:
+            query: Free-text query
+            top_k: Maximum number of results
+
+        Returns:
+            (doc_id, score) pairs, best first; ties keep insertion order.
+            Documents sharing no term with the query are not returned.
+        """
+        doc_count = len(self._texts)
+        if not doc_count or top_k < 1:
+            return []
+
+        avg_len = self._total_len / doc_count
+        k1, b = self.k1, self.b
+        scores: Dict[str, float] = {}
+
+        # Distinct terms in query order, so scores are summed the same way in every process
+        for term in dict.fromkeys(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            df = len(postings)
+            idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+            for doc_id, tf in postings.items():
+                norm = k1 * (1 - b + b * self._doc_len[doc_id] / avg_len)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+
+        order = self._order
+        return heapq.nlargest(top_k, scores.items(), key=lambda item: (item[1], -order[item[0]]))
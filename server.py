@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Server - Orchestrator over HTTP, with keep-alive and micro-batching
+===================================================================
+
+A long-running process pays interpreter startup, imports and index
+builds once instead of per call. The server speaks plain HTTP/1.1 on
+stdlib asyncio (no web framework) and keeps connections open between
+requests:
+
+    POST /orchestrate        one status update (JSON object) → one result
+    POST /orchestrate/batch  JSON array of updates → {"results": [...]}, in order
+    GET  /health             {"status": "ok"}
+    GET  /stats              request, batch and connection counters
+
+Bodies use the pipeline's record format (candidate_name,
+candidate_email, status, job_id) and results are pipeline result
+records (see pipeline.result_record()).
+
+With a batch window, single /orchestrate requests arriving within that
+many milliseconds of each other are run through orchestrate_many_async()
+together, so concurrent callers share job lookups, routing, templates
+and Claude tips:
+
+    request ─┐
+    request ─┼─ within batch_window_ms (or max_batch reached) → one batch → each its own result
+    request ─┘
+
+Usage:
+    python3 -m server --port 8080 --batch-window-ms 2
+    python3 -m loadgen --port 8080 -n 5000 -c 32
+
+Author: RecruitEM Team
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from http import HTTPStatus
+from typing import Dict, List, Optional, Tuple
+
+import orchestrator
+from events import JSONLinesSink, NullSink
+from orchestrator import AgentState, StatusUpdate
+from pipeline import parse_update, result_record
+
+DEFAULT_PORT = 8080
+
+# Most single requests merged into one micro-batch
+DEFAULT_MAX_BATCH = 256
+
+# Seconds a keep-alive connection may sit idle before it is closed
+DEFAULT_IDLE_TIMEOUT = 60.0
+
+# Largest accepted request body, in bytes
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+class HTTPError(Exception):
+    """An error answered with `status` and a JSON {"error": message} body"""
+
+    def __init__(self, status: HTTPStatus, message: str, close: bool = False):
+        super().__init__(message)
+        self.status = status
+        self.close = close
+
+# ============= MICRO-BATCHING =============
+
+class MicroBatcher:
+    """
+    Gathers single updates for up to `window` seconds and orchestrates them together
+
+    The first update of a batch starts the window; the batch runs when
+    the window ends or it holds max_batch updates, whichever is first.
+    If a batch fails as a whole (e.g. one update has a status nobody
+    handles), its updates are retried one by one so only the bad ones fail.
+    """
+
+    def __init__(self, window: float, max_batch: int, use_claude: bool = False,
+                 max_concurrency: int = orchestrator.DEFAULT_MAX_CONCURRENCY):
+        if max_batch < 1:
+            raise ValueError(f"max_batch must be >= 1, got {max_batch}")
+        self.window = window
+        self.max_batch = max_batch
+        self.use_claude = use_claude
+        self.max_concurrency = max_concurrency
+        self._pending: List[Tuple[StatusUpdate, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+        self.batches = 0
+        self.batched = 0
+
+    async def orchestrate(self, updates: List[StatusUpdate]) -> List[AgentState]:
+        """Run updates as one batch now"""
+        self.batches += 1
+        self.batched += len(updates)
+        return await orchestrator.orchestrate_many_async(
+            updates, use_claude=self.use_claude, max_concurrency=self.max_concurrency
+        )
+
+    async def submit(self, update: StatusUpdate) -> AgentState:
+        """Final state for one update, run with whatever else arrives within the window"""
+        if self.window <= 0:
+            return (await self.orchestrate([update]))[0]
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((update, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if pending:
+            task = asyncio.ensure_future(self._run(pending))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, pending: List[Tuple[StatusUpdate, asyncio.Future]]) -> None:
+        try:
+            states = await self.orchestrate([update for update, _ in pending])
+        except Exception as e:
+            if len(pending) > 1:
+                for item in pending:
+                    await self._run([item])
+            elif not pending[0][1].done():
+                pending[0][1].set_exception(e)
+            return
+        for (_, future), state in zip(pending, states):
+            if not future.done():   # not if its caller went away
+                future.set_result(state)
+
+    async def close(self) -> None:
+        """Run whatever is still waiting for its window"""
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+# ============= HTTP =============
+
+def _json_body(body: bytes):
+    try:
+        return json.loads(body)
+    except ValueError as e:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"invalid JSON: {e}") from None
+
+def _parse(record, where: str = "") -> StatusUpdate:
+    try:
+        return parse_update(record)
+    except ValueError as e:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"{where}{e}") from None
+
+class OrchestratorServer:
+    """
+    HTTP/1.1 server for orchestrate requests
+
+    Args:
+        host, port: Address to listen on (port 0: any free port, see .port)
+        batch_window_ms: Micro-batching window for /orchestrate (0: run each request at once)
+        max_batch: Most requests per micro-batch
+        use_claude: Generate interview tips with Claude
+        max_concurrency: Claude calls in flight per batch
+        idle_timeout: Seconds a connection may take to send each request
+                      (line, headers and body) before it is closed
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        batch_window_ms: float = 0.0,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        use_claude: bool = False,
+        max_concurrency: int = orchestrator.DEFAULT_MAX_CONCURRENCY,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT
+    ):
+        self.host = host
+        self.port = port
+        self.idle_timeout = idle_timeout
+        self.batcher = MicroBatcher(batch_window_ms / 1000.0, max_batch, use_claude, max_concurrency)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Dict[asyncio.StreamWriter, asyncio.Task] = {}
+        self._encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+        self.requests = 0
+        self.connections = 0
+        self.errors = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        """Warm the orchestrator caches and start listening"""
+        orchestrator.warm_caches()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop listening, finish pending batches and drop open connections"""
+        if self._server is not None:
+            self._server.close()
+        await self.batcher.close()
+        handlers = list(self._connections.values())
+        for writer in list(self._connections):
+            writer.close()
+        if handlers:
+            await asyncio.gather(*handlers, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+
+    async def __aenter__(self) -> "OrchestratorServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def stats(self) -> Dict[str, int]:
+        """Requests served, errors, connections accepted and open, and batches run"""
+        return {"requests": self.requests, "errors": self.errors, "connections": self.connections,
+                "open_connections": len(self._connections), "batches": self.batcher.batches,
+                "batched_updates": self.batcher.batched}
+
+    # --- connection handling ---
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self._connections[writer] = asyncio.current_task()
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader, writer), self.idle_timeout)
+                except asyncio.TimeoutError:
+                    break
+                except HTTPError as e:
+                    self.errors += 1
+                    await self._respond(writer, e.status, {"error": str(e)}, keep_alive=False)
+                    break
+                if request is None:
+                    break   # client closed the connection
+                method, path, version, headers, body = request
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+                self.requests += 1
+                try:
+                    status, payload = HTTPStatus.OK, await self._dispatch(method, path, body)
+                except HTTPError as e:
+                    self.errors += 1
+                    status, payload = e.status, {"error": str(e)}
+                except Exception as e:
+                    self.errors += 1
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"}
+                await self._respond(writer, status, payload, keep_alive)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """(method, path, version, headers, body) of the next request, or None at end of stream"""
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+        try:
+            method, path, version = request_line.decode("latin-1").split()
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "malformed request line") from None
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raise HTTPError(HTTPStatus.LENGTH_REQUIRED, "chunked bodies are not supported; send Content-Length")
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "invalid Content-Length") from None
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"body over {MAX_BODY_BYTES} bytes")
+        if length and headers.get("expect", "").lower() == "100-continue":
+            # curl and others wait for this (about 1 s) before sending larger bodies
+            writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+            await writer.drain()
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), path.split("?", 1)[0], version.upper(), headers, body
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: HTTPStatus, payload, keep_alive: bool) -> None:
+        body = self._encode(payload).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + body
+        )
+        await writer.drain()
+
+    # --- endpoints ---
+
+    async def _dispatch(self, method: str, path: str, body: bytes):
+        if path == "/orchestrate":
+            self._require(method, "POST")
+            state = await self.batcher.submit(_parse(_json_body(body)))
+            return result_record(state)
+        if path == "/orchestrate/batch":
+            self._require(method, "POST")
+            records = _json_body(body)
+            if not isinstance(records, list):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "expected a JSON array of updates")
+            updates = [_parse(record, f"update {index}: ") for index, record in enumerate(records)]
+            states = await self.batcher.orchestrate(updates) if updates else []
+            return {"results": [result_record(state) for state in states]}
+        if path == "/health":
+            self._require(method, "GET")
+            return {"status": "ok"}
+        if path == "/stats":
+            self._require(method, "GET")
+            return self.stats()
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"no endpoint {path}")
+
+    @staticmethod
+    def _require(method: str, allowed: str) -> None:
+        if method != allowed:
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"use {allowed}")
+
+# ============= CLI =============
+
+async def _serve(server: OrchestratorServer) -> None:
+    await server.start()
+    print(f"Serving on {server.url} (batch window {server.batcher.window * 1000:g} ms)", file=sys.stderr)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python3 -m server", description="Serve orchestrate() over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port (default: {DEFAULT_PORT})")
+    parser.add_argument("--batch-window-ms", type=float, default=0.0,
+                        help="gather /orchestrate requests for this long into one batch (default: 0, off)")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH, help="most requests per micro-batch")
+    parser.add_argument("--use-claude", action="store_true", help="generate interview tips with Claude")
+    parser.add_argument("--log", metavar="FILE", help="append orchestrator events to FILE as JSON lines")
+    args = parser.parse_args(argv)
+
+    orchestrator.set_event_sink(JSONLinesSink(args.log, level="info") if args.log else NullSink())
+    server = OrchestratorServer(args.host, args.port, args.batch_window_ms, args.max_batch, args.use_claude)
+    try:
+        asyncio.run(_serve(server))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        orchestrator.EVENTS.sink.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Single Flight - Coalesce concurrent identical calls
+===================================================
+
+When interview candidates for the same job are processed at the same
+time, each asks Claude for the same tip before any answer has reached
+the tip cache. SingleFlight lets the first caller for a key make the
+call while every concurrent caller with that key waits for it and
+shares its result (or its exception):
+
+    caller A ─┐
+    caller B ─┼─ same key → one upstream call → result to A, B and C
+    caller C ─┘
+
+Threads use do(), asyncio tasks do_async(). A flight ends when its call
+returns, so later callers start a new one; keeping results around is
+the tip cache's job (tip_cache.py).
+
+Author: RecruitEM Team
+"""
+
+import threading
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Result of an async flight whose leader was cancelled; waiters retry
+_ABANDONED = object()
+
+class _Flight:
+    """One in-flight threaded call"""
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time and shares its outcome
+
+    Attributes:
+        calls: Calls actually made (one per flight)
+        shared: Callers served by another caller's flight (calls saved)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._async_flights: Dict[Tuple[object, Hashable], object] = {}
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> Tuple[T, bool]:
+        """
+        Call func() unless a call for key is already running in another thread
+
+        Returns:
+            (result, shared): shared is True when the result came from
+            another caller's call
+
+        Raises:
+            The exception of the call, for every caller that shared it
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.calls += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = func()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result, False
+
+    async def do_async(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Await func() unless a call for key is already in flight on this event loop
+
+        Waiting callers are shielded from each other: cancelling one
+        doesn't cancel the shared call, and if the caller making it is
+        cancelled, a waiting caller takes over.
+
+        Returns:
+            (result, shared), as for do()
+        """
+        import asyncio
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key)
+        while True:
+            with self._lock:
+                future = self._async_flights.get(flight_key)
+                leader = future is None
+                if leader:
+                    future = self._async_flights[flight_key] = loop.create_future()
+                    self.calls += 1
+                else:
+                    self.shared += 1
+
+            if not leader:
+                result = await asyncio.shield(future)
+                if result is _ABANDONED:
+                    with self._lock:
+                        self.shared -= 1
+                    continue
+                return result, True
+
+            try:
+                result = await func()
+            except asyncio.CancelledError:
+                future.set_result(_ABANDONED)
+                raise
+            except BaseException as e:
+                future.set_exception(e)
+                future.exception()   # retrieved: no "never retrieved" warning without waiters
+                raise
+            else:
+                future.set_result(result)
+            finally:
+                with self._lock:
+                    del self._async_flights[flight_key]
+            return result, False
+
+    def stats(self) -> Dict[str, int]:
+        """Calls made, callers that shared one, and flights running now"""
+        with self._lock:
+            return {"calls": self.calls, "shared": self.shared,
+                    "in_flight": len(self._flights) + len(self._async_flights)}
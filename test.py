@@ -3,7 +3,64 @@
 Test script to demonstrate the orchestrator functionality
 """
 
-from orchestrator import orchestrate
+import asyncio
+import contextlib
+import io
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+from orchestrator import (
+    orchestrate, orchestrate_many, orchestrate_many_async, StatusUpdate,
+    ClientHolder, generate_prep_tip, set_anthropic_client, reset_anthropic_clients,
+    get_tip_cache, set_tip_cache, JOB_DESCRIPTIONS, INTERVIEW_TIPS_DB,
+    rag_search, add_interview_tip, remove_interview_tip, semantic_search,
+    set_event_sink, console_sink, load_templates, set_templates,
+    get_job_catalog, set_job_catalog, get_test_link, TEST_LINKS,
+    DataSnapshot, get_data_snapshot, use_data_snapshot, AGENTS, TIMINGS, preload,
+    generate_prep_tip_async, get_claude_guard, set_claude_guard, TIP_FLIGHTS,
+    generate_prep_tips_bulk, orchestrate_many_bulk, router_agent, interview_agent, orchestrate_columns,
+)
+from fakes import FakeAsyncClient, FakeClient, StubAnthropicServer
+from tip_cache import TipCache, SQLiteTipStore, tip_key
+from retrieval import BM25Index, tokenize
+from keyword_matcher import KeywordMatcher
+from events import JSONLinesSink, NullSink
+from message_templates import MessageTemplate, TemplateSet, DEFAULT_TEMPLATES
+from candidate import CandidateRecord, shared_job
+from agent_registry import AgentRegistry, normalize_status
+from catalog import CachedCatalog, DictCatalog, Job, SQLiteCatalog
+from data_reload import DataReloader
+from instrumentation import Histogram, Profile
+from parallel import run_parallel
+import message_batches
+from message_batches import BatchTimeout, run_message_batch
+from resilience import CallGuard, CircuitBreaker, CircuitOpenError, RetryPolicy
+from single_flight import SingleFlight
+from pipeline import run_pipeline, read_updates
+from server import OrchestratorServer
+from loadgen import run_load
+from work_queue import WorkQueue, run_workers
+from dedup import BloomFilter, Deduplicator, event_key
+
+@contextlib.contextmanager
+def temporary_jobs(count):
+    """Add `count` jobs with distinct descriptions; yields their IDs"""
+    job_ids = [f"TMP{i}" for i in range(count)]
+    for i, job_id in enumerate(job_ids):
+        JOB_DESCRIPTIONS[job_id] = {"title": "Python Developer", "description": f"Python role number {i}."}
+    try:
+        yield job_ids
+    finally:
+        for job_id in job_ids:
+            del JOB_DESCRIPTIONS[job_id]
 
 def test_assessment():
     """Test assessment agent"""
@@ -67,6 +124,1444 @@ def test_different_jobs():
     
     print()
 
+def test_orchestrate_many():
+    """Test batch orchestration matches single-candidate orchestration"""
+    print("=" * 70)
+    print("TEST 4: Batch Orchestration")
+    print("=" * 70)
+    
+    updates = [
+        StatusUpdate("Ana", "ana@example.com", "Interview", "J456"),
+        StatusUpdate("Ben", "ben@example.com", "Assessment", "J123"),
+        ("Cy", "cy@example.com", "Interview", "J456"),
+        ("Di", "di@example.com", "Assessment", "UNKNOWN"),
+    ]
+    
+    states = orchestrate_many(updates)
+    
+    assert [s["candidate_name"] for s in states] == ["Ana", "Ben", "Cy", "Di"]
+    assert [s["metadata"]["agent"] for s in states] == ["interview", "assessment", "interview", "assessment"]
+    for update, state in zip(updates, states):
+        assert state["output_message"] == orchestrate(*update)
+    
+    print("\n[OK] Batch results match orchestrate() in input order\n")
+
+def test_orchestrate_many_async():
+    """Test async batch runs Claude tips concurrently under the semaphore"""
+    print("=" * 70)
+    print("TEST 5: Async Batch Orchestration")
+    print("=" * 70)
+    
+    latency = 0.05
+    client = FakeAsyncClient(latency=latency)
+    
+    # Distinct jobs so every interview tip misses the tip cache
+    with temporary_jobs(20) as job_ids:
+        updates = [("Candidate", f"c{i}@example.com", "Interview", job_id) for i, job_id in enumerate(job_ids)]
+        updates += [("Candidate", f"a{i}@example.com", "Assessment", "J456") for i in range(5)]
+        
+        start = time.perf_counter()
+        states = asyncio.run(orchestrate_many_async(updates, use_claude=True, max_concurrency=10, client=client))
+        elapsed = time.perf_counter() - start
+    
+    assert client.calls == 20, "only interview candidates should reach the client"
+    assert client.peak_in_flight == 10
+    assert elapsed < 20 * latency / 3, f"expected concurrent tips, took {elapsed:.2f}s"
+    assert all("Fake tip" in s["output_message"] for s in states[:20])
+    assert states[20]["output_message"] == orchestrate(*updates[20])
+    
+    print(f"\n[OK] 20 Claude tips in {elapsed:.2f}s (serial: {20 * latency:.2f}s)\n")
+
+def test_client_reuse():
+    """Test the shared Claude client is built once and reused"""
+    print("=" * 70)
+    print("TEST 6: Shared Claude Client")
+    print("=" * 70)
+    
+    created = []
+    def factory():
+        time.sleep(0.01)   # widen the race window
+        created.append(object())
+        return created[-1]
+    
+    holder = ClientHolder(factory)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(holder.get())) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(created) == 1, "concurrent first use must build one client"
+    assert all(client is created[0] for client in results)
+    holder.close()
+    assert holder.get() is not created[0], "close() should drop the client"
+    
+    fake = FakeClient()
+    set_anthropic_client(fake)
+    try:
+        for i in range(3):
+            generate_prep_tip(f"Python role {i}", use_claude=True)
+        assert fake.calls == 3
+    finally:
+        reset_anthropic_clients()
+    
+    print("\n[OK] One client built under contention; tips reuse it\n")
+
+def test_tip_cache():
+    """Test Claude tips are generated once per job and cached on disk"""
+    print("=" * 70)
+    print("TEST 7: Prep Tip Cache")
+    print("=" * 70)
+    
+    fake = FakeClient()
+    set_anthropic_client(fake)
+    set_tip_cache(TipCache())
+    try:
+        updates = make_updates_for_jobs(10000, ["J123", "J456", "J789", "J101"], status="Interview")
+        with contextlib.redirect_stdout(io.StringIO()):
+            orchestrate_many(updates, use_claude=True)
+        stats = get_tip_cache().stats()
+        assert fake.calls == 4, f"expected 4 API calls, got {fake.calls}"
+        assert stats["misses"] == 4 and stats["hits"] == 9996, stats
+    finally:
+        reset_anthropic_clients()
+        set_tip_cache(TipCache())
+    
+    now = [1000.0]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tips.sqlite3")
+        store = SQLiteTipStore(path, ttl_seconds=60, max_entries=2, clock=lambda: now[0])
+        cache = TipCache(store=store)
+        for job in ("a", "b", "c"):
+            now[0] += 1
+            cache.put(tip_key("model", "template", job), f"tip {job}")
+        assert len(store) == 2, "size cap should evict the least recently used tip"
+        store.close()
+        
+        # A fresh process sees the persisted tips until they expire
+        store = SQLiteTipStore(path, ttl_seconds=60, clock=lambda: now[0])
+        cache = TipCache(store=store)
+        assert cache.get(tip_key("model", "template", "c")) == "tip c"
+        assert cache.stats()["disk_hits"] == 1
+        now[0] += 120
+        assert store.get(tip_key("model", "template", "b")) is None
+        store.close()
+    
+    print("\n[OK] 10,000 interview candidates across 4 jobs cost 4 API calls\n")
+
+def test_bm25_retrieval():
+    """Test BM25 ranking, incremental updates and the rag_search contract"""
+    print("=" * 70)
+    print("TEST 8: BM25 Retrieval")
+    print("=" * 70)
+    
+    assert tokenize("The FastAPI and Python-3 APIs") == ["fastapi", "python", "3", "apis"]
+    
+    index = BM25Index.from_documents([
+        ("sql", "sql joins and indexing strategies"),
+        ("react", "react hooks and state management"),
+        ("python", "python async await and python typing"),
+    ])
+    assert [doc for doc, _ in index.search("python async", top_k=3)] == ["python"]
+    assert {doc for doc, _ in index.search("state indexing", top_k=2)} == {"sql", "react"}
+    assert index.remove("python") and index.search("python") == []
+    index.add("sql", "window functions")   # replaces the old document
+    assert index.search("joins") == [] and index.search("window")[0][0] == "sql"
+    
+    # Equal scores rank in insertion order, whatever the hash seed
+    ties = "from retrieval import BM25Index; print([d for d, _ in BM25Index.from_documents(" \
+           "zip('zqmab', ['java', 'rust', 'go', 'kotlin', 'scala'])).search('scala go rust java kotlin', top_k=4)])"
+    for seed in ("1", "2", "3"):
+        completed = subprocess.run([sys.executable, "-c", ties], capture_output=True, text=True, check=True,
+                                   env={**os.environ, "PYTHONHASHSEED": seed},
+                                   cwd=os.path.dirname(os.path.abspath(__file__)))
+        assert completed.stdout.strip() == "['z', 'q', 'm', 'a']", completed.stdout
+    
+    assert rag_search("kubernetes deployments") == INTERVIEW_TIPS_DB["kubernetes"]
+    assert rag_search("J123").startswith("Python Developer: ")
+    assert rag_search("zzz").startswith("No specific tips found")
+    
+    add_interview_tip("terraform", "Explain how Terraform state and plan/apply work.")
+    try:
+        assert rag_search("terraform modules") == "Explain how Terraform state and plan/apply work."
+    finally:
+        assert remove_interview_tip("terraform")
+    assert rag_search("terraform").startswith("No specific tips found")
+    
+    print("\n[OK] Ranked retrieval with incremental add/remove\n")
+
+def test_vector_index():
+    """Test cosine top-k search, persistence and semantic rag_search"""
+    print("=" * 70)
+    print("TEST 9: Vector Index")
+    print("=" * 70)
+    
+    try:
+        import numpy as np
+        from vector_index import VectorIndex, HashingEmbedder
+    except ImportError:
+        print("\n[SKIP] NumPy is not installed\n")
+        return
+    
+    embedder = HashingEmbedder(dim=64)
+    assert np.allclose(embedder.embed(["python"]), embedder.embed(["python"]))
+    
+    index = VectorIndex(embedder)
+    index.add(["x", "y", "z"], vectors=np.eye(3, 64, dtype=np.float32))
+    assert index.matrix.dtype == np.float32 and index.matrix.flags.c_contiguous
+    queries = np.zeros((2, 64), dtype=np.float32)
+    queries[0, 1] = 1.0
+    queries[1, :2] = [0.6, 0.8]
+    results = index.search_vectors(queries, top_k=2)
+    assert [doc for doc, _ in results[0]][:1] == ["y"]
+    assert [doc for doc, _ in results[1]] == ["y", "x"]
+    
+    assert index.remove("x") and "x" not in index and len(index) == 2
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "kb")
+        index.save(path)
+        loaded = VectorIndex.load(path, embedder=embedder)
+        assert isinstance(loaded.matrix, np.memmap)
+        assert loaded.search_vectors(queries[:1], top_k=1)[0][0][0] == "y"
+        loaded.add(["w"], vectors=np.ones((1, 64), dtype=np.float32))   # copies out of the mmap
+        assert len(loaded) == 3
+    
+    # Requests never build the index: not for unknown job IDs, not for the fallback
+    class ListingCatalog(DictCatalog):
+        listed = 0
+        def jobs(self):
+            ListingCatalog.listed += 1
+            return super().jobs()
+    default_catalog = get_job_catalog()
+    set_job_catalog(ListingCatalog(JOB_DESCRIPTIONS, TEST_LINKS))
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            orchestrate("Ana", "ana@example.com", "Interview", "NO-SUCH-JOB")
+            assert rag_search("reactjs").startswith("No specific tips found")
+        assert ListingCatalog.listed == 0
+
+        # "reactjs" shares no token with the tips DB, but is close to "react"
+        assert semantic_search("reactjs", top_k=1)[0][0] == "tip:react"
+        assert ListingCatalog.listed == 1
+        assert rag_search("reactjs") == INTERVIEW_TIPS_DB["react"]
+    finally:
+        set_job_catalog(default_catalog)
+    
+    print("\n[OK] Batched cosine search, mmap load and semantic fallback\n")
+
+def test_keyword_matcher():
+    """Test one-pass keyword matching, word boundaries and ranking"""
+    print("=" * 70)
+    print("TEST 10: Keyword Matcher")
+    print("=" * 70)
+    
+    matcher = KeywordMatcher(["SQL", "PostgreSQL", "go", "react native", "react", "he", "hers"])
+    text = "PostgreSQL and SQL; React Native, React, sql. Go-getters ushers"
+    assert matcher.find_all(text) == [
+        (0, "PostgreSQL"), (15, "SQL"), (20, "react"), (20, "react native"), (34, "react"), (41, "SQL"), (46, "go")
+    ]
+    assert matcher.rank(text) == ["SQL", "react", "PostgreSQL", "react native", "go"]
+    assert matcher.best("nothing relevant") is None
+    
+    # Ranking is by frequency first, so a JD's dominant skill wins
+    jd = "Kubernetes operators in Python. Python services deployed to Kubernetes with Python tooling."
+    assert generate_prep_tip(jd) == INTERVIEW_TIPS_DB["python"]
+    
+    # The matcher is recompiled when the tips DB changes
+    add_interview_tip("terraform", "Explain how Terraform state and plan/apply work.")
+    try:
+        assert generate_prep_tip("Terraform and AWS") == "Explain how Terraform state and plan/apply work."
+    finally:
+        remove_interview_tip("terraform")
+    assert generate_prep_tip("Terraform and AWS").startswith("Study the job requirements")
+    
+    print("\n[OK] Whole-word keywords found in one pass and ranked deterministically\n")
+
+def test_event_sinks():
+    """Test structured, filtered and silent event output"""
+    print("=" * 70)
+    print("TEST 11: Event Sinks")
+    print("=" * 70)
+    
+    buffer = io.StringIO()
+    set_event_sink(JSONLinesSink(buffer))
+    try:
+        orchestrate("Ana", "ana@example.com", "Assessment", "J123")
+    finally:
+        set_event_sink(console_sink())
+    events = [json.loads(line) for line in buffer.getvalue().splitlines()]
+    names = [event["event"] for event in events]
+    assert names[0] == "workflow.start" and names[-1] == "workflow.done"
+    decision = events[names.index("router.decision")]
+    assert decision["agent"] == "assessment" and decision["level"] == "info"
+    assert events[names.index("tool.get_test_link")]["link"] == "https://assess.example.com/python"
+    
+    stream = io.StringIO()
+    set_event_sink(console_sink(level="warning", stream=stream))
+    try:
+        orchestrate("Ana", "ana@example.com", "Assessment", "NOPE")
+    finally:
+        set_event_sink(console_sink())
+    assert stream.getvalue().count("\n") == 1 and "Job ID 'NOPE' not found" in stream.getvalue()
+    
+    stdout = io.StringIO()
+    set_event_sink(NullSink())
+    try:
+        with contextlib.redirect_stdout(stdout):
+            orchestrate_many([("Ana", "ana@example.com", "Interview", "J456")])
+    finally:
+        set_event_sink(console_sink())
+    assert stdout.getvalue() == ""
+    
+    print("\n[OK] JSON-lines, level filtering and null sink\n")
+
+def test_message_templates():
+    """Test compiled templates, per-job partials and file overrides"""
+    print("=" * 70)
+    print("TEST 12: Message Templates")
+    print("=" * 70)
+    
+    template = MessageTemplate("Hi {name}, {{literal}} {role} at {name}'s {role}", "t")
+    assert template.slots == ("name", "role", "name", "role")
+    partial = template.partial(role="SRE")
+    assert partial.slots == ("name", "name") and partial.literals[1] == ", {literal} SRE at "
+    assert partial.render({"name": "Ana"}) == "Hi Ana, {literal} SRE at Ana's SRE"
+    
+    for bad in ("{name!r}", "{name:>10}", "{0}"):
+        try:
+            MessageTemplate(bad)
+            assert False, f"{bad} should be rejected"
+        except ValueError:
+            pass
+    
+    templates = TemplateSet(DEFAULT_TEMPLATES)
+    job = templates.for_job("assessment", job_title="Data Analyst", test_link="https://x")
+    assert job is templates.for_job("assessment", job_title="Data Analyst", test_link="https://x")
+    assert job.slots == ("candidate_name",)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        templates.save(tmp)
+        assert TemplateSet.from_directory(tmp).templates["interview"].literals == templates.templates["interview"].literals
+        
+        with open(os.path.join(tmp, "assessment.txt"), "w") as f:
+            f.write("Hello {candidate_name}: {job_title} test at {test_link}\n")
+        load_templates(tmp)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                message = orchestrate("Ana", "ana@example.com", "Assessment", "J123")
+            assert message == "Hello Ana: Python Developer test at https://assess.example.com/python"
+        finally:
+            set_templates(TemplateSet(DEFAULT_TEMPLATES))
+        
+        with open(os.path.join(tmp, "assessment.txt"), "w") as f:
+            f.write("Hello {candidate_name}, your salary is {salary}\n")
+        try:
+            TemplateSet.from_directory(tmp)
+            assert False, "unknown slots should be rejected"
+        except ValueError as e:
+            assert "salary" in str(e)
+    
+    print("\n[OK] Templates compile, cache per job and load from files\n")
+
+def test_run_parallel():
+    """Test the process-pool runner matches orchestrate_many() in both result orders"""
+    print("=" * 70)
+    print("TEST 13: Parallel Runner")
+    print("=" * 70)
+    
+    updates = make_updates_for_jobs(25, ["J123", "J456", "J789", "UNKNOWN"], "Interview")
+    updates += make_updates_for_jobs(25, ["J101", "J456"], "Assessment")
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = [state["output_message"] for state in orchestrate_many(updates)]
+    
+    results = list(run_parallel(updates, workers=2, chunk_size=7))
+    assert [index for index, _ in results] == list(range(50))
+    assert [state["output_message"] for _, state in results] == expected
+    
+    unordered = sorted(run_parallel(iter(updates), workers=2, chunk_size=7, ordered=False), key=lambda r: r[0])
+    assert [state["output_message"] for _, state in unordered] == expected
+    
+    # Workers use the parent's catalog, templates and snapshot, forked or spawned
+    import multiprocessing
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs = SQLiteCatalog(os.path.join(tmp, "jobs.db"))
+        jobs.add_jobs([("SQ1", "Data Engineer", "Spark and SQL pipelines.")])
+        jobs.set_test_links({"Data Engineer": "https://assess.example.com/data"})
+        default_catalog = get_job_catalog()
+        set_job_catalog(CachedCatalog(jobs))
+        set_templates(TemplateSet({**DEFAULT_TEMPLATES, "assessment": "{candidate_name}: {job_title} test {test_link}"}))
+        try:
+            sql_updates = make_updates_for_jobs(6, ["SQ1"], "Assessment")
+            for context in (None, multiprocessing.get_context("spawn")):
+                states = [state for _, state in run_parallel(sql_updates, workers=2, chunk_size=2, mp_context=context)]
+                assert states[5]["output_message"] == "Candidate 5: Data Engineer test https://assess.example.com/data"
+            jobs.close()
+            
+            use_data_snapshot(DataSnapshot.build({"SN1": {"title": "Snapshot Role", "description": "Go services."}},
+                                                 {}, INTERVIEW_TIPS_DB, version=7, vectors=False))
+            spawned = run_parallel(make_updates_for_jobs(2, ["SN1"], "Interview"), workers=1,
+                                   mp_context=multiprocessing.get_context("spawn"))
+            assert all(state["job_title"] == "Snapshot Role" for _, state in spawned)
+        finally:
+            use_data_snapshot(None)
+            set_job_catalog(default_catalog)
+            set_templates(TemplateSet(DEFAULT_TEMPLATES))
+    try:
+        pickle.dumps(SQLiteCatalog(":memory:"))
+        assert False, "an in-memory catalog can't be sent to a worker"
+    except ValueError:
+        pass
+    
+    print("\n[OK] 50 candidates across 2 worker processes, ordered and as-completed\n")
+
+def test_pipeline():
+    """Test the JSONL/CSV streaming pipeline and its command line"""
+    print("=" * 70)
+    print("TEST 14: Streaming Pipeline")
+    print("=" * 70)
+    
+    records = [
+        {"candidate_name": "Ana", "candidate_email": "ana@example.com", "status": "Interview", "job_id": "J456"},
+        {"candidate_name": "Ben", "candidate_email": "ben@example.com", "status": "Assessment", "job_id": "J123"},
+    ]
+    source = io.StringIO("\n".join([json.dumps(records[0]), "", "{not json", '{"candidate_name": "Cy"}',
+                                      json.dumps(records[1])]) + "\n")
+    sink = io.StringIO()
+    errors = []
+    stats = run_pipeline(source, sink, batch_size=1, on_error=lambda line, reason: errors.append(line))
+    
+    assert stats == (4, 2, 2) and errors == [3, 4]
+    results = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert [r["agent"] for r in results] == ["interview", "assessment"]
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert results[1]["message"] == orchestrate("Ben", "ben@example.com", "Assessment", "J123")
+    assert results[1]["metadata"]["test_link"] == "https://assess.example.com/python"
+    
+    csv_text = "job_id,status,candidate_name,candidate_email\nJ789,Interview,Di,di@example.com\n"
+    assert list(read_updates(io.StringIO(csv_text), "csv")) == [("Di", "di@example.com", "Interview", "J789")]
+    try:
+        list(read_updates(io.StringIO("[1, 2]\n")))
+        assert False, "non-object records should raise without an error handler"
+    except ValueError as e:
+        assert "line 1" in str(e)
+    
+    lines = "".join(json.dumps(r) + "\n" for r in records)
+    completed = subprocess.run([sys.executable, "-m", "pipeline"], input=lines, capture_output=True, text=True,
+                               cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+    assert [json.loads(line)["candidate_name"] for line in completed.stdout.splitlines()] == ["Ana", "Ben"]
+    assert "2 written, 0 skipped" in completed.stderr
+    
+    print("\n[OK] JSONL and CSV records stream through to one JSON result per line\n")
+
+def test_job_catalog():
+    """Test the SQLite catalog and read-through cache give the same results as the dicts"""
+    print("=" * 70)
+    print("TEST 15: Job Catalog")
+    print("=" * 70)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SQLiteCatalog.from_catalog(os.path.join(tmp, "jobs.db"), get_job_catalog(), TEST_LINKS)
+        store.add_jobs([("J900", "Data Analyst", "Junior Data Analyst role requiring SQL.")])
+        assert len(store) == 5
+        assert store.get("J456") == Job("J456", "Data Analyst", JOB_DESCRIPTIONS["J456"]["description"])
+        assert store.get("NOPE") is None and "NOPE" not in store
+        assert [job.job_id for job in store.jobs_with_title("Data Analyst")] == ["J456", "J900"]
+        assert [job.job_id for job in store.jobs(page_size=2)] == ["J101", "J123", "J456", "J789", "J900"]
+        assert store.test_link("DevOps Engineer") == TEST_LINKS["DevOps Engineer"]
+        
+        cached = CachedCatalog(store, max_entries=2)
+        for _ in range(3):
+            assert cached.get("J123").title == "Python Developer"
+            assert cached.get("NOPE") is None
+        assert cached.stats() == {"hits": 4, "misses": 2, "entries": 2}
+        cached.test_link("Data Analyst")
+        assert cached.stats()["entries"] == 2, "oldest entry should be evicted"
+        
+        updates = make_updates_for_jobs(8, ["J123", "J456", "J789", "UNKNOWN"], "Interview")
+        updates += make_updates_for_jobs(8, ["J101", "J123"], "Assessment")
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = [state["output_message"] for state in orchestrate_many(updates)]
+            set_job_catalog(cached)
+            try:
+                assert [state["output_message"] for state in orchestrate_many(updates)] == expected
+                assert orchestrate(*updates[0]) == expected[0]
+                assert rag_search("J900").startswith("Data Analyst: Junior")
+                assert get_test_link("Product Manager") == TEST_LINKS["Product Manager"]
+            finally:
+                set_job_catalog(DictCatalog(JOB_DESCRIPTIONS, TEST_LINKS))
+        store.close()
+    
+    print("\n[OK] SQLite catalog behind an LRU matches the inline dicts\n")
+
+def test_data_reload():
+    """Test hot reload from files and that running batches keep their snapshot"""
+    print("=" * 70)
+    print("TEST 16: Hot-Reloadable Data")
+    print("=" * 70)
+    
+    def write_json(path, data, mtime_ns):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        links_path = os.path.join(tmp, "test_links.json")
+        tips_path = os.path.join(tmp, "tips.json")
+        write_json(links_path, dict(TEST_LINKS, **{"Data Analyst": "https://new.example.com/data"}), 10**18)
+        write_json(tips_path, {"sql": "Explain window functions."}, 10**18)
+        
+        reloader = DataReloader(test_links=links_path, tips=tips_path, interval=0.01, vectors=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert reloader.check() and not reloader.check()
+            snapshot = get_data_snapshot()
+            try:
+                assert snapshot.version == 1 and len(snapshot.catalog) == len(JOB_DESCRIPTIONS)
+                message = orchestrate("Ana", "ana@example.com", "Assessment", "J456")
+                assert "https://new.example.com/data" in message
+                assert "Explain window functions." in orchestrate("Ben", "ben@example.com", "Interview", "J456")
+                try:
+                    add_interview_tip("go", "Know goroutines.")
+                    assert False, "tips in a snapshot are read-only"
+                except RuntimeError:
+                    pass
+                
+                # A broken file is reported and the current data stays
+                with open(tips_path, "w") as f:
+                    f.write("{broken")
+                assert not reloader.check() and "tips.json" in reloader.last_error
+                assert get_data_snapshot() is snapshot
+                
+                # A batch keeps the snapshot it started with, even if one is swapped in mid-way
+                newer = DataSnapshot.build(JOB_DESCRIPTIONS, {"Data Analyst": "https://newer.example.com"}, {},
+                                           vectors=False)
+                def updates():
+                    yield ("Ana", "ana@example.com", "Assessment", "J456")
+                    use_data_snapshot(newer)
+                    yield ("Ben", "ben@example.com", "Assessment", "J456")
+                states = orchestrate_many(updates())
+                assert all(s["metadata"]["test_link"] == "https://new.example.com/data" for s in states)
+                assert get_test_link("Data Analyst") == "https://newer.example.com"
+                use_data_snapshot(snapshot)
+                
+                # The background thread picks up edits
+                write_json(tips_path, {"sql": "Explain query plans."}, 2 * 10**18)
+                reloader.start()
+                deadline = time.monotonic() + 5
+                while reloader.version < 2 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                assert reloader.version == 2
+                assert "Explain query plans." in orchestrate("Cy", "cy@example.com", "Interview", "J456")
+            finally:
+                reloader.stop(restore=True)
+        assert get_data_snapshot() is None
+
+        # Reloading tips keeps an installed catalog, and embeds its jobs only once
+        class CountingCatalog(SQLiteCatalog):
+            listed = 0
+            def jobs(self, page_size=1000):
+                CountingCatalog.listed += 1
+                return super().jobs(page_size)
+
+        jobs = CountingCatalog(os.path.join(tmp, "jobs.db"))
+        jobs.add_jobs([("SQ1", "Data Engineer", "Spark and SQL pipelines.")])
+        jobs.set_test_links({"Data Engineer": "https://assess.example.com/data"})
+        default_catalog = get_job_catalog()
+        set_job_catalog(jobs)
+        write_json(tips_path, {"spark": "Explain shuffles."}, 3 * 10**18)
+        reloader = DataReloader(tips=tips_path)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                assert reloader.check()
+                message = orchestrate("Ana", "ana@example.com", "Assessment", "SQ1")
+                assert "Data Engineer" in message and "https://assess.example.com/data" in message
+                assert get_data_snapshot().catalog is jobs
+                listed = CountingCatalog.listed
+
+                write_json(tips_path, {"spark": "Explain partitioning."}, 4 * 10**18)
+                assert reloader.check()
+                assert "Explain partitioning." in orchestrate("Ben", "ben@example.com", "Interview", "SQ1")
+                assert CountingCatalog.listed == listed, "unchanged jobs should not be embedded again"
+                vectors = get_data_snapshot().vector_index
+                if vectors is not None:
+                    assert "job:SQ1" in vectors.ids() and "tip:spark" in vectors.ids()
+
+                # A links file replaces only the links
+                write_json(links_path, {"Data Engineer": "https://links.example.com/data"}, 10**18)
+                links_only = DataReloader(test_links=links_path, vectors=False)
+                assert links_only.check()
+                message = orchestrate("Cy", "cy@example.com", "Assessment", "SQ1")
+                assert "Data Engineer" in message and "https://links.example.com/data" in message
+        finally:
+            reloader.stop(restore=True)
+            set_job_catalog(default_catalog)
+            jobs.close()
+
+    print("\n[OK] Data files reload atomically; in-flight batches keep their snapshot\n")
+
+def test_agent_registry():
+    """Test status routing through the agent registry, including new stages and the fallback"""
+    print("=" * 70)
+    print("TEST 17: Agent Registry")
+    print("=" * 70)
+    
+    assert normalize_status("  Phone_Screen ") == normalize_status("phone-screen") == "phone screen"
+    registry = AgentRegistry()
+    registry.register("screening", lambda state, use_claude=False: state, statuses=["Screening", "Phone Screen"])
+    assert registry.route("PHONE_SCREEN") == "screening"
+    try:
+        registry.route("Hired")
+        assert False, "unknown statuses should raise without a fallback"
+    except ValueError:
+        pass
+    try:
+        registry.register("other", lambda state, use_claude=False: state, statuses=["screening"])
+        assert False, "a status can only route to one agent"
+    except ValueError:
+        pass
+
+    # A route resolved while register() runs doesn't land in the new cache
+    class RacingStatus(str):
+        def replace(self, *args):
+            if "review" not in registry:
+                registry.register("review", lambda state, use_claude=False: state, statuses=["Review"])
+            return str.replace(self, *args)
+    registry.set_fallback("screening")
+    assert registry.route(RacingStatus("Review")) == "screening"
+    assert registry.route("Review") == "review"
+    registry.unregister("review")
+    registry.set_fallback(None)
+
+    def offer_agent(state, use_claude=False):
+        state["output_message"] = f"Offer for {state['candidate_name']}: {state['job_title']}"
+        state["metadata"] = {"agent": "offer"}
+        return state
+    
+    AGENTS.register("offer", offer_agent, statuses=["Offer", "Offer Extended"])
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert orchestrate("Ana", "ana@example.com", "offer_extended", "J123") == "Offer for Ana: Python Developer"
+            updates = [("Ana", "ana@example.com", "Offer", "J123"), ("Ben", "ben@example.com", "Assessment", "J456"),
+                       ("Cy", "cy@example.com", "Withdrawn", "J456")]
+            states = orchestrate_many(updates)
+            assert [s["metadata"]["agent"] for s in states] == ["offer", "assessment", "interview"]
+            states = asyncio.run(orchestrate_many_async(updates))
+            assert [s["metadata"]["agent"] for s in states] == ["offer", "assessment", "interview"]
+
+            # The bulk runner drafts through the registered agents too, overrides included
+            interview = AGENTS.get("interview")
+            def plain_interviews(group, timestamp, use_claude=False):
+                for state in group:
+                    state["output_message"] = f"Interview for {state['candidate_name']}"
+                    state["metadata"] = {"agent": "interview"}
+            AGENTS.register("interview", interview.run, batch=plain_interviews)
+            try:
+                states = orchestrate_many_bulk(updates)
+            finally:
+                AGENTS.register(interview.name, interview.run, (), *interview[2:])
+            assert [s["output_message"] for s in states] == [
+                "Offer for Ana: Python Developer", states[1]["output_message"], "Interview for Cy"]
+            assert states[1]["metadata"]["agent"] == "assessment"
+            assert AGENTS.get("interview") == interview
+
+            # The bulk hook also works called on its own (no Claude key: keyword tips)
+            group = orchestrate_many([("Dee", "dee@example.com", "Interview", "J123")])
+            api_key = os.environ.pop("ANTHROPIC_API_KEY", None)
+            try:
+                interview.bulk(group, "2026-01-01T00:00:00")
+            finally:
+                if api_key is not None:
+                    os.environ["ANTHROPIC_API_KEY"] = api_key
+            assert group[0]["metadata"]["prep_tip"] == INTERVIEW_TIPS_DB["python"]
+
+            AGENTS.set_fallback(None)
+            try:
+                orchestrate("Cy", "cy@example.com", "Withdrawn", "J456")
+                assert False, "unknown statuses should raise without a fallback"
+            except ValueError:
+                pass
+    finally:
+        AGENTS.set_fallback("interview")
+        AGENTS.unregister("offer")
+    assert AGENTS.names() == ["assessment", "interview"]
+    
+    print("\n[OK] Statuses route through the registry; unknown ones use the configurable fallback\n")
+
+def test_stage_timings():
+    """Test per-stage latency histograms, attached timings and aggregation across runs"""
+    print("=" * 70)
+    print("TEST 18: Stage Timings")
+    print("=" * 70)
+    
+    histogram = Histogram()
+    for value in range(1, 10001):
+        histogram.add(value)
+    for percent in (50, 95, 99):
+        assert abs(histogram.percentile(percent) - percent * 100) <= percent * 100 * 0.04
+    assert histogram.percentile(100) == 10000 and histogram.summary()["min_ns"] == 1
+    other = Histogram()
+    other.add(20000)
+    histogram.merge(other)
+    assert histogram.count == 10001 and histogram.max == 20000
+    
+    updates = make_updates_for_jobs(6, ["J123", "J456"], "Interview")
+    updates += make_updates_for_jobs(6, ["J789"], "Assessment")
+    assert not TIMINGS.enabled
+    with contextlib.redirect_stdout(io.StringIO()):
+        with TIMINGS.run(attach=True) as profile:
+            assert TIMINGS.enabled
+            states = orchestrate_many(updates)
+            orchestrate_many(updates)
+            orchestrate("Ana", "ana@example.com", "Interview", "J123")
+            asyncio.run(orchestrate_many_async(updates))
+        assert not TIMINGS.enabled
+        untimed = orchestrate_many(updates[:1])
+    
+    stats = profile.to_dict()
+    for stage in ("router", "get_test_link", "rag_search", "generate_prep_tip", "draft_message",
+                  "agent.interview", "orchestrate", "orchestrate_many"):
+        assert stats[stage]["count"] > 0, stage
+    assert stats["orchestrate_many"]["count"] == 3, "batches aggregate into one profile"
+    assert stats["draft_message"]["count"] == 3 * len(updates) + 1
+    timings = states[0]["metadata"]["timings_ns"]
+    assert timings is states[-1]["metadata"]["timings_ns"], "one timing dict per batch"
+    assert timings["orchestrate_many"] >= timings["draft_message"] > 0
+    assert "timings_ns" not in untimed[0]["metadata"]
+    
+    assert json.loads(profile.to_json())["rag_search"]["p99_ns"] >= stats["rag_search"]["p50_ns"]
+    assert profile.report().splitlines()[0].split()[:3] == ["stage", "count", "total"]
+    combined = Profile()
+    combined.merge(profile)
+    combined.merge(profile)
+    assert combined.to_dict()["orchestrate"]["count"] == 2
+    
+    print("\n" + profile.report())
+    print("\n[OK] Stage spans aggregate into p50/p95/p99 histograms when enabled\n")
+
+# Modules the assessment-only path must not load
+COLD_PATH_EXCLUDED = ("asyncio", "anthropic", "numpy", "sqlite3", "hashlib", "ssl", "concurrent.futures")
+
+def test_cold_start():
+    """Test the assessment-only cold path skips the heavy imports and preload() warms the rest"""
+    print("=" * 70)
+    print("TEST 19: Cold Start and preload()")
+    print("=" * 70)
+    
+    code = (
+        "import orchestrator\n"
+        "import json, sys\n"
+        "from events import NullSink\n"
+        "orchestrator.set_event_sink(NullSink())\n"
+        "orchestrator.orchestrate('Ana', 'ana@example.com', 'Assessment', 'J123')\n"
+        f"print(json.dumps([m for m in {COLD_PATH_EXCLUDED!r} if m in sys.modules]))\n"
+    )
+    # The import time budget is checked by `python3 bench.py cold_start`
+    completed = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                               capture_output=True, text=True, check=True)
+    loaded = json.loads(completed.stdout)
+    assert loaded == [], f"assessment path imported {loaded}"
+    
+    set_anthropic_client(FakeClient())
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            loaded = preload(semantic=False)
+    finally:
+        reset_anthropic_clients()
+    assert loaded == {"caches": True, "claude": True, "semantic": False, "asyncio": True}, loaded
+    assert "asyncio" in sys.modules and "hashlib" in sys.modules
+    
+    print("\n[OK] Assessment cold path skips asyncio/anthropic/NumPy/SQLite; preload() loads them\n")
+
+def test_claude_resilience():
+    """Test timeouts, retries and the circuit breaker bound tip latency when Claude is slow or failing"""
+    print("=" * 70)
+    print("TEST 20: Claude Timeouts, Retries and Circuit Breaker")
+    print("=" * 70)
+    
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=10, clock=lambda: now[0])
+    breaker.record_failure()
+    assert breaker.allow() and breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+    now[0] = 10.0
+    assert breaker.allow() and not breaker.allow(), "one probe at a time when half-open"
+    breaker.record_failure()
+    assert breaker.state == "open", "a failed probe reopens the breaker"
+    now[0] = 20.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    
+    delays = []
+    guard = CallGuard(RetryPolicy(attempts=3, timeout=1.0, base_delay=0.1, max_delay=0.15), sleep=delays.append)
+    outcomes = [TimeoutError("slow"), ConnectionError("reset"), "ok"]
+    
+    def flaky(timeout):
+        assert timeout == 1.0
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+    
+    assert guard.call(flaky) == "ok"
+    assert len(delays) == 2 and 0 <= delays[0] <= 0.1 and 0 <= delays[1] <= 0.15
+    try:
+        guard.call(lambda timeout: int("not a number"))
+        assert False, "non-retryable errors should be raised at once"
+    except ValueError:
+        pass
+    stats = guard.stats()
+    assert (stats["calls"], stats["attempts"], stats["retries"], stats["breaker"]) == (2, 4, 2, "closed"), stats
+
+    # An open breaker rejects calls without making them
+    called = []
+    open_guard = CallGuard(breaker=CircuitBreaker(failure_threshold=1, cooldown=10, clock=lambda: now[0]))
+    open_guard.breaker.record_failure()
+    try:
+        open_guard.call(called.append)
+        assert False, "an open breaker should reject the call"
+    except CircuitOpenError:
+        pass
+    assert called == [] and open_guard.stats()["rejected"] == 1
+
+    try:
+        from anthropic import Anthropic
+    except ImportError:
+        Anthropic = None
+    
+    saved_guard = get_claude_guard()
+    set_tip_cache(TipCache())
+    try:
+        if Anthropic is None:
+            print("\n[SKIP] anthropic is not installed; local server checks skipped")
+        else:
+            with StubAnthropicServer(delay=2.0) as server:
+                set_anthropic_client(Anthropic(api_key="stub-key", base_url=server.url, max_retries=0))
+                policy = RetryPolicy(attempts=2, timeout=0.2, base_delay=0.05, max_delay=0.05)
+                set_claude_guard(CallGuard(policy, CircuitBreaker(failure_threshold=3, cooldown=60)))
+                
+                # Slow API: each try times out, then the breaker opens
+                latencies = []
+                with contextlib.redirect_stdout(io.StringIO()):
+                    for i in range(20):
+                        start = time.perf_counter()
+                        tip = generate_prep_tip(f"Python role {i} with FastAPI", use_claude=True)
+                        latencies.append(time.perf_counter() - start)
+                        assert tip == INTERVIEW_TIPS_DB["python"], "falls back to the keyword tip"
+                bound = policy.max_elapsed()
+                assert max(latencies) < bound + 0.5, (max(latencies), bound)
+                assert max(latencies[3:]) < 0.05, "open breaker skips the API"
+                assert server.requests == 3 and get_claude_guard().stats()["rejected"] == 18
+                print(f"\n   slow API (2 s): max {max(latencies) * 1e3:.0f} ms (bound {bound * 1e3:.0f} ms), "
+                      f"open-breaker calls max {max(latencies[3:]) * 1e6:.0f} us, {server.requests} requests")
+                
+                # Failing API: 5xx is retried, then a probe after the cooldown recovers
+                server.delay = 0
+                server.status = 503
+                set_claude_guard(CallGuard(policy, CircuitBreaker(failure_threshold=2, cooldown=0.2)))
+                with contextlib.redirect_stdout(io.StringIO()):
+                    generate_prep_tip("Failing role 1", use_claude=True)
+                    generate_prep_tip("Failing role 2", use_claude=True)
+                assert get_claude_guard().stats()["retries"] == 1 and get_claude_guard().breaker.state == "open"
+                server.status = 200
+                server.script.append((500, 0))
+                time.sleep(0.25)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    assert generate_prep_tip("Recovered role", use_claude=True) != "Stub tip from the local server."
+                time.sleep(0.25)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    assert generate_prep_tip("Recovered role", use_claude=True) == "Stub tip from the local server."
+                assert get_claude_guard().breaker.state == "closed"
+                
+                # 4xx means the API answered: no retry
+                server.status = 400
+                with contextlib.redirect_stdout(io.StringIO()):
+                    generate_prep_tip("Bad request role", use_claude=True)
+                assert get_claude_guard().stats()["retries"] == 1
+        
+        # Async path: the guard enforces the timeout even for a client that ignores it
+        set_claude_guard(CallGuard(RetryPolicy(attempts=2, timeout=0.05, base_delay=0.01),
+                                   CircuitBreaker(failure_threshold=1, cooldown=60)))
+        slow = FakeAsyncClient(latency=5.0)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            tip = asyncio.run(generate_prep_tip_async("Python role", use_claude=True, client=slow))
+        elapsed = time.perf_counter() - start
+        assert tip == INTERVIEW_TIPS_DB["python"] and elapsed < 1.0, elapsed
+        assert slow.calls == 1, "threshold 1: the first timeout opens the breaker"
+    finally:
+        set_claude_guard(saved_guard)
+        reset_anthropic_clients()
+        set_tip_cache(TipCache())
+    
+    print("\n[OK] Slow and failing APIs fall back within the retry budget; the breaker skips them\n")
+
+def test_request_coalescing():
+    """Test concurrent identical tip requests share one Claude call, threaded and async"""
+    print("=" * 70)
+    print("TEST 21: Request Coalescing")
+    print("=" * 70)
+    
+    flights = SingleFlight()
+    barrier = threading.Barrier(8)
+    outcomes = []
+    
+    def failing():
+        time.sleep(0.1)
+        raise ConnectionError("upstream down")
+    
+    def caller():
+        barrier.wait()
+        try:
+            flights.do("key", failing)
+        except ConnectionError as e:
+            outcomes.append(str(e))
+    
+    threads = [threading.Thread(target=caller) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert outcomes == ["upstream down"] * 8, "the error is shared too"
+    assert flights.stats() == {"calls": 1, "shared": 7, "in_flight": 0}, flights.stats()
+    
+    async def cancelled_leader():
+        started = asyncio.Event()
+        
+        async def slow():
+            started.set()
+            await asyncio.sleep(10)
+        
+        async def fast():
+            return "fresh"
+        
+        leader = asyncio.ensure_future(flights.do_async("async-key", slow))
+        await started.wait()
+        follower = asyncio.ensure_future(flights.do_async("async-key", fast))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await follower
+    
+    assert asyncio.run(cancelled_leader()) == ("fresh", False), "a waiter takes over from a cancelled leader"
+    
+    fake = FakeClient(latency=0.1)
+    set_anthropic_client(fake)
+    set_tip_cache(TipCache())
+    shared_before = TIP_FLIGHTS.shared
+    tips = []
+    barrier = threading.Barrier(16)
+    
+    def interview_tip():
+        barrier.wait()
+        tips.append(generate_prep_tip(JOB_DESCRIPTIONS["J123"]["description"], use_claude=True))
+    
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            threads = [threading.Thread(target=interview_tip) for _ in range(16)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        assert fake.calls == 1 and len(set(tips)) == 1 and len(tips) == 16
+        assert TIP_FLIGHTS.shared - shared_before == 15
+        print(f"\n   16 threads, same job: {fake.calls} Claude call, {TIP_FLIGHTS.shared - shared_before} coalesced")
+        
+        set_tip_cache(TipCache())
+        async_client = FakeAsyncClient(latency=0.05)
+        updates = make_updates_for_jobs(60, ["J123", "J456", "J789"], "Interview")
+        log = io.StringIO()
+        set_event_sink(JSONLinesSink(log, level="info"))
+        try:
+            asyncio.run(orchestrate_many_async(updates, use_claude=True, max_concurrency=64, client=async_client))
+            orchestrate_many(updates[:6], use_claude=True)
+        finally:
+            set_event_sink(console_sink())
+        assert async_client.calls == 3, async_client.calls
+        done = [record for record in map(json.loads, log.getvalue().splitlines()) if record["event"] == "batch.done"]
+        assert (done[0]["claude_calls"], done[0]["tips_coalesced"], done[0]["tips_saved"]) == (3, 57, 57), done[0]
+        assert (done[1]["claude_calls"], done[1]["tips_cached"]) == (0, 6), done[1]
+        print(f"   async batch of 60 across 3 jobs: {done[0]['claude_calls']} Claude calls, "
+              f"{done[0]['tips_saved']} saved")
+    finally:
+        reset_anthropic_clients()
+        set_tip_cache(TipCache())
+    
+    print("\n[OK] Concurrent callers share one in-flight tip; batches report the calls saved\n")
+
+def test_message_batches():
+    """Test bulk interview tips through the Message Batches API, against a local stand-in"""
+    print("=" * 70)
+    print("TEST 22: Message Batches Bulk Mode")
+    print("=" * 70)
+
+    # Polls skip the call wrapper and ride out errors; giving up cancels
+    # what still runs and keeps the results of batches that ended
+    class FlakyBatches:
+        def __init__(self):
+            self.created, self.polls, self.canceled = 0, 0, []
+        def create(self, requests, timeout=None):
+            self.created += 1
+            return SimpleNamespace(id=f"b{self.created - 1}")
+        def retrieve(self, batch_id):
+            self.polls += 1
+            if self.polls <= 2:
+                raise ConnectionError("connection reset")
+            return SimpleNamespace(processing_status="ended" if batch_id == "b0" else "in_progress")
+        def results(self, batch_id):
+            message = SimpleNamespace(content=[SimpleNamespace(text="tip a")])
+            return [SimpleNamespace(custom_id="a", result=SimpleNamespace(type="succeeded", message=message))]
+        def cancel(self, batch_id):
+            self.canceled.append(batch_id)
+
+    flaky = FlakyBatches()
+    client = SimpleNamespace(messages=SimpleNamespace(batches=flaky))
+    guarded, errors, now = [], [], [0.0]
+    def call(func):
+        guarded.append(func)
+        return func(None)
+    def sleep(seconds):
+        now[0] += seconds
+    requests = {"a": {"model": "m"}, "b": {"model": "m"}}
+    original_max = message_batches.MAX_BATCH_REQUESTS
+    message_batches.MAX_BATCH_REQUESTS = 1
+    try:
+        run_message_batch(client, requests, poll_interval=1, max_wait=10, call=call,
+                          on_error=lambda batch_id, e: errors.append(batch_id), sleep=sleep, clock=lambda: now[0])
+        assert False, "b1 never ends"
+    except BatchTimeout as e:
+        assert e.texts == {"a": "tip a"}
+    finally:
+        message_batches.MAX_BATCH_REQUESTS = original_max
+    assert len(guarded) == 2, "only the submissions go through the call wrapper"
+    assert errors == ["b0", "b1"] and flaky.canceled == ["b1"]
+
+    try:
+        from anthropic import Anthropic
+    except ImportError:
+        print("\n[SKIP] anthropic is not installed; message batch checks skipped\n")
+        return
+    
+    set_tip_cache(TipCache())
+    try:
+        with StubAnthropicServer() as server, temporary_jobs(3) as job_ids:
+            server.batch_polls_until_done = 3
+            JOB_DESCRIPTIONS[job_ids[2]]["description"] = "Python role that the batch rejects."
+            server.batch_fail_on.add("the batch rejects")
+            client = Anthropic(api_key="stub-key", base_url=server.url, max_retries=0)
+            
+            # Polled until it ends; one request per distinct job description
+            polls = []
+            texts = run_message_batch(client, {"a": {"model": "m", "max_tokens": 8,
+                                                     "messages": [{"role": "user", "content": "Python"}]}},
+                                      poll_interval=0, on_poll=lambda batch_id, status: polls.append(status))
+            assert polls == ["in_progress", "in_progress", "ended"] and texts["a"].startswith("Batch tip:")
+            
+            updates = make_updates_for_jobs(30, job_ids, "Interview") + make_updates_for_jobs(4, ["J456"], "Assessment")
+            log = io.StringIO()
+            set_event_sink(JSONLinesSink(log, level="info"))
+            try:
+                states = orchestrate_many_bulk(updates, client=client, poll_interval=0.01)
+            finally:
+                set_event_sink(console_sink())
+            assert len(server.batches) == 2 and server.batch_requests == 1 + 3, server.batch_requests
+            for state in states[:30]:
+                tip = state["metadata"]["prep_tip"]
+                if state["job_id"] == job_ids[2]:
+                    assert tip == INTERVIEW_TIPS_DB["python"], "errored requests get the keyword tip"
+                else:
+                    assert tip.startswith("Batch tip:") and tip in state["output_message"]
+            assert all(state["metadata"]["agent"] == "assessment" for state in states[30:])
+            done = [record for record in map(json.loads, log.getvalue().splitlines()) if record["event"] == "batch.done"][0]
+            assert (done["claude_calls"], done["tips_coalesced"], done["interview"]) == (2, 27, 30), done
+            
+            # Successful tips are cached; nothing is submitted for them again
+            with contextlib.redirect_stdout(io.StringIO()):
+                tips = generate_prep_tips_bulk([JOB_DESCRIPTIONS[job_id]["description"] for job_id in job_ids],
+                                               client=client, poll_interval=0)
+            assert len(server.batches) == 3 and server.batch_requests == 5 and len(tips) == 3
+            
+            # A batch that doesn't end in time is cancelled; every tip falls back
+            server.batch_polls_until_done = 1000
+            set_tip_cache(TipCache())
+            with contextlib.redirect_stdout(io.StringIO()):
+                tips = generate_prep_tips_bulk(["SQL reporting role", "React UI role"],
+                                               client=client, poll_interval=0.01, max_wait=0.05)
+            assert tips == {"SQL reporting role": INTERVIEW_TIPS_DB["sql"], "React UI role": INTERVIEW_TIPS_DB["react"]}, tips
+            assert server.batches["msgbatch_stub_4"].get("canceled")
+            print(f"\n   34 updates, 3 jobs: {len(server.batches)} batches, {server.batch_requests} batch requests, "
+                  f"{server.batch_polls} polls in all")
+    finally:
+        set_tip_cache(TipCache())
+    
+    print("\n[OK] Bulk mode sends one request per distinct job; failures fall back to keyword tips\n")
+
+def test_http_server():
+    """Test the HTTP server: endpoints, keep-alive, micro-batching and the load generator"""
+    print("=" * 70)
+    print("TEST 23: HTTP Server with Keep-Alive and Micro-Batching")
+    print("=" * 70)
+    
+    async def request(reader, writer, method, path, body=None, headers=""):
+        payload = b"" if body is None else (body if isinstance(body, bytes) else json.dumps(body).encode())
+        writer.write(f"{method} {path} HTTP/1.1\r\nHost: test\r\n{headers}"
+                     f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload)
+        status = int((await reader.readline()).split()[1])
+        response_headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.decode().partition(":")
+            response_headers[name.lower()] = value.strip()
+        data = json.loads(await reader.readexactly(int(response_headers["content-length"])))
+        return status, response_headers, data
+    
+    sarah = {"candidate_name": "Sarah", "candidate_email": "sarah@example.com", "status": "Assessment", "job_id": "J123"}
+    mike = {"candidate_name": "Mike", "candidate_email": "mike@example.com", "status": "Interview", "job_id": "J456"}
+    
+    async def scenario():
+        async with OrchestratorServer(port=0, batch_window_ms=20) as server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            status, headers, result = await request(reader, writer, "POST", "/orchestrate", mike)
+            expected = orchestrate_many([StatusUpdate(**mike)])[0]
+            assert status == 200 and headers["connection"] == "keep-alive"
+            assert result["agent"] == "interview" and result["message"] == expected["output_message"]
+            
+            status, _, result = await request(reader, writer, "POST", "/orchestrate/batch", [mike, sarah, mike])
+            assert status == 200 and [r["candidate_name"] for r in result["results"]] == ["Mike", "Sarah", "Mike"]
+            assert result["results"][1]["metadata"]["test_link"] == TEST_LINKS["Python Developer"]
+            
+            # Errors are answered on the same connection
+            assert (await request(reader, writer, "POST", "/orchestrate", b"{not json"))[0] == 400
+            status, _, error = await request(reader, writer, "POST", "/orchestrate/batch", [sarah, {"job_id": "J1"}])
+            assert status == 400 and error["error"].startswith("update 1: missing field"), error
+            assert (await request(reader, writer, "GET", "/orchestrate"))[0] == 405
+            assert (await request(reader, writer, "GET", "/nowhere"))[0] == 404
+            assert (await request(reader, writer, "GET", "/health"))[2] == {"status": "ok"}
+            status, headers, _ = await request(reader, writer, "POST", "/orchestrate", sarah, "Connection: close\r\n")
+            assert status == 200 and headers["connection"] == "close" and await reader.read() == b""
+            writer.close()
+            assert server.stats()["connections"] == 1, "every request above shared one connection"
+
+            async with OrchestratorServer(port=0, idle_timeout=0.2) as slow_server:
+                # Expect: 100-continue is answered before the body is sent
+                reader, writer = await asyncio.open_connection("127.0.0.1", slow_server.port)
+                payload = json.dumps(sarah).encode()
+                writer.write(f"POST /orchestrate HTTP/1.1\r\nHost: test\r\nExpect: 100-continue\r\n"
+                             f"Content-Length: {len(payload)}\r\n\r\n".encode())
+                assert await asyncio.wait_for(reader.readline(), 1) == b"HTTP/1.1 100 Continue\r\n"
+                assert await reader.readline() == b"\r\n"
+                writer.write(payload)
+                assert (await reader.readline()).split()[1] == b"200"
+                writer.close()
+
+                # A client that stalls in the headers is cut off after the timeout
+                reader, writer = await asyncio.open_connection("127.0.0.1", slow_server.port)
+                writer.write(b"POST /orchestrate HTTP/1.1\r\nHost: test\r\n")
+                assert await asyncio.wait_for(reader.read(), 2) == b""
+                writer.close()
+
+            # Concurrent single requests within the window run as a few batches
+            before = server.stats()
+            report = await run_load(port=server.port, requests=64, concurrency=16)
+            after = server.stats()
+            return report, after["connections"] - before["connections"], after["batches"] - before["batches"]
+    
+    set_event_sink(NullSink())
+    try:
+        report, connections, batches = asyncio.run(scenario())
+    finally:
+        set_event_sink(console_sink())
+    assert report.requests == 64 and report.errors == 0, report
+    assert connections == 16, "the load generator reuses its keep-alive connections"
+    assert batches < 64 / 2, f"{batches} batches for 64 requests"
+    print(f"\n   64 requests over {connections} connections ran as {batches} batches; "
+          f"{report.requests_per_second:.0f} req/s, p99 {report.p99_ms:.1f} ms")
+    
+    print("\n[OK] The server answers over keep-alive connections and batches concurrent requests\n")
+
+def test_candidate_records():
+    """Test compact CandidateRecords stand in for AgentState dicts with less memory"""
+    print("=" * 70)
+    print("TEST 24: Compact Candidate Records")
+    print("=" * 70)
+    
+    updates = make_updates_for_jobs(2000, ["J123", "J456", "J789", "NOPE"], "Interview")
+    updates += make_updates_for_jobs(2000, ["J123", "J456"], "Assessment")
+    set_event_sink(NullSink())
+    try:
+        dicts = orchestrate_many(updates)
+        records = orchestrate_many(updates, compact=True)
+        async_records = asyncio.run(orchestrate_many_async(updates[:10], compact=True))
+    finally:
+        set_event_sink(console_sink())
+    
+    assert all(isinstance(record, CandidateRecord) for record in records + async_records)
+    for state, record in zip(dicts, records):
+        assert record["output_message"] == state["output_message"]
+        assert record["metadata"]["agent"] == state["metadata"]["agent"]
+        assert record.to_state().keys() == state.keys()
+    assert records[0].job is records[4].job, "candidates for one job share its Job"
+    assert len({id(record.job) for record in records}) == 4
+    assert records[0].status is records[1].status and records[0].job_title is records[8].job_title
+    
+    # The router and agents take a record like a dict
+    record = CandidateRecord("Ann", "ann@example.com", "Interview", shared_job("J123", "Python Developer", "Python role"))
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert router_agent(record) == "interview"
+        assert interview_agent(record) is record and "Ann" in record["output_message"]
+    try:
+        record["job_title"] = "Other"
+        assert False, "job fields are shared and read-only"
+    except KeyError:
+        pass
+    
+    # Adapter round trip, sharing one Job per job_id
+    jobs = {}
+    converted = [CandidateRecord.from_state(state, jobs) for state in dicts]
+    assert converted == dicts[:len(converted)] and len(jobs) == 4
+    assert converted[0].to_state() == dicts[0] and converted[0].job is converted[4].job
+    
+    def retained(compact):
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            states = orchestrate_many(updates, compact=compact)
+            return (tracemalloc.get_traced_memory()[0] - before) / len(states)
+        finally:
+            tracemalloc.stop()
+    
+    set_event_sink(NullSink())
+    try:
+        dict_bytes, record_bytes = retained(False), retained(True)
+    finally:
+        set_event_sink(console_sink())
+    assert record_bytes < dict_bytes, (record_bytes, dict_bytes)
+    print(f"\n   drafted batch of {len(updates)}: {dict_bytes:.0f} B/candidate as dicts, {record_bytes:.0f} as records")
+    
+    print("\n[OK] Records draft the same messages as dicts and share job data\n")
+
+def test_columnar_batches():
+    """Test orchestrate_columns() matches orchestrate_many() while grouping whole columns"""
+    print("=" * 70)
+    print("TEST 25: Columnar Batches")
+    print("=" * 70)
+    
+    try:
+        import numpy as np
+        from columnar import CandidateColumns, encode, group_by
+    except ImportError:
+        print("\n[SKIP] NumPy is not installed\n")
+        return
+    
+    categories, codes = encode(["b", "a", "b", "c"])
+    assert categories == ["b", "a", "c"] and codes.tolist() == [0, 1, 0, 2]
+    groups, group_codes = group_by(np.array([1, 0, 1, 1]), np.array([2, 2, 0, 2]), sizes=(2, 3))
+    assert groups.tolist() == [[0, 2], [1, 0], [1, 2]] and group_codes.tolist() == [2, 0, 1, 2]
+    
+    def offer_agent(state, use_claude=False):
+        state["output_message"] = f"Offer for {state['candidate_name']}"
+        state["metadata"] = {"agent": "offer"}
+        return state
+    
+    updates = make_updates_for_jobs(300, ["J123", "J456", "J789", "NOPE"], "Interview")
+    updates += make_updates_for_jobs(300, ["J101", "J123"], "Assessment")
+    updates += make_updates_for_jobs(5, ["J456"], "Offer")
+    updates.sort(key=lambda update: update.candidate_email)
+    AGENTS.register("offer", offer_agent, statuses=["Offer"])
+    set_event_sink(NullSink())
+    try:
+        expected = orchestrate_many(updates)
+        batch = orchestrate_columns(updates)
+        empty = orchestrate_columns([])
+    finally:
+        set_event_sink(console_sink())
+        AGENTS.unregister("offer")
+    
+    assert batch.agent_counts() == {"assessment": 300, "interview": 300, "offer": 5}, batch.agent_counts()
+    assert len(batch.columns.job_ids) == 5 and batch.group_codes.max() == 6, "one group per (agent, job)"
+    states = list(batch)
+    assert len(states) == len(expected) and list(batch.messages()) == [s["output_message"] for s in expected]
+    for state, want in zip(states, expected):
+        assert {**state, "metadata": None} == {**want, "metadata": None}
+        assert state["metadata"].keys() == want["metadata"].keys()
+    assert batch.state(7) == states[7] and batch.message(7) == expected[7]["output_message"]
+    assert states[0]["metadata"] is not states[1]["metadata"], "each materialised state gets its own metadata"
+    assert len(empty) == 0 and list(empty) == []
+    
+    columns = CandidateColumns.from_columns(["Ann"], ["ann@example.com"], ["Interview"], ["J123"])
+    assert columns.row(0) == ("Ann", "ann@example.com", "Interview", "J123")
+    print(f"\n   {len(updates)} updates → {len(batch.contexts)} groups; messages rendered on read")
+    
+    print("\n[OK] Columnar batches route, group and draft like orchestrate_many()\n")
+
+def test_work_queue():
+    """Test the SQLite work queue redelivers expired leases, dead-letters and survives a crash"""
+    print("=" * 70)
+    print("TEST 26: Durable Work Queue")
+    print("=" * 70)
+    
+    updates = make_updates_for_jobs(40, ["J123", "J456"], "Interview")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "queue.db")
+        now = [1000.0]
+        queue = WorkQueue(path, visibility_timeout=30, max_attempts=3, clock=lambda: now[0])
+        assert queue.enqueue_many(updates[:10]) == 10 and len(queue) == 10
+        
+        # A lease hides items until it runs out, then they come back with one more attempt
+        first = queue.lease("a", 4)
+        assert [lease.update for lease in first] == updates[:4] and queue.stats() == {"ready": 6, "leased": 4, "dead": 0}
+        assert [lease.update for lease in queue.lease("b", 10)] == updates[4:10]
+        assert queue.lease("c", 10) == []
+        now[0] += 31
+        again = queue.lease("c", 2)
+        assert [lease.id for lease in again] == [lease.id for lease in first[:2]] and again[0].attempts == 2
+        assert queue.ack(again) == 2 and len(queue) == 8
+        assert queue.fail(first[2:3], "stale lease") == 0, "items leased again by someone else are left alone"
+        
+        # Leases that keep running out end up as dead letters
+        now[0] += 31
+        queue.lease("d", 10)
+        now[0] += 31
+        assert len(queue.lease("e", 10)) == 8
+        now[0] += 31
+        assert queue.lease("f", 10) == [] and queue.stats() == {"ready": 0, "leased": 0, "dead": 8}
+        assert queue.dead_letters(1)[0].error == "lease expired"
+        assert queue.requeue_dead_letters() == 8 and queue.stats()["ready"] == 8
+        queue.close()
+
+        # A late ack from a worker whose lease ran out leaves the item to its new holder
+        late = WorkQueue(os.path.join(tmp, "late.db"), visibility_timeout=30, clock=lambda: now[0])
+        late.enqueue_many(updates[:1])
+        stale = late.lease("a")
+        now[0] += 31
+        current = late.lease("b")
+        assert late.ack(stale) == 0 and late.stats()["leased"] == 1
+        assert late.ack(current) == 1 and len(late) == 0
+        late.close()
+        
+        # A worker process dies holding a lease; the items are redelivered once it runs out
+        crash = (f"from work_queue import WorkQueue\n"
+                 f"queue = WorkQueue({path!r}, visibility_timeout=0.2)\n"
+                 f"queue.enqueue_many({[tuple(update) for update in updates[10:]]!r})\n"
+                 f"queue.lease('doomed', 20)\n"
+                 f"import os; os._exit(1)\n")
+        subprocess.run([sys.executable, "-c", crash], cwd=os.path.dirname(os.path.abspath(__file__)))
+        queue = WorkQueue(path, visibility_timeout=30, max_attempts=3)
+        assert len(queue) == 38 and queue.stats()["leased"] == 20
+        time.sleep(0.25)
+        
+        # Workers drain the queue; a candidate whose handler always fails is dead-lettered
+        delivered = []
+        def handler(states):
+            if any(state["candidate_name"] == "Candidate 13" for state in states):
+                raise RuntimeError("mail server rejected Candidate 13")
+            delivered.extend(state["candidate_email"] for state in states)
+        
+        set_event_sink(NullSink())
+        try:
+            stats = run_workers(queue, handler, workers=3, batch_size=5)
+        finally:
+            set_event_sink(console_sink())
+        expected = sorted(update.candidate_email for update in updates[2:] if update.candidate_name != "Candidate 13")
+        assert sorted(delivered) == expected, "every other candidate is messaged exactly once"
+        assert stats.processed == 37 and stats.failed == 2, "the crashed lease was its first attempt"
+        dead = queue.dead_letters()
+        assert [letter.update for letter in dead] == [updates[13]] and dead[0].attempts == 3
+        assert "mail server rejected" in dead[0].error and len(queue) == 0
+        queue.close()
+        print(f"\n   {stats.processed} processed in {stats.batches} batches, 1 dead letter after 3 attempts")
+    
+    print("\n[OK] Leases expire and redeliver, acks are durable, repeated failures are dead-lettered\n")
+
+def test_deduplication():
+    """Test the dedup stage skips repeated events, across runs and within a retention window"""
+    print("=" * 70)
+    print("TEST 27: Deduplication")
+    print("=" * 70)
+    
+    bloom = BloomFilter(capacity=2000, error_rate=0.01)
+    keys = [event_key(f"c{i}@example.com", "J123", "Interview") for i in range(4000)]
+    for key in keys[:2000]:
+        bloom.add(key)
+    assert all(key in bloom for key in keys[:2000]), "no false negatives"
+    false_positives = sum(key in bloom for key in keys[2000:]) / 2000
+    assert false_positives < 0.03, false_positives
+    assert event_key(" Ann@Example.com", "J123", "interview") == event_key("ann@example.com", "J123", "Interview")
+    assert event_key("ann@example.com", "J123", "Assessment") != event_key("ann@example.com", "J123", "Interview")
+    
+    records = [
+        {"candidate_name": "Ana", "candidate_email": "ana@example.com", "status": "Interview", "job_id": "J456"},
+        {"candidate_name": "Ana", "candidate_email": "ANA@example.com", "status": "interview", "job_id": "J456"},
+        {"candidate_name": "Ben", "candidate_email": "ben@example.com", "status": "Assessment", "job_id": "J123"},
+    ]
+    lines = "".join(json.dumps(record) + "\n" for record in records)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "seen.db")
+        now = [1000.0]
+        dedup = Deduplicator(path, retention=3600, capacity=10, clock=lambda: now[0])
+        sink = io.StringIO()
+        set_event_sink(NullSink())
+        try:
+            assert run_pipeline(io.StringIO(lines), sink, dedup=dedup) == (3, 2, 0)
+            assert [json.loads(line)["candidate_name"] for line in sink.getvalue().splitlines()] == ["Ana", "Ben"]
+            assert len(dedup) == 2 and dedup.stats()["duplicates"] == 1, "repeat within one stream"
+            
+            # Growing past capacity rebuilds a larger filter; everything stays findable
+            dedup.mark(make_updates_for_jobs(50, ["J789"], "Interview"))
+            assert dedup.bloom.capacity >= 40 and len(dedup) == 52
+            assert dedup.seen(StatusUpdate("Ben", "ben@example.com", "Assessment", "J123"))
+            dedup.close()
+            
+            # Reopened, it still knows both events; a new status is a new event
+            dedup = Deduplicator(path, retention=3600, clock=lambda: now[0])
+            more = lines + json.dumps({**records[2], "status": "Interview"}) + "\n"
+            sink = io.StringIO()
+            assert run_pipeline(io.StringIO(more), sink, dedup=dedup) == (4, 1, 0)
+            assert json.loads(sink.getvalue())["metadata"]["agent"] == "interview"
+            
+            # Past the retention window events count as new again and can be purged
+            now[0] += 3601
+            assert not dedup.seen(StatusUpdate("Ben", "ben@example.com", "Assessment", "J123"))
+            assert dedup.stats()["expired"] == 1
+            assert dedup.purge_expired() == 53 and len(dedup) == 0
+            dedup.close()
+
+            # A stream that stops part-way leaves its unmarked events for the next pass
+            class FailingSink(io.StringIO):
+                def write(self, text):
+                    raise OSError("disk full")
+            dedup = Deduplicator(":memory:")
+            try:
+                run_pipeline(io.StringIO(lines), FailingSink(), dedup=dedup)
+                assert False, "the sink error should propagate"
+            except OSError:
+                pass
+            sink = io.StringIO()
+            assert run_pipeline(io.StringIO(lines), sink, dedup=dedup) == (3, 2, 0)
+            assert len(dedup) == 2
+            updates = make_updates_for_jobs(3, ["J123"], "Interview")
+            stream = dedup.unseen(updates)
+            next(stream)
+            stream.close()
+            assert list(dedup.unseen(updates)) == updates
+            dedup.close()
+        finally:
+            set_event_sink(console_sink())
+        
+        completed = subprocess.run([sys.executable, "-m", "pipeline", "--dedup", path], input=lines * 2,
+                                   capture_output=True, text=True, check=True,
+                                   cwd=os.path.dirname(os.path.abspath(__file__)))
+        assert len(completed.stdout.splitlines()) == 2 and "2 written, 0 skipped, 4 duplicates" in completed.stderr
+    print(f"\n   Bloom filter at capacity: {false_positives:.2%} false positives (target 1%)")
+    
+    print("\n[OK] Repeated events are skipped across runs until their retention window ends\n")
+
+def make_updates_for_jobs(count, job_ids, status):
+    """Build `count` status updates spread round-robin across job_ids"""
+    return [
+        StatusUpdate(f"Candidate {i}", f"c{i}@example.com", status, job_ids[i % len(job_ids)])
+        for i in range(count)
+    ]
+
 if __name__ == "__main__":
     print("\n" + "=" * 70)
     print("RECRUITEM ORCHESTRATOR - TEST SUITE")
@@ -76,6 +1571,30 @@ if __name__ == "__main__":
     test_assessment()
     test_interview()
     test_different_jobs()
+    test_orchestrate_many()
+    test_orchestrate_many_async()
+    test_client_reuse()
+    test_tip_cache()
+    test_bm25_retrieval()
+    test_vector_index()
+    test_keyword_matcher()
+    test_event_sinks()
+    test_message_templates()
+    test_run_parallel()
+    test_pipeline()
+    test_job_catalog()
+    test_data_reload()
+    test_agent_registry()
+    test_stage_timings()
+    test_cold_start()
+    test_claude_resilience()
+    test_request_coalescing()
+    test_message_batches()
+    test_http_server()
+    test_candidate_records()
+    test_columnar_batches()
+    test_work_queue()
+    test_deduplication()
     
     print("=" * 70)
     print("ALL TESTS COMPLETED")
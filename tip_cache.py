@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Prep Tip Cache - Content-addressed storage for generated interview tips
+=======================================================================
+
+A Claude prep tip depends only on the model, the prompt template and
+the job description, so every candidate for the same job can share one
+generated tip. Tips are keyed by a hash of those three inputs.
+
+Tiers:
+    TipCache (in-memory LRU) → SQLiteTipStore (optional, on disk, TTL + size cap)
+
+Author: RecruitEM Team
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+def tip_key(model: str, prompt_template: str, job_description: str) -> str:
+    """
+    Content address of a generated tip
+
+    Args:
+        model: Claude model name
+        prompt_template: Prompt template the job description is inserted into
+        job_description: The job description text
+
+    Returns:
+        Hex SHA-256 digest identifying the tip
+    """
+    import hashlib   # Claude path only; keeps `import orchestrator` light
+    digest = hashlib.sha256()
+    for part in (model, prompt_template, job_description):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+class SQLiteTipStore:
+    """
+    On-disk tip tier backed by a single SQLite table
+
+    Entries older than ttl_seconds are treated as missing and removed.
+    When more than max_entries are stored, the least recently used
+    entries are evicted.
+
+    Args:
+        path: SQLite database file (":memory:" for a throwaway store)
+        ttl_seconds: Maximum entry age, or None to keep entries forever
+        max_entries: Maximum number of stored tips, or None for no cap
+        clock: Time source in seconds (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        import sqlite3   # only stores need it; keeps `import orchestrator` light
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tips ("
+            " key TEXT PRIMARY KEY,"
+            " tip TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " used_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS tips_used_at ON tips (used_at)")
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored tip, or None if missing or expired"""
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute("SELECT tip, created_at FROM tips WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            tip, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM tips WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE tips SET used_at = ? WHERE key = ?", (now, key))
+            return tip
+
+    def put(self, key: str, tip: str) -> None:
+        """Store a tip, evicting least recently used entries over max_entries"""
+        now = self._clock()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tips (key, tip, created_at, used_at) VALUES (?, ?, ?, ?)",
+                (key, tip, now, now)
+            )
+            if self.max_entries is not None:
+                self._conn.execute(
+                    "DELETE FROM tips WHERE key IN ("
+                    " SELECT key FROM tips ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+
+    def purge_expired(self) -> int:
+        """Delete every expired entry; returns the number removed"""
+        if self.ttl_seconds is None:
+            return 0
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM tips WHERE created_at < ?", (self._clock() - self.ttl_seconds,))
+            return cursor.rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM tips").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM tips")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+class TipCache:
+    """
+    In-memory LRU of generated tips, optionally in front of a disk store
+
+    Lookups check memory first, then the store; store hits are promoted
+    into memory. Counters are kept so callers can verify how many tips
+    actually had to be generated.
+
+    Args:
+        max_entries: Maximum number of tips held in memory
+        store: Optional second tier (e.g. SQLiteTipStore)
+    """
+
+    def __init__(self, max_entries: int = 1024, store: Optional[SQLiteTipStore] = None):
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be >= 1, got {max_entries}")
+        self.max_entries = max_entries
+        self.store = store
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached tip for key, or None (counted as a miss)"""
+        with self._lock:
+            tip = self._entries.get(key)
+            if tip is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return tip
+
+        if self.store is not None:
+            tip = self.store.get(key)
+            if tip is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                    self._remember(key, tip)
+                return tip
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, tip: str) -> None:
+        """Cache a freshly generated tip in every tier"""
+        with self._lock:
+            self._remember(key, tip)
+        if self.store is not None:
+            self.store.put(key, tip)
+
+    def _remember(self, key: str, tip: str) -> None:
+        self._entries[key] = tip
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current memory size"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+            }
+
+    def clear(self) -> None:
+        """Drop every cached tip (all tiers) and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.disk_hits = self.misses = 0
+        if self.store is not None:
+            self.store.clear()
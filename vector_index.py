@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Vector Index - Dense embeddings with cosine top-k search
+========================================================
+
+Local stand-in for a vector database. Document embeddings live in one
+contiguous float32 matrix (one L2-normalised row per document), so a
+batch of queries is answered with a single matmul plus argpartition:
+
+    texts → embedder → (n, dim) float32 rows → Q @ M.T → top-k per query
+
+Embedders are pluggable: anything with a `dim` attribute and an
+`embed(texts) -> (len(texts), dim) array` method. HashingEmbedder is a
+deterministic, dependency-free default suitable for offline use.
+
+Requires NumPy.
+
+Author: RecruitEM Team
+"""
+
+import json
+import zlib
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from retrieval import tokenize
+
+class HashingEmbedder:
+    """
+    Deterministic embedder using the hashing trick
+
+    Each word and each character n-gram of a word is hashed (CRC32, so
+    results are stable across processes) into one of `dim` buckets with
+    a hashed sign. Character n-grams make near-miss spellings
+    ("pythonic", "Postgres") land close to their stems.
+
+    Args:
+        dim: Embedding width
+        ngram: Character n-gram length (0 disables n-gram features)
+    """
+
+    def __init__(self, dim: int = 256, ngram: int = 3):
+        self.dim = dim
+        self.ngram = ngram
+
+    def _features(self, text: str) -> List[str]:
+        features = []
+        for word in tokenize(text):
+            features.append(word)
+            if self.ngram:
+                padded = f"#{word}#"
+                features.extend(padded[i:i + self.ngram] for i in range(len(padded) - self.ngram + 1))
+        return features
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts into an (n, dim) float32 matrix of L2-normalised rows"""
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                h = zlib.crc32(feature.encode("utf-8"))
+                matrix[row, h % self.dim] += 1.0 if (h >> 31) & 1 else -1.0
+        return _normalize(matrix)
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+class VectorIndex:
+    """
+    Cosine-similarity index over a contiguous float32 embedding matrix
+
+    Rows are stored L2-normalised, so cosine similarity is a dot
+    product. The matrix grows by doubling; removal swaps the last row
+    into the freed slot, keeping the live rows contiguous.
+
+    Args:
+        embedder: Turns texts into vectors (defaults to HashingEmbedder())
+        dim: Vector width; defaults to embedder.dim
+    """
+
+    def __init__(self, embedder=None, dim: Optional[int] = None):
+        self.embedder = embedder if embedder is not None else HashingEmbedder()
+        self.dim = dim if dim is not None else self.embedder.dim
+        self._matrix = np.zeros((0, self.dim), dtype=np.float32)
+        self._size = 0
+        self._ids: List[str] = []
+        self._rows = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._rows
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Live (len(self), dim) view of the stored embeddings"""
+        return self._matrix[:self._size]
+
+    def ids(self) -> List[str]:
+        """Document IDs, in row order"""
+        return list(self._ids)
+
+    def copy(self) -> "VectorIndex":
+        """An independent copy sharing the embedder"""
+        index = VectorIndex(self.embedder, dim=self.dim)
+        index._matrix = np.array(self.matrix)
+        index._size = self._size
+        index._ids = list(self._ids)
+        index._rows = dict(self._rows)
+        return index
+
+    def add(self, doc_ids: Sequence[str], texts: Optional[Sequence[str]] = None,
+            vectors: Optional[np.ndarray] = None) -> None:
+        """
+        Add (or replace) documents, embedding texts unless vectors are given
+
+        Args:
+            doc_ids: Document IDs
+            texts: Document texts, embedded with self.embedder
+            vectors: Precomputed (len(doc_ids), dim) embeddings
+        """
+        if vectors is None:
+            if texts is None:
+                raise ValueError("add() needs texts or vectors")
+            vectors = self.embedder.embed(texts)
+        vectors = _normalize(np.asarray(vectors, dtype=np.float32).reshape(len(doc_ids), self.dim))
+
+        self._ensure_writable()
+        for doc_id, vector in zip(doc_ids, vectors):
+            row = self._rows.get(doc_id)
+            if row is None:
+                row = self._append_row(doc_id)
+            self._matrix[row] = vector
+
+    def _ensure_writable(self) -> None:
+        # A memory-mapped index is read-only; copy it into RAM before changing it
+        if not self._matrix.flags.writeable:
+            self._matrix = np.array(self._matrix)
+
+    def _append_row(self, doc_id: str) -> int:
+        if self._size == self._matrix.shape[0]:
+            capacity = max(16, 2 * self._matrix.shape[0])
+            grown = np.zeros((capacity, self.dim), dtype=np.float32)
+            grown[:self._size] = self._matrix[:self._size]
+            self._matrix = grown
+        row = self._size
+        self._size += 1
+        self._ids.append(doc_id)
+        self._rows[doc_id] = row
+        return row
+
+    def remove(self, doc_id: str) -> bool:
+        """Drop a document; returns False if it was not indexed"""
+        row = self._rows.pop(doc_id, None)
+        if row is None:
+            return False
+        self._ensure_writable()
+        last = self._size - 1
+        if row != last:
+            moved = self._ids[last]
+            self._matrix[row] = self._matrix[last]
+            self._ids[row] = moved
+            self._rows[moved] = row
+        self._ids.pop()
+        self._size = last
+        return True
+
+    def search(self, query: str, top_k: int = 5) -> List[Tuple[str, float]]:
+        """Top-k (doc_id, cosine) pairs for one query, best first"""
+        return self.search_batch([query], top_k)[0]
+
+    def search_batch(self, queries: Sequence[str], top_k: int = 5) -> List[List[Tuple[str, float]]]:
+        """Top-k (doc_id, cosine) pairs for each query, best first"""
+        return self.search_vectors(self.embedder.embed(queries), top_k)
+
+    def search_vectors(self, queries: np.ndarray, top_k: int = 5) -> List[List[Tuple[str, float]]]:
+        """
+        Top-k search for precomputed query embeddings
+
+        Args:
+            queries: (n, dim) query matrix (normalised here)
+            top_k: Results per query
+
+        Returns:
+            One list of (doc_id, cosine) pairs per query, best first
+        """
+        queries = _normalize(np.asarray(queries, dtype=np.float32).reshape(-1, self.dim))
+        k = min(top_k, self._size)
+        if k < 1:
+            return [[] for _ in range(len(queries))]
+
+        scores = queries @ self.matrix.T
+        if k < self._size:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(self._size), (len(queries), self._size))
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        ids = self._ids
+        return [
+            [(ids[row], float(score)) for row, score in zip(rows, row_scores)]
+            for rows, row_scores in zip(top.tolist(), top_scores.tolist())
+        ]
+
+    def save(self, path: str) -> None:
+        """
+        Write the index as `<path>.npy` (embeddings) and `<path>.ids.json`
+
+        The .npy file can be memory-mapped by load().
+        """
+        np.save(f"{path}.npy", np.ascontiguousarray(self.matrix))
+        with open(f"{path}.ids.json", "w", encoding="utf-8") as f:
+            json.dump(self._ids, f)
+
+    @classmethod
+    def load(cls, path: str, embedder=None, mmap: bool = True) -> "VectorIndex":
+        """
+        Load an index written by save()
+
+        Args:
+            path: Path prefix passed to save()
+            embedder: Embedder for new queries (must match the saved vectors)
+            mmap: Memory-map the embeddings read-only instead of reading
+                  them into RAM (copied on first add/remove)
+        """
+        matrix = np.load(f"{path}.npy", mmap_mode="r" if mmap else None)
+        with open(f"{path}.ids.json", encoding="utf-8") as f:
+            ids = json.load(f)
+        if len(ids) != matrix.shape[0]:
+            raise ValueError(f"{path}: {len(ids)} ids for {matrix.shape[0]} vectors")
+
+        index = cls(embedder if embedder is not None else HashingEmbedder(dim=matrix.shape[1]), dim=matrix.shape[1])
+        index._matrix = matrix
+        index._size = len(ids)
+        index._ids = list(ids)
+        index._rows = {doc_id: row for row, doc_id in enumerate(ids)}
+        return index
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Work Queue - Durable status-update queue with a worker pool
+===========================================================
+
+orchestrate() keeps nothing on disk: if the process dies mid-batch
+there is no telling which candidates were already messaged. WorkQueue
+keeps the updates in a SQLite file (WAL mode) until a worker has
+processed them:
+
+    enqueue_many() → queue table ──lease()──→ worker: orchestrate_many() → handler(states)
+                         ↑                         │
+                         │ visibility timeout,     ├── ack(): delete the batch, one transaction
+                         │ fail()                  │
+                         └─────────────────────────┴── fail() max_attempts times → dead_letters
+
+A lease hides items from other workers for visibility_timeout seconds.
+A worker that dies simply never acks: its items become visible again
+when the lease runs out and are redelivered. Delivery is therefore at
+least once; a handler that sends messages should tolerate an occasional
+repeat. Items that have been leased max_attempts times without an ack
+are moved to the dead_letters table with their last error.
+
+Several processes can share one queue file, each with its own
+WorkQueue; within a process run_workers() runs a pool of threads.
+
+Author: RecruitEM Team
+"""
+
+import contextlib
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import orchestrator
+from orchestrator import AgentState, StatusUpdate
+
+DEFAULT_VISIBILITY_TIMEOUT = 60.0
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_BATCH_SIZE = 100
+
+# Called with the final states of a processed batch before it is acked
+ResultHandler = Callable[[List[AgentState]], None]
+
+_UPDATE_COLUMNS = "candidate_name, candidate_email, status, job_id"
+
+class Lease(NamedTuple):
+    """One leased item; pass it back to ack() or fail()"""
+    id: int
+    attempts: int
+    update: StatusUpdate
+
+class DeadLetter(NamedTuple):
+    """An item that failed max_attempts times"""
+    id: int
+    update: StatusUpdate
+    attempts: int
+    error: Optional[str]
+    failed_at: float
+
+class WorkQueue:
+    """
+    Status updates in a SQLite file, leased to workers until acked
+
+    Args:
+        path: SQLite database file (":memory:" for a throwaway queue, which
+              can't be shared and isn't durable)
+        visibility_timeout: Seconds a leased item stays hidden from other workers
+        max_attempts: Leases per item before it is dead-lettered
+        retry_delay: Seconds a failed item waits before it is leased again
+        synchronous: SQLite synchronous setting. "NORMAL" survives process
+                     crashes in WAL mode; "FULL" also survives power loss,
+                     at the cost of an fsync per transaction.
+        clock: Time source (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        retry_delay: float = 0.0,
+        synchronous: str = "NORMAL",
+        clock: Callable[[], float] = time.time
+    ):
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be >= 1, got {max_attempts}")
+        if synchronous.upper() not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+            raise ValueError(f"unknown synchronous setting {synchronous!r}")
+        self.path = path
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._clock = clock
+        self._lock = threading.Lock()
+        import sqlite3   # only the queue needs it; keeps `import orchestrator` light
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={synchronous.upper()}")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS queue ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " candidate_name TEXT NOT NULL,"
+            " candidate_email TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " job_id TEXT NOT NULL,"
+            " enqueued_at REAL NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " visible_at REAL NOT NULL DEFAULT 0,"
+            " leased_by TEXT,"
+            " last_error TEXT)"
+        )
+        # lease() looks for items out of attempts; without this it would scan the queue each time
+        self._conn.execute("CREATE INDEX IF NOT EXISTS queue_attempts ON queue (attempts, visible_at)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS dead_letters ("
+            " id INTEGER PRIMARY KEY,"
+            " candidate_name TEXT NOT NULL,"
+            " candidate_email TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " job_id TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL,"
+            " error TEXT,"
+            " failed_at REAL NOT NULL)"
+        )
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """One write transaction, taking the write lock up front so leases can't interleave"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def enqueue(self, update: StatusUpdate) -> int:
+        """Add one update; returns its item ID"""
+        with self._transaction() as conn:
+            return conn.execute(
+                f"INSERT INTO queue ({_UPDATE_COLUMNS}, enqueued_at) VALUES (?, ?, ?, ?, ?)",
+                (*update, self._clock())
+            ).lastrowid
+
+    def enqueue_many(self, updates: Iterable[StatusUpdate]) -> int:
+        """Add updates (StatusUpdates or (name, email, status, job_id) tuples) in one transaction"""
+        now = self._clock()
+        with self._transaction() as conn:
+            return conn.executemany(
+                f"INSERT INTO queue ({_UPDATE_COLUMNS}, enqueued_at) VALUES (?, ?, ?, ?, ?)",
+                ((name, email, status, job_id, now) for name, email, status, job_id in updates)
+            ).rowcount
+
+    def lease(self, worker: str, limit: int = DEFAULT_BATCH_SIZE,
+              visibility_timeout: Optional[float] = None) -> List[Lease]:
+        """
+        Lease up to `limit` visible items, oldest first
+
+        Items whose last lease ran out after max_attempts are
+        dead-lettered first instead of being handed out again.
+
+        Args:
+            worker: Name recorded on the leased items
+            limit: Maximum items to lease
+            visibility_timeout: Override the queue's timeout for this lease
+        """
+        now = self._clock()
+        timeout = self.visibility_timeout if visibility_timeout is None else visibility_timeout
+        with self._transaction() as conn:
+            self._bury(conn, "attempts >= ? AND visible_at <= ?", (self.max_attempts, now), now,
+                       "lease expired")
+            rows = conn.execute(
+                f"SELECT id, attempts + 1, {_UPDATE_COLUMNS} FROM queue WHERE visible_at <= ? ORDER BY id LIMIT ?",
+                (now, limit)
+            ).fetchall()
+            conn.executemany(
+                "UPDATE queue SET attempts = attempts + 1, visible_at = ?, leased_by = ? WHERE id = ?",
+                ((now + timeout, worker, row[0]) for row in rows)
+            )
+        return [Lease(row[0], row[1], StatusUpdate(*row[2:])) for row in rows]
+
+    def ack(self, leases: Sequence[Lease]) -> int:
+        """
+        Delete processed items in one transaction
+
+        As in fail(), items that have already been leased again (their
+        lease ran out) are left alone for the worker now holding them.
+
+        Returns:
+            Number of items deleted
+        """
+        if not leases:
+            return 0
+        with self._transaction() as conn:
+            return conn.executemany("DELETE FROM queue WHERE id = ? AND attempts = ?",
+                                    ((lease.id, lease.attempts) for lease in leases)).rowcount
+
+    def fail(self, leases: Sequence[Lease], error: str = "") -> int:
+        """
+        Give failed items back for a retry, or dead-letter them
+
+        Items that have already been leased again (their lease ran out)
+        are left alone.
+
+        Returns:
+            Number of items moved to dead_letters
+        """
+        if not leases:
+            return 0
+        now = self._clock()
+        keys = [(lease.id, lease.attempts) for lease in leases]
+        with self._transaction() as conn:
+            buried = 0
+            for item_id, attempts in keys:
+                buried += self._bury(conn, "id = ? AND attempts = ? AND attempts >= ?",
+                                     (item_id, attempts, self.max_attempts), now, error)
+            conn.executemany(
+                "UPDATE queue SET visible_at = ?, leased_by = NULL, last_error = ? WHERE id = ? AND attempts = ?",
+                ((now + self.retry_delay, error, item_id, attempts) for item_id, attempts in keys)
+            )
+            return buried
+
+    @staticmethod
+    def _bury(conn, where: str, params: tuple, now: float, error: Optional[str]) -> int:
+        """Move the queue rows matching `where` to dead_letters"""
+        conn.execute(
+            f"INSERT INTO dead_letters (id, {_UPDATE_COLUMNS}, attempts, error, failed_at)"
+            f" SELECT id, {_UPDATE_COLUMNS}, attempts, COALESCE(?, last_error), ? FROM queue WHERE {where}",
+            (error or None, now, *params)
+        )
+        return conn.execute(f"DELETE FROM queue WHERE {where}", params).rowcount
+
+    def dead_letters(self, limit: int = -1) -> List[DeadLetter]:
+        """Dead-lettered items, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, {_UPDATE_COLUMNS}, attempts, error, failed_at FROM dead_letters ORDER BY id LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [DeadLetter(row[0], StatusUpdate(*row[1:5]), *row[5:]) for row in rows]
+
+    def requeue_dead_letters(self, ids: Optional[Iterable[int]] = None) -> int:
+        """Put dead-lettered items (all, or those with the given IDs) back with fresh attempts"""
+        if ids is None:
+            where, params = "1", ()
+        else:
+            params = tuple(ids)
+            where = f"id IN ({','.join('?' * len(params))})"
+        with self._transaction() as conn:
+            conn.execute(
+                f"INSERT INTO queue ({_UPDATE_COLUMNS}, enqueued_at)"
+                f" SELECT {_UPDATE_COLUMNS}, ? FROM dead_letters WHERE {where} ORDER BY id",
+                (self._clock(), *params)
+            )
+            return conn.execute(f"DELETE FROM dead_letters WHERE {where}", params).rowcount
+
+    def stats(self) -> Dict[str, int]:
+        """Items ready to lease, currently leased (or waiting to retry) and dead-lettered"""
+        with self._lock:
+            queued, ready = self._conn.execute(
+                "SELECT COUNT(*), COUNT(*) FILTER (WHERE visible_at <= ?) FROM queue", (self._clock(),)
+            ).fetchone()
+            dead = self._conn.execute("SELECT COUNT(*) FROM dead_letters").fetchone()[0]
+        return {"ready": ready, "leased": queued - ready, "dead": dead}
+
+    def __len__(self) -> int:
+        """Items not yet acked or dead-lettered"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM queue").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+# ============= WORKER POOL =============
+
+class WorkerStats(NamedTuple):
+    """Counts for one run_workers() call"""
+    processed: int
+    failed: int
+    batches: int
+    seconds: float
+
+def _process(queue: WorkQueue, leases: List[Lease], handler: Optional[ResultHandler],
+             use_claude: bool) -> int:
+    """
+    Run one leased batch through orchestrate_many() and ack it
+
+    If the batch fails, its items are retried one by one so a single bad
+    update doesn't hold back the rest; only the ones that fail again are
+    handed back with fail(). Returns the number of failed items.
+    """
+    try:
+        states = orchestrator.orchestrate_many([lease.update for lease in leases], use_claude=use_claude)
+        if handler is not None:
+            handler(states)
+    except Exception:
+        done, failed = [], 0
+        for lease in leases:
+            try:
+                states = orchestrator.orchestrate_many([lease.update], use_claude=use_claude)
+                if handler is not None:
+                    handler(states)
+            except Exception as error:
+                queue.fail([lease], f"{type(error).__name__}: {error}")
+                failed += 1
+            else:
+                done.append(lease)
+        queue.ack(done)
+        return failed
+    queue.ack(leases)
+    return 0
+
+def run_workers(
+    queue: WorkQueue,
+    handler: Optional[ResultHandler] = None,
+    workers: int = 4,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    use_claude: bool = False,
+    stop: Optional[threading.Event] = None,
+    poll_interval: float = 0.1
+) -> WorkerStats:
+    """
+    Process queued updates with a pool of worker threads
+
+    Each worker leases up to batch_size items, runs them through
+    orchestrate_many(), passes the final states to handler and acks the
+    batch in one transaction. Threads help when tips come from Claude;
+    for CPU-bound keyword tips run one pool per process instead, all on
+    the same queue file.
+
+    Args:
+        queue: The queue to drain
+        handler: Called with each batch's final states before the ack
+                 (e.g. send the messages, write result records). If it
+                 raises, the batch's items are retried one by one.
+        workers: Worker threads
+        batch_size: Items leased (and acked) at a time
+        use_claude: If True, uses Claude AI for interview tips (optional)
+        stop: Keep polling for new items until this event is set; by
+              default return once the queue is empty
+        poll_interval: Seconds an idle worker waits before leasing again
+
+    Returns:
+        WorkerStats with the items processed and failed attempts
+    """
+    if workers < 1:
+        raise ValueError(f"workers must be >= 1, got {workers}")
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+
+    halt = threading.Event()   # set when a worker hits an error the queue can't absorb
+    totals = {"processed": 0, "failed": 0, "batches": 0}
+    totals_lock = threading.Lock()
+    errors: List[BaseException] = []
+
+    def work(name: str) -> None:
+        try:
+            while not (halt.is_set() or (stop is not None and stop.is_set())):
+                leases = queue.lease(name, batch_size)
+                if not leases:
+                    if stop is None and len(queue) == 0:
+                        return
+                    halt.wait(poll_interval)
+                    continue
+                failed = _process(queue, leases, handler, use_claude)
+                with totals_lock:
+                    totals["processed"] += len(leases) - failed
+                    totals["failed"] += failed
+                    totals["batches"] += 1
+        except BaseException as error:
+            errors.append(error)
+            halt.set()
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=work, args=(f"worker-{os.getpid()}-{index}",), daemon=True)
+               for index in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return WorkerStats(seconds=time.perf_counter() - start, **totals)